@@ -1,11 +1,35 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, send_from_directory
 from flask_cors import CORS
 from scraper_service import ScraperService
-from database import Database
+from database import create_database, SITE_LIST_SORTS
+from models import Complaint
 import logging
-from config import API_HOST, API_PORT, DEBUG
+from config import (
+    API_HOST, API_PORT, API_THREADS, ANALYSIS_MAX_CONCURRENT, DEBUG, SEARCH_MAX_PAGE_SIZE, TREND_DEFAULT_DAYS, TREND_MAX_DAYS,
+    SCRAPE_QUEUE_ENABLED, JOB_MAX_ATTEMPTS, SSE_MAX_STREAMS, SSE_KEEPALIVE_SECONDS, RANKING_MAX_PAGE_SIZE,
+    SITES_DEFAULT_PAGE_SIZE, SITES_MAX_PAGE_SIZE
+)
+from json_provider import init_json
+from compression import init_compression
+import export
+import metrics
+import profiling
+import rankings
+import progress
+import risk
+from scraper_worker import JobHeartbeat
+from single_flight import SingleFlight, wait_for_job
+import uuid
 import signal
 import sys
+import hashlib
+import base64
+import json
+import threading
+import contextlib
+import os
+import socket
+from datetime import datetime, timedelta
 
 # Logging format with Serkan Gurcan branding
 logging.basicConfig(
@@ -16,12 +40,35 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)  # Frontend'den erişim için
+init_json(app)  # orjson ile hızlı JSON (datetime doğrudan ISO 8601)
+init_compression(app)  # Büyük JSON yanıtları için gzip/brotli
 
 # Timeout ayarları (scraping uzun sürebilir)
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 app.config['PERMANENT_SESSION_LIFETIME'] = 600  # 10 dakika
 
-scraper_service = ScraperService()
+# ScraperService ilk analiz isteğinde oluşturulur (okuma endpoint'leri scraper import maliyetini ödemez)
+_scraper_service = None
+_scraper_service_lock = threading.Lock()
+
+def get_scraper_service():
+    """Paylaşılan ScraperService örneğini döndür, gerekirse oluştur"""
+    global _scraper_service
+    if _scraper_service is None:
+        with _scraper_service_lock:
+            if _scraper_service is None:
+                _scraper_service = ScraperService()
+    return _scraper_service
+
+# Aynı domain için eşzamanlı analizler tek çalıştırmada birleştirilir (süreç içi; süreçler arası ScrapeJobs ile)
+_analysis_flight = SingleFlight()
+API_WORKER_ID = f"api:{socket.gethostname()}:{os.getpid()}"
+
+# Açık ilerleme stream'i (SSE) sayısı sınırı: her stream bir sunucu thread'i tutar, kalan thread'ler diğer isteklere kalır
+_sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+# Çalışan analiz sayısı sınırı: API_THREADS SSE stream'leri için yüksek tutulur, scraping (Selenium, HTTP) ayrıca sınırlanır
+_analysis_slots = threading.BoundedSemaphore(ANALYSIS_MAX_CONCURRENT)
 
 # Graceful shutdown
 def signal_handler(sig, frame):
@@ -31,6 +78,19 @@ def signal_handler(sig, frame):
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+def make_etag(*parts):
+    """Sürüm bilgilerinden zayıf ETag değeri üret"""
+    raw = '|'.join('' if p is None else str(p) for p in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def not_modified(etag):
+    """İstemcinin If-None-Match başlığı ETag ile eşleşiyorsa 304 yanıtı döndür"""
+    if request.if_none_match and request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
 @app.route('/', methods=['GET'])
 def root():
     """Ana sayfa - API bilgisi"""
@@ -39,12 +99,22 @@ def root():
         'version': '1.0.0',
         'endpoints': {
             'health': '/api/health',
+            'metrics': '/api/metrics',
             'db-status': '/api/db-status',
             'analyze': '/api/analyze (POST)',
+            'job': '/api/jobs/<job_id>',
+            'job-events': '/api/jobs/<job_id>/events (SSE)',
             'site': '/api/site/<domain>',
+            'trend': '/api/site/<domain>/trend',
             'sites': '/api/sites',
+            'rankings': '/api/rankings',
+            'search': '/api/search?q=<metin>',
+            'export': '/api/export?format=csv|parquet',
             'init-db': '/api/init-db (POST)',
-            'migrate-isresolved': '/api/migrate-isresolved (POST)'
+            'rescore': '/api/rescore (POST)',
+            'migrate-isresolved': '/api/migrate-isresolved (POST)',
+            'profiles': '/api/profiles',
+            'profile-download': '/api/profiles/<name>'
         }
     }), 200
 
@@ -53,11 +123,31 @@ def health_check():
     """API sağlık kontrolü"""
     return jsonify({'status': 'ok', 'message': 'API çalışıyor'})
 
+def _count_queued_jobs():
+    """scrape_jobs_queued: /api/metrics okunduğunda ScrapeJobs'taki 'queued' işler sayılır (okuma pool'u)"""
+    db = create_database(use_pool=True, read_only=True)
+    if not db.connect():
+        raise RuntimeError('Veritabanı bağlantı hatası')  # Gauge bu durumda örnek yazmaz
+    try:
+        count = db.count_queued_jobs()
+        db.close(force=False)
+        return count
+    except Exception:
+        db.close(force=True)
+        raise
+
+metrics.SCRAPE_JOBS_QUEUED.set_callback(_count_queued_jobs)
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus formatında metrikler"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/db-status', methods=['GET'])
 def db_status():
     """Veritabanı bağlantı durumunu kontrol et (pool kullanır)"""
     try:
-        db = Database(use_pool=True)  # Pool kullan
+        db = create_database(use_pool=True)  # Pool kullan
         is_connected = db.test_connection()
         if is_connected:
             db.close(force=False)  # Pool'da tut, kapatma
@@ -97,11 +187,24 @@ def analyze_site():
             return jsonify({'error': 'URL gerekli'}), 400
         
         logger.info(f"Site analizi başlatılıyor: {url}")
+        job_id = uuid.uuid4().hex[:12]
+        
+        if SCRAPE_QUEUE_ENABLED:
+            return enqueue_analysis(job_id, url, profiling.is_profiling_requested(data.get('profile')))
+        
+        # {"async": true} veya "Prefer: respond-async": analiz arka planda başlar, ilerleme SSE ile izlenir
+        if data.get('async') or 'respond-async' in request.headers.get('Prefer', ''):
+            return start_async_analysis(job_id, url, profiling.is_profiling_requested(data.get('profile')))
         
         # Site analizini başlat (bu işlem uzun sürebilir - 5-10 dakika)
-        # Not: Production'da background task kullanılmalı
+        # Aynı domain için çalışan analiz varsa (bu süreçte veya başka bir süreçte) yeniden çalıştırılmaz, sonucu paylaşılır
         try:
-            result = scraper_service.process_site(url)
+            domain = ScraperService.extract_domain(url)
+            profile = profiling.is_profiling_requested(data.get('profile'))
+            result, shared = _analysis_flight.do(domain, lambda: run_analysis(job_id, url, domain, profile))
+            if shared or result.get('job_id') != job_id:
+                result = dict(result, coalesced=True)
+                logger.info(f"{domain} için çalışan analizin sonucu paylaşıldı: {result.get('job_id')}")
             
             if 'error' in result:
                 logger.error(f"Analiz hatası: {result.get('error')}")
@@ -121,22 +224,226 @@ def analyze_site():
         logger.error(f"Analiz endpoint hatası: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+def run_analysis(job_id, url, domain, profile):
+    """
+    Analizi bu süreçte çalıştır ve ScrapeJobs'a 'running' iş olarak kaydet (heartbeat ile)
+    Domain için başka bir süreçte/makinede aktif iş varsa analiz çalıştırılmaz, o işin sonucu beklenir
+    """
+    progress.hub.open(job_id, domain)
+    progress.hub.publish(job_id, 'started', {'job_id': job_id, 'url': url, 'domain': domain})
+    tracked = False
+    db = create_database(use_pool=False)
+    if db.connect():
+        try:
+            # attempts=JOB_MAX_ATTEMPTS: süreç çökerse iş worker'lara kuyruklanmaz, başarısız sayılır
+            active_job_id, tracked = db.start_inline_job(job_id, url, domain, API_WORKER_ID,
+                                                          profile=profile, attempts=JOB_MAX_ATTEMPTS)
+            if not tracked:
+                logger.info(f"{domain} başka bir süreçte analiz ediliyor, sonucu bekleniyor: {active_job_id}")
+                progress.hub.publish(job_id, 'attached', {'job_id': active_job_id})
+                result = wait_for_job(db, active_job_id)
+                progress.hub.publish(job_id, 'error' if 'error' in result else 'result', result)
+                return result
+        except Exception as e:
+            logger.warning(f"Analiz işi kaydedilemedi, süreçler arası tekilleştirme yapılmayacak: {str(e)}")
+        finally:
+            db.close(force=True)
+    
+    result, error = None, None
+    try:
+        with JobHeartbeat(job_id, API_WORKER_ID) if tracked else contextlib.nullcontext(), progress.bind(job_id):
+            with analysis_slot(job_id):
+                scraper_service = get_scraper_service()
+                if profile:
+                    result, profile_name = profiling.run_profiled(job_id, domain, scraper_service.process_site, url)
+                    if profile_name:
+                        result['profile'] = profile_name
+                else:
+                    result = scraper_service.process_site(url)
+        result['job_id'] = job_id
+        error = result.get('error')
+        return result
+    except Exception as e:
+        error = f'Analiz hatası: {str(e)}'
+        raise
+    finally:
+        if error:
+            progress.hub.publish(job_id, 'error', dict(result or {}, job_id=job_id, error=error))
+        else:
+            progress.hub.publish(job_id, 'result', result)
+        if tracked and db.connect():
+            try:
+                db.complete_job(job_id, API_WORKER_ID, error is None, result, error)
+            except Exception as e:
+                logger.error(f"Analiz sonucu kaydedilemedi: {str(e)}")
+            finally:
+                db.close(force=True)
+
+@contextlib.contextmanager
+def analysis_slot(job_id):
+    """Analiz slotu al (en fazla ANALYSIS_MAX_CONCURRENT); boş slot yoksa 'waiting' olayı yayınla ve bekle"""
+    if not _analysis_slots.acquire(blocking=False):
+        logger.info(f"Analiz sırada bekliyor ({ANALYSIS_MAX_CONCURRENT} analiz çalışıyor): {job_id}")
+        progress.hub.publish(job_id, 'waiting', {'job_id': job_id, 'max_concurrent': ANALYSIS_MAX_CONCURRENT})
+        _analysis_slots.acquire()
+    try:
+        yield
+    finally:
+        _analysis_slots.release()
+
+def start_async_analysis(job_id, url, profile):
+    """Analizi arka plan thread'inde başlat; 202 + ilerleme stream'i (SSE) ve iş adresi döndür"""
+    domain = ScraperService.extract_domain(url)
+    active_job_id = progress.hub.active_job(domain)
+    if active_job_id is None:
+        progress.hub.open(job_id, domain)  # Stream thread başlamadan da bağlanabilsin
+        threading.Thread(target=_run_analysis_in_background, args=(job_id, url, domain, profile),
+                         name=f"analysis-{job_id}", daemon=True).start()
+    else:
+        job_id = active_job_id  # Bu süreçte aynı domain için çalışan analize bağlan
+    response = jsonify({
+        'job_id': job_id,
+        'status': 'running' if active_job_id is None else 'attached',
+        'coalesced': active_job_id is not None,
+        'domain': domain,
+        'status_url': f'/api/jobs/{job_id}',
+        'events_url': f'/api/jobs/{job_id}/events'
+    })
+    response.headers['Location'] = f'/api/jobs/{job_id}'
+    return response, 202
+
+def _run_analysis_in_background(job_id, url, domain, profile):
+    try:
+        result, shared = _analysis_flight.do(domain, lambda: run_analysis(job_id, url, domain, profile))
+        if shared:
+            # run_analysis bu iş için çalışmadı; paylaşılan sonucu bu işin stream'ine yaz
+            progress.hub.publish(job_id, 'error' if 'error' in result else 'result', dict(result, coalesced=True))
+    except Exception as e:
+        logger.error(f"Arka plan analizi hatası: {str(e)}", exc_info=True)
+        progress.hub.publish(job_id, 'error', {'job_id': job_id, 'error': f'Analiz hatası: {str(e)}'})
+
+def enqueue_analysis(job_id, url, profile):
+    """Analizi ScrapeJobs kuyruğuna yaz (scraper_worker süreçleri çalıştırır); 202 + iş adresi döndür"""
+    db = None
+    try:
+        db = create_database(use_pool=True)
+        if not db.connect():
+            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+        # Domain normalizasyonu için ScraperService oluşturulmaz (scraper'lar API sürecinde yüklenmez)
+        domain = ScraperService.extract_domain(url)
+        # Domain için kuyrukta/çalışan iş varsa yeni iş eklenmez, o işe bağlanılır
+        job_id, created = db.enqueue_job(job_id, url, domain, profile=profile)
+        db.close(force=False)  # Pool'da tut
+        response = jsonify({
+            'job_id': job_id,
+            'status': 'queued' if created else 'attached',
+            'coalesced': not created,
+            'domain': domain,
+            'status_url': f'/api/jobs/{job_id}',
+            'events_url': f'/api/jobs/{job_id}/events'
+        })
+        response.headers['Location'] = f'/api/jobs/{job_id}'
+        return response, 202
+    except Exception as e:
+        logger.error(f"İş kuyruğa eklenemedi: {str(e)}")
+        if db:
+            try:
+                db.close(force=True)
+            except:
+                pass
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Kuyruğa alınmış analizin durumu (queued, running, succeeded, failed) ve bitince sonucu"""
+    db = None
+    try:
+        db = create_database(use_pool=True)
+        if not db.connect():
+            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+        job = db.get_job(job_id)
+        db.close(force=False)  # Pool'da tut
+        if job is None:
+            return jsonify({'error': 'İş bulunamadı'}), 404
+        return jsonify(job), 200
+    except Exception as e:
+        logger.error(f"İş durumu getirme hatası: {str(e)}")
+        if db:
+            try:
+                db.close(force=True)
+            except:
+                pass
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Analiz ilerlemesini Server-Sent Events olarak yayınla (started, source_started, page, records,
+    source_finished, saved, scored, result/error). Bu süreçte çalışan işlerin tüm olayları, başka
+    süreçteki işlerin durum değişiklikleri gönderilir. Last-Event-ID ile kaldığı yerden devam edilir.
+    """
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0)
+    except ValueError:
+        return jsonify({'error': 'Geçersiz Last-Event-ID'}), 400
+    if not _sse_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Çok fazla açık ilerleme stream\'i, daha sonra tekrar deneyin'})
+        response.headers['Retry-After'] = str(SSE_KEEPALIVE_SECONDS)
+        return response, 503
+    
+    try:
+        if progress.hub.needs_watch(job_id):
+            # Bu süreçte çalışmayan iş: durumu veritabanından (iş başına tek thread) izlenir
+            db = create_database(use_pool=True)
+            if not db.connect():
+                _sse_slots.release()
+                return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+            job = db.get_job(job_id)
+            db.close(force=False)  # Pool'da tut
+            if job is None:
+                _sse_slots.release()
+                return jsonify({'error': 'İş bulunamadı'}), 404
+            progress.hub.watch_job(job_id, lambda: create_database(use_pool=False))
+    except Exception as e:
+        logger.error(f"İlerleme stream'i açılamadı: {str(e)}")
+        _sse_slots.release()
+        return jsonify({'error': str(e)}), 500
+    
+    def generate():
+        try:
+            yield f"retry: {SSE_KEEPALIVE_SECONDS * 1000}\n\n"
+            for item in progress.hub.subscribe(job_id, last_event_id, SSE_KEEPALIVE_SECONDS):
+                if item is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event_id, event, data = item
+                yield f"id: {event_id}\nevent: {event}\ndata: {app.json.dumps(data)}\n\n"
+        finally:
+            _sse_slots.release()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx arkasında olayların tamponlanmaması için
+    })
+
 @app.route('/api/site/<domain>', methods=['GET'])
 def get_site_info(domain):
     """Site bilgilerini getir"""
     db = None
     try:
-        db = Database(use_pool=True)
+        db = create_database(use_pool=True, read_only=True)
         if not db.connect():
             return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
         
         # Site bilgileri için ayrı cursor - fetchall kullan ve hemen kapat
         site_row = None
         try:
+            # Şikayet sayısı ETag için aynı sorguda alınır (IX_Complaints_SiteID üzerinden)
             cursor1 = db.conn.cursor()
             cursor1.execute("""
-                SELECT SiteID, Domain, SiteName, RiskScore, LastScannedDate, CreatedDate
-                FROM Sites WHERE Domain = ?
+                SELECT s.SiteID, s.Domain, s.SiteName, s.RiskScore, s.LastScannedDate, s.CreatedDate,
+                       (SELECT COUNT(*) FROM Complaints c WHERE c.SiteID = s.SiteID), s.RiskModel
+                FROM Sites s WHERE s.Domain = ?
             """, (domain,))
             rows = cursor1.fetchall()
             cursor1.close()  # Cursor'ı hemen kapat
@@ -151,48 +458,44 @@ def get_site_info(domain):
             db.close(force=True)
             return jsonify({'error': f'Site bilgisi çekilemedi: {str(e)}'}), 500
         
+        # Site değişmediyse şikayet sorgusunu hiç çalıştırmadan 304 döndür
+        etag = make_etag('site', site_row[0], site_row[4], site_row[3], site_row[6], site_row[7])
+        cached_response = not_modified(etag)
+        if cached_response is not None:
+            db.close(force=False)
+            return cached_response
+        
         site_info = {
             'site_id': site_row[0],
             'domain': site_row[1],
             'site_name': site_row[2],
             'risk_score': site_row[3],
-            'last_scanned_date': site_row[4].isoformat() if site_row[4] else None,
-            'created_date': site_row[5].isoformat() if site_row[5] else None
+            'risk_model': site_row[7],
+            'last_scanned_date': site_row[4],
+            'created_date': site_row[5]
         }
         
         # Şikayetler için ayrı cursor - fetchall kullan ve hemen kapat
         complaints = []
         resolved_count = 0
         unresolved_count = 0
+        complaints_loaded = False
         try:
             cursor2 = db.conn.cursor()
-            cursor2.execute("""
-                SELECT Source, Title, Content, Author, Date, Rating, Sentiment, URL, IsResolved
-                FROM Complaints WHERE SiteID = ? ORDER BY Date DESC
-            """, (site_row[0],))
-            
-            rows = cursor2.fetchall()  # Tüm sonuçları al
+            with metrics.DB_QUERY_DURATION.time(method='get_site_complaints'):
+                cursor2.execute("""
+                    SELECT Source, Title, Content, Author, Date, Rating, Sentiment, URL, IsResolved
+                    FROM Complaints WHERE SiteID = ? ORDER BY Date DESC
+                """, (site_row[0],))
+                
+                rows = cursor2.fetchall()  # Tüm sonuçları al
             cursor2.close()  # Cursor'ı hemen kapat
             
             # Sonuçları işle
-            for row in rows:
-                is_resolved = bool(row[8]) if row[8] is not None else False
-                if is_resolved:
-                    resolved_count += 1
-                else:
-                    unresolved_count += 1
-                    
-                complaints.append({
-                    'source': row[0],
-                    'title': row[1],
-                    'content': row[2],
-                    'author': row[3],
-                    'date': row[4].isoformat() if row[4] else None,
-                    'rating': row[5],
-                    'sentiment': row[6],
-                    'url': row[7],
-                    'is_resolved': is_resolved
-                })
+            complaints = [Complaint.from_row(row) for row in rows]
+            resolved_count = sum(1 for c in complaints if c.is_resolved)
+            unresolved_count = len(complaints) - resolved_count
+            complaints_loaded = True
         except Exception as e:
             logger.error(f"Şikayetler çekme hatası: {str(e)}")
             # Hata olsa bile devam et, boş liste döndür
@@ -201,8 +504,8 @@ def get_site_info(domain):
         site_info['total_complaints'] = len(complaints)
         
         # Risk analizi
-        negative_count = sum(1 for c in complaints if c['sentiment'] == 'negative')
-        positive_count = sum(1 for c in complaints if c['sentiment'] == 'positive')
+        negative_count = sum(1 for c in complaints if c.sentiment == 'negative')
+        positive_count = sum(1 for c in complaints if c.sentiment == 'positive')
         
         site_info['statistics'] = {
             'total': len(complaints),
@@ -214,7 +517,10 @@ def get_site_info(domain):
         }
         
         db.close(force=False)  # Pool'da tut
-        return jsonify(site_info), 200
+        response = jsonify(site_info)
+        if complaints_loaded:
+            response.set_etag(etag, weak=True)  # Hatalı/eksik yanıt istemcide önbelleğe alınmasın
+        return response, 200
         
     except Exception as e:
         logger.error(f"Site bilgisi getirme hatası: {str(e)}")
@@ -226,40 +532,160 @@ def get_site_info(domain):
                 pass
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/site/<domain>/trend', methods=['GET'])
+def get_site_trend(domain):
+    """
+    Sitenin günlük şikayet sayıları (ComplaintDailyStats, şikayet geçmişinin boyutundan bağımsız)
+    Parametreler: date_from, date_to (YYYY-MM-DD, dahil; varsayılan son TREND_DEFAULT_DAYS gün),
+    source (tekrarlanabilir/virgüllü)
+    """
+    try:
+        date_from = parse_date_arg('date_from')
+        date_to = parse_date_arg('date_to')
+    except ValueError:
+        return jsonify({'error': 'Geçersiz tarih parametresi (tarih formatı: YYYY-MM-DD)'}), 400
+    date_to = date_to.date() if date_to else datetime.now().date()
+    date_from = date_from.date() if date_from else date_to - timedelta(days=TREND_DEFAULT_DAYS - 1)
+    if date_from > date_to or (date_to - date_from).days >= TREND_MAX_DAYS:
+        return jsonify({'error': f'Tarih aralığı en fazla {TREND_MAX_DAYS} gün olabilir'}), 400
+    sources = parse_list_arg('source')
+    
+    db = None
+    try:
+        db = create_database(use_pool=True, read_only=True)
+        if not db.connect():
+            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+        
+        cursor = db.conn.cursor()
+        cursor.execute("SELECT SiteID, LastScannedDate FROM Sites WHERE Domain = ?", (domain,))
+        site_row = cursor.fetchone()
+        cursor.close()
+        if not site_row:
+            db.close(force=False)
+            return jsonify({'error': 'Site bulunamadı'}), 404
+        
+        # Sayaçlar tarama sırasında değişir; tarama bitince LastScannedDate güncellenir
+        etag = make_etag('trend', site_row[0], site_row[1], date_from, date_to, ','.join(sources))
+        cached_response = not_modified(etag)
+        if cached_response is not None:
+            db.close(force=False)
+            return cached_response
+        
+        days = db.get_complaint_trend(site_row[0], date_from, date_to, sources=sources)
+        db.close(force=False)  # Pool'da tut
+        response = jsonify({
+            'domain': domain,
+            'date_from': date_from,
+            'date_to': date_to,
+            'days': days
+        })
+        response.set_etag(etag, weak=True)
+        return response, 200
+        
+    except Exception as e:
+        logger.error(f"Trend getirme hatası: {str(e)}")
+        if db:
+            try:
+                db.close(force=True)
+            except:
+                pass
+        return jsonify({'error': str(e)}), 500
+
+def encode_site_cursor(sort, row):
+    """Sayfanın son satırından opak sayfa imleci (sıralama, sıralama değeri, SiteID)"""
+    value = {'last_scanned': row[3], 'risk_score': row[2], 'domain': row[0]}[sort]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row[4]], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_site_cursor(cursor, sort):
+    """Sayfa imlecini (sıralama değeri, SiteID) çiftine çevir; geçersiz veya başka sıralamaya aitse ValueError"""
+    try:
+        cursor_sort, value, site_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError('Geçersiz cursor')
+    if cursor_sort != sort or not isinstance(site_id, int):
+        raise ValueError('Cursor bu sıralamaya ait değil')
+    if sort == 'last_scanned' and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, site_id
+
 @app.route('/api/sites', methods=['GET'])
 def get_all_sites():
-    """Tüm siteleri listele"""
+    """
+    Siteleri sayfa sayfa listele (keyset sayfalama)
+    Parametreler: limit, cursor (önceki yanıttaki next_cursor), sort (last_scanned, risk_score, domain),
+    risk_level (Low/Medium/High/Critical), min_score, max_score, scanned_from, scanned_to (YYYY-MM-DD, dahil),
+    domain_prefix
+    """
+    sort = request.args.get('sort', 'last_scanned')
+    if sort not in SITE_LIST_SORTS:
+        return jsonify({'error': f"Geçersiz sort (desteklenen: {', '.join(SITE_LIST_SORTS)})"}), 400
+    try:
+        limit = min(SITES_MAX_PAGE_SIZE, max(1, int(request.args.get('limit', SITES_DEFAULT_PAGE_SIZE))))
+        risk_min = parse_int_arg('min_score')
+        risk_max = parse_int_arg('max_score')
+        scanned_from = parse_date_arg('scanned_from')
+        scanned_to = parse_date_arg('scanned_to')
+        cursor_arg = request.args.get('cursor')
+        after = decode_site_cursor(cursor_arg, sort) if cursor_arg else None
+    except ValueError as e:
+        return jsonify({'error': f'Geçersiz parametre: {str(e)}'}), 400
+    if scanned_to is not None:
+        scanned_to += timedelta(days=1)  # Bitiş günü dahil
+    risk_level = request.args.get('risk_level')
+    if risk_level:
+        if risk_level not in risk.RISK_LEVEL_RANGES:
+            return jsonify({'error': f"Geçersiz risk_level (desteklenen: {', '.join(risk.RISK_LEVEL_RANGES)})"}), 400
+        level_min, level_max = risk.RISK_LEVEL_RANGES[risk_level]
+        risk_min = level_min if risk_min is None else max(risk_min, level_min)
+        risk_max = level_max if risk_max is None else min(risk_max, level_max)
+    domain_prefix = (request.args.get('domain_prefix') or '').strip().lower()
+    
     db = None
     try:
-        db = Database(use_pool=True)
+        db = create_database(use_pool=True, read_only=True)
         if not db.connect():
             return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
         
-        sites = []
+        # Liste sürümü: site sayısı + en son tarama zamanı + skor revizyonları (yeniden skorlama da ETag'i değiştirir)
+        etag = None
         try:
-            cursor = db.conn.cursor()
-            cursor.execute("""
-                SELECT Domain, SiteName, RiskScore, LastScannedDate
-                FROM Sites ORDER BY LastScannedDate DESC
-            """)
-            
-            rows = cursor.fetchall()  # Tüm sonuçları al
-            cursor.close()  # Cursor'ı hemen kapat
-            
-            # Sonuçları işle
-            for row in rows:
-                sites.append({
-                    'domain': row[0],
-                    'site_name': row[1],
-                    'risk_score': row[2],
-                    'last_scanned_date': row[3].isoformat() if row[3] else None
-                })
+            etag = make_etag('sites', *db.get_site_list_version(), request.query_string.decode('utf-8'))
         except Exception as e:
-            logger.error(f"Siteler çekme hatası: {str(e)}")
-            # Hata olsa bile devam et, boş liste döndür
+            logger.warning(f"Site listesi sürümü alınamadı: {str(e)}")
+        
+        if etag:
+            cached_response = not_modified(etag)
+            if cached_response is not None:
+                db.close(force=False)
+                return cached_response
         
+        # Sonraki sayfa olup olmadığını anlamak için bir fazla satır okunur
+        rows = db.list_sites(
+            limit + 1, sort=sort, after=after, risk_min=risk_min, risk_max=risk_max,
+            scanned_from=scanned_from, scanned_to=scanned_to, domain_prefix=domain_prefix
+        )
         db.close(force=False)  # Pool'da tut
-        return jsonify({'sites': sites}), 200
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        sites = [{
+            'domain': row[0],
+            'site_name': row[1],
+            'risk_score': row[2],
+            'last_scanned_date': row[3]
+        } for row in rows]
+        response = jsonify({
+            'sites': sites,
+            'sort': sort,
+            'limit': limit,
+            'next_cursor': encode_site_cursor(sort, rows[-1]) if has_more else None
+        })
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response, 200
         
     except Exception as e:
         logger.error(f"Siteleri listeleme hatası: {str(e)}")
@@ -271,17 +697,215 @@ def get_all_sites():
                 pass
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/rankings', methods=['GET'])
+def get_rankings():
+    """
+    Siteler arası sıralama: risk skoru, negatif oran, çözüm oranı ve ortalama puanın yüzdelik ve z-skorları
+    Parametreler: domain (tek sitenin diğerlerine göre konumu) veya sort (risk_score, negative_ratio,
+    resolution_rate, average_rating), order (asc/desc; varsayılan en riskli önce), limit, offset
+    """
+    domain = (request.args.get('domain') or '').strip().lower()
+    sort = request.args.get('sort', 'risk_score')
+    if sort not in rankings.METRICS:
+        return jsonify({'error': f"Geçersiz sort (desteklenen: {', '.join(rankings.METRICS)})"}), 400
+    order = request.args.get('order') or ('desc' if rankings.METRICS[sort] else 'asc')
+    if order not in ('asc', 'desc'):
+        return jsonify({'error': "Geçersiz order (asc veya desc)"}), 400
+    try:
+        limit = min(RANKING_MAX_PAGE_SIZE, max(1, int(request.args.get('limit', 50))))
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({'error': 'Geçersiz limit veya offset'}), 400
+    
+    db = None
+    try:
+        db = create_database(use_pool=True, read_only=True)
+        if not db.connect():
+            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+        ranking = rankings.get_rankings(db)
+        db.close(force=False)  # Pool'da tut
+        
+        etag = make_etag('rankings', *ranking.version, domain, sort, order, limit, offset)
+        cached_response = not_modified(etag)
+        if cached_response is not None:
+            return cached_response
+        
+        body = {
+            'site_count': ranking.count,
+            'computed_at': ranking.computed_at,
+            'summary': ranking.summary,
+        }
+        if domain:
+            site = ranking.find(domain)
+            if site is None:
+                return jsonify({'error': 'Site bulunamadı'}), 404
+            body['site'] = site
+        else:
+            sites, ranked = ranking.page(sort, order == 'desc', limit, offset)
+            body.update({'sort': sort, 'order': order, 'limit': limit, 'offset': offset,
+                         'total': ranked, 'sites': sites})
+        response = jsonify(body)
+        response.set_etag(etag, weak=True)
+        return response, 200
+        
+    except Exception as e:
+        logger.error(f"Sıralama hatası: {str(e)}")
+        if db:
+            try:
+                db.close(force=True)
+            except:
+                pass
+        return jsonify({'error': str(e)}), 500
+
+def parse_date_arg(name):
+    """YYYY-MM-DD formatındaki sorgu parametresini datetime'a çevir (yoksa None)"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d')
+
+def parse_int_arg(name):
+    """Tamsayı sorgu parametresi (yoksa None, geçersizse ValueError)"""
+    value = request.args.get(name)
+    return int(value) if value not in (None, '') else None
+
+def parse_list_arg(name):
+    """Tekrarlanan veya virgülle ayrılmış sorgu parametresini listeye çevir"""
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(v.strip() for v in value.split(',') if v.strip())
+    return values
+
+@app.route('/api/search', methods=['GET'])
+def search_complaints():
+    """
+    Tüm sitelerin şikayetlerinde tam metin arama
+    Parametreler: q, source (tekrarlanabilir/virgüllü), date_from, date_to (YYYY-MM-DD, dahil), page, page_size
+    Sonuçlar en son kaydedilenden eskiye sıralanır
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'error': 'Arama metni (q) gerekli'}), 400
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        page_size = min(SEARCH_MAX_PAGE_SIZE, max(1, int(request.args.get('page_size', 20))))
+        date_from = parse_date_arg('date_from')
+        date_to = parse_date_arg('date_to')
+    except ValueError:
+        return jsonify({'error': 'Geçersiz sayfa veya tarih parametresi (tarih formatı: YYYY-MM-DD)'}), 400
+    if date_to is not None:
+        date_to += timedelta(days=1)  # Bitiş günü dahil
+    sources = parse_list_arg('source')
+    
+    db = None
+    try:
+        db = create_database(use_pool=True, read_only=True)
+        if not db.connect():
+            return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
+        
+        results, total, total_capped = db.search_complaints(
+            query, sources=sources, date_from=date_from, date_to=date_to,
+            limit=page_size, offset=(page - 1) * page_size
+        )
+        db.close(force=False)  # Pool'da tut
+        return jsonify({
+            'query': query,
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'total_capped': total_capped,  # True ise gerçek eşleşme sayısı total'dan fazla
+            'total_pages': (total + page_size - 1) // page_size,
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Arama hatası: {str(e)}")
+        if db:
+            try:
+                db.close(force=True)
+            except:
+                pass
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export', methods=['GET'])
+def export_complaints():
+    """
+    Şikayetleri CSV veya Parquet dosyası olarak dışa aktar (parça parça stream edilir)
+    Parametreler: format (csv/parquet), domain, source, sentiment (tekrarlanabilir/virgüllü),
+    date_from, date_to (YYYY-MM-DD, dahil)
+    """
+    export_format = (request.args.get('format') or 'csv').lower()
+    if export_format not in export.FORMATS:
+        return jsonify({'error': f"Geçersiz format (desteklenen: {', '.join(sorted(export.FORMATS))})"}), 400
+    if export_format == 'parquet' and not export.parquet_available():
+        return jsonify({'error': 'Parquet dışa aktarımı için sunucuda pyarrow kurulu değil'}), 501
+    try:
+        date_from = parse_date_arg('date_from')
+        date_to = parse_date_arg('date_to')
+    except ValueError:
+        return jsonify({'error': 'Geçersiz tarih parametresi (format: YYYY-MM-DD)'}), 400
+    if date_to is not None:
+        date_to += timedelta(days=1)  # Bitiş günü dahil
+    
+    chunks = export.export_complaints(
+        export_format, domains=parse_list_arg('domain'), sources=parse_list_arg('source'),
+        sentiments=parse_list_arg('sentiment'), date_from=date_from, date_to=date_to
+    )
+    try:
+        first = next(chunks)  # Bağlantı/sorgu hatası stream başlamadan JSON hata olarak dönsün
+    except Exception as e:
+        logger.error(f"Dışa aktarım hatası: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    def generate():
+        yield first
+        yield from chunks  # İstemci bağlantıyı keserse generator kapanır, veritabanı bağlantısı kapatılır
+    
+    mimetype, extension = export.FORMATS[export_format]
+    filename = f"sikayetler_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
+    return Response(generate(), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    })
+
+@app.route('/api/profiles', methods=['GET'])
+def get_profiles():
+    """Kayıtlı analiz profillerini listele"""
+    return jsonify({'profiles': profiling.list_profiles()}), 200
+
+@app.route('/api/profiles/<name>', methods=['GET'])
+def download_profile(name):
+    """Profil dosyasını indir (.prof - snakeviz/flameprof ile açılabilir)"""
+    if not profiling.is_valid_profile_name(name):
+        return jsonify({'error': 'Profil bulunamadı'}), 404
+    return send_from_directory(profiling.PROFILE_DIR, name, as_attachment=True)
+
 @app.route('/api/init-db', methods=['POST'])
 def init_database():
     """Veritabanı tablolarını oluştur"""
     try:
-        db = Database(use_pool=False)  # Tablo oluşturma için pool kullanma
+        db = create_database(use_pool=False)  # Tablo oluşturma için pool kullanma
         if not db.connect():
             return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
         
         if db.create_tables():
             # Migration: IsResolved sütununu ekle (eğer yoksa)
             db.migrate_add_isresolved_column()
+            # Migration: ScrapingHistory telemetri sütunları (eğer yoksa)
+            db.migrate_add_scraping_telemetry()
+            # Migration: scraper_worker iş kuyruğu
+            db.migrate_add_scrape_jobs()
+            # Migration: çözülmüş kaynak tanımlayıcıları (Trustpilot/Şikayetvar/Google Maps)
+            db.migrate_add_source_identities()
+            # Migration: risk skoru sayaçları ve Sites.RiskModel (boşsa mevcut şikayetlerden doldurulur)
+            db.migrate_add_risk_counters()
+            # Migration: günlük şikayet sayaçları (boşsa mevcut şikayetlerden doldurulur)
+            db.migrate_add_daily_stats()
+            # Migration: şikayet metinleri için full-text index (SQL Server FTS / SQLite FTS5)
+            db.migrate_add_fulltext_search()
+            # Migration: /api/sites filtre ve sıralama index'leri
+            db.migrate_add_site_list_indexes()
+            # Migration: okuma bağlantıları için SNAPSHOT isolation (SQL Server ALLOW_SNAPSHOT_ISOLATION)
+            db.migrate_enable_snapshot_isolation()
             db.close(force=True)  # Tablo oluşturma sonrası kapat
             return jsonify({'message': 'Veritabanı tabloları başarıyla oluşturuldu'}), 200
         else:
@@ -292,11 +916,29 @@ def init_database():
         logger.error(f"Veritabanı başlatma hatası: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/rescore', methods=['POST'])
+def rescore_sites():
+    """
+    Tüm siteleri şikayet sayaçlarından yeniden skorla (risk modeli değiştiğinde)
+    İsteğe bağlı gövde: {"model": "v2"} (varsayılan RISK_MODEL)
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        version, _ = risk.get_risk_model(data.get('model'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        updated = get_scraper_service().rescore_all_sites(version)
+        return jsonify({'message': 'Risk skorları güncellendi', 'risk_model': version, 'sites_updated': updated}), 200
+    except Exception as e:
+        logger.error(f"Yeniden skorlama hatası: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/migrate-isresolved', methods=['POST'])
 def migrate_isresolved():
     """Complaints tablosuna IsResolved sütunu ekle (migration)"""
     try:
-        db = Database(use_pool=False)
+        db = create_database(use_pool=False)
         if not db.connect():
             return jsonify({'error': 'Veritabanı bağlantı hatası'}), 500
         
@@ -344,7 +986,7 @@ if __name__ == '__main__':
             for url in access_urls:
                 logger.info(f"  → {url}")
             logger.info("=" * 60)
-            serve(app, host=API_HOST, port=API_PORT, threads=4, channel_timeout=600)
+            serve(app, host=API_HOST, port=API_PORT, threads=API_THREADS, channel_timeout=600)
         except ImportError:
             logger.warning("Waitress yüklü değil, development server kullanılıyor")
             logger.warning("Production için: pip install waitress")
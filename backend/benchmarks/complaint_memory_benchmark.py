@@ -0,0 +1,113 @@
+"""
+Şikayet kayıt tipi bellek/tarama karşılaştırması: sözlük vs Complaint (__slots__).
+
+Aynı içerikli N kaydı (varsayılan 100.000) iki biçimde oluşturur; tracemalloc ile
+toplam bellek, kayıt başına byte ve sentiment sayımı gibi bir agregasyonun süresini
+raporlar. Metin alanları iki biçimde de paylaşılır, fark kayıt yapısının kendisidir.
+
+Kullanım (backend dizininden):
+    python benchmarks/complaint_memory_benchmark.py
+    python benchmarks/complaint_memory_benchmark.py --count 500000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Complaint  # noqa: E402
+
+SENTIMENTS = ('negative', 'positive', 'neutral')
+
+
+def build_fields(count, seed=42):
+    """Kayıt alanlarını önceden üret (ölçüme metin oluşturma maliyeti girmesin)"""
+    rng = random.Random(seed)
+    base_date = datetime(2024, 1, 1)
+    fields = []
+    for i in range(count):
+        fields.append((
+            rng.choice(('sikayetvar', 'trustpilot', 'google_reviews')),
+            f"Şikayet başlığı {i}",
+            f"Sipariş {i} hakkında şikayet içeriği " * 4,
+            f"Kullanıcı {i % 5000}",
+            base_date + timedelta(minutes=i),
+            rng.choice((None, 1, 2, 3, 4, 5)),
+            rng.choice(SENTIMENTS),
+            f"https://www.sikayetvar.com/ornek/sikayet-{i}",
+            rng.random() < 0.2,
+        ))
+    return fields
+
+
+def as_dicts(fields):
+    return [
+        {'source': s, 'title': t, 'content': c, 'author': a, 'date': d, 'rating': r,
+         'sentiment': st, 'url': u, 'is_resolved': res}
+        for s, t, c, a, d, r, st, u, res in fields
+    ]
+
+
+def as_complaints(fields):
+    return [Complaint(t, c, a, d, r, st, u, res, s) for s, t, c, a, d, r, st, u, res in fields]
+
+
+def measure(build, fields):
+    """(kayıtlar, ayrılan byte) döndür"""
+    gc.collect()
+    tracemalloc.start()
+    records = build(fields)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current
+
+
+def scan_seconds(records, get_sentiment, repeat=5):
+    """Sentiment sayımı (kayıt listesi üzerinde tam tarama) için en iyi süre"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        negative = sum(1 for r in records if get_sentiment(r) == 'negative')
+        positive = sum(1 for r in records if get_sentiment(r) == 'positive')
+        best = min(best, time.perf_counter() - start)
+    assert negative + positive <= len(records)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Complaint kayıt tipi bellek karşılaştırması")
+    parser.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args()
+
+    fields = build_fields(args.count)
+
+    dicts, dict_bytes = measure(as_dicts, fields)
+    dict_scan = scan_seconds(dicts, lambda r: r['sentiment'])
+    del dicts
+
+    complaints, slot_bytes = measure(as_complaints, fields)
+    slot_scan = scan_seconds(complaints, lambda r: r.sentiment)
+
+    start = time.perf_counter()
+    for complaint in complaints:
+        complaint.to_dict()
+    to_dict_seconds = time.perf_counter() - start
+
+    per_100k = 100_000 / args.count
+    print(f"{args.count} kayıt")
+    print(f"{'Biçim':<22}{'MB / 100k':>12}{'byte/kayıt':>12}{'tarama ms':>12}")
+    print(f"{'dict':<22}{dict_bytes * per_100k / 1024 / 1024:>12.1f}{dict_bytes / args.count:>12.0f}"
+          f"{dict_scan * 1000:>12.1f}")
+    print(f"{'Complaint (__slots__)':<22}{slot_bytes * per_100k / 1024 / 1024:>12.1f}"
+          f"{slot_bytes / args.count:>12.0f}{slot_scan * 1000:>12.1f}")
+    print(f"Bellek tasarrufu: %{(1 - slot_bytes / dict_bytes) * 100:.0f}")
+    print(f"JSON sınırında to_dict(): {to_dict_seconds * 1000:.1f} ms ({args.count} kayıt)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Kaynaklar arası yakın-kopya tespiti benchmark'ı (dedup.py).
+
+Sentetik şikayetler üretir: bir kısmı aynı şikayetin farklı kaynaklara küçük
+değişikliklerle (büyük/küçük harf, noktalama, kelime ekleme/çıkarma) yazılmış
+kopyalarıdır. Büyük partilerde süre, kayıt/saniye ve bilinen gruplara göre
+kesinlik/duyarlılık raporlanır; küçük partilerde tüm çiftleri karşılaştıran
+kaba yöntemle hız farkı gösterilir.
+
+Kullanım (backend dizininden):
+    python benchmarks/dedup_benchmark.py
+    python benchmarks/dedup_benchmark.py --sizes 10000 100000 --threshold 0.5 --bands 32
+    python benchmarks/dedup_benchmark.py --edits 2 --dup-rate 0.5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dedup  # noqa: E402
+from models import Complaint  # noqa: E402
+
+SOURCES = ('sikayetvar', 'trustpilot', 'google_reviews')
+VOCABULARY = (
+    "sipariş kargo iade ürün para müşteri hizmetleri gün hafta teslimat geç hasarlı eksik yanlış "
+    "fatura ödeme kart iptal değişim garanti destek mail telefon cevap yok bekliyorum mağdur "
+    "oldum rezalet berbat kötü sorun problem çözüm talep ettim aradım ulaşamadım paket açtım "
+    "kırık defolu beden renk model stok satıcı mağaza uygulama site hesap kampanya indirim kupon"
+).split()
+# Ekli kelime biçimleri (gerçek metinlerdeki kelime çeşitliliğine yaklaşmak için)
+SUFFIXES = ('', 'ler', 'de', 'den', 'im', 'imiz', 'ı', 'a', 'ına', 'ını', 'le', 'siz', 'li', 'miş')
+VOCABULARY = [word + suffix for word in VOCABULARY for suffix in SUFFIXES]
+
+
+def make_text(rng, words):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def perturb(rng, text, edits):
+    """Aynı şikayetin başka kaynakta yazılmış hali"""
+    tokens = text.split()
+    for _ in range(edits):
+        action = rng.random()
+        position = rng.randrange(len(tokens))
+        if action < 0.4 and len(tokens) > 10:
+            del tokens[position]
+        elif action < 0.8:
+            tokens.insert(position, rng.choice(VOCABULARY))
+        else:
+            tokens[position] = tokens[position].upper()
+    result = ' '.join(tokens)
+    if rng.random() < 0.5:
+        result = result.capitalize() + '!!'
+    return result
+
+
+def build_batch(count, dup_rate, edits, seed=7):
+    """(şikayetler, grup etiketleri) — aynı etiketli kayıtlar aynı şikayettir"""
+    rng = random.Random(seed)
+    complaints, labels = [], []
+    group = 0
+    while len(complaints) < count:
+        text = make_text(rng, rng.randint(25, 80))
+        title = make_text(rng, 4)
+        copies = [rng.choice(SOURCES)]
+        if rng.random() < dup_rate:
+            copies = rng.sample(SOURCES, rng.randint(2, 3))
+        for index, source in enumerate(copies):
+            content = text if index == 0 else perturb(rng, text, edits)
+            complaints.append(Complaint(title=title, content=content, source=source))
+            labels.append(group)
+        group += 1
+    return complaints[:count], labels[:count]
+
+
+def score(groups, labels, complaints):
+    """Bulunan gruplardaki (temsilci, kopya) çiftlerinin kesinlik/duyarlılığı"""
+    found = {(root, index) for root, members in groups.items() for index in members}
+    true_positive = sum(1 for root, index in found if labels[root] == labels[index])
+
+    first_of_group, expected = {}, 0
+    for index, label in enumerate(labels):
+        if label in first_of_group:
+            expected += 1
+        else:
+            first_of_group[label] = index
+    precision = true_positive / len(found) if found else 1.0
+    recall = true_positive / expected if expected else 1.0
+    return precision, recall
+
+
+def brute_force(complaints, args):
+    """Tüm imza çiftlerini karşılaştıran O(n²) referans"""
+    signatures = []
+    for complaint in complaints:
+        tokens = dedup.normalize_text(dedup.complaint_text(complaint))
+        signatures.append(dedup.minhash_signature(dedup.shingles(tokens), args.num_hashes)
+                          if len(tokens) >= args.min_tokens else None)
+    matches = 0
+    for i in range(len(signatures)):
+        if signatures[i] is None:
+            continue
+        for j in range(i + 1, len(signatures)):
+            if signatures[j] is not None and complaints[i].source != complaints[j].source \
+                    and dedup.estimated_jaccard(signatures[i], signatures[j]) >= args.threshold:
+                matches += 1
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yakın-kopya tespiti benchmark'ı")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--threshold', type=float, default=dedup.DEDUP_JACCARD_THRESHOLD)
+    parser.add_argument('--num-hashes', type=int, default=dedup.DEDUP_NUM_HASHES)
+    parser.add_argument('--bands', type=int, default=dedup.DEDUP_BANDS)
+    parser.add_argument('--min-tokens', type=int, default=dedup.DEDUP_MIN_TOKENS)
+    parser.add_argument('--dup-rate', type=float, default=0.3, help="Birden fazla kaynağa yazılan şikayet oranı")
+    parser.add_argument('--edits', type=int, default=1, help="Kopya başına kelime düzeyinde değişiklik sayısı")
+    parser.add_argument('--brute-force-limit', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"threshold={args.threshold} num_hashes={args.num_hashes} bands={args.bands} min_tokens={args.min_tokens} "
+          f"dup_rate={args.dup_rate} edits={args.edits}")
+    print(f"{'Kayıt':>8} {'LSH sn':>8} {'kayıt/sn':>10} {'kopya':>7} {'kesinlik':>9} {'duyarlılık':>10} {'O(n²) sn':>9}")
+    for size in args.sizes:
+        complaints, labels = build_batch(size, args.dup_rate, args.edits)
+        start = time.perf_counter()
+        groups = dedup.find_duplicate_groups(complaints, threshold=args.threshold, num_hashes=args.num_hashes,
+                                             bands=args.bands, min_tokens=args.min_tokens, cross_source_only=True)
+        seconds = time.perf_counter() - start
+        precision, recall = score(groups, labels, complaints)
+        duplicates = sum(len(members) for members in groups.values())
+
+        brute = '-'
+        if size <= args.brute_force_limit:
+            start = time.perf_counter()
+            brute_force(complaints, args)
+            brute = f"{time.perf_counter() - start:.2f}"
+        print(f"{size:>8} {seconds:>8.2f} {size / seconds:>10.0f} {duplicates:>7} "
+              f"{precision:>9.3f} {recall:>10.3f} {brute:>9}")
+
+
+if __name__ == '__main__':
+    main()
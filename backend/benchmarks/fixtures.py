@@ -0,0 +1,113 @@
+"""
+Parser benchmark'ları ve mock hedef sunucu için HTML/DOM fixture'ları.
+
+Sentetik sayfalar scraper'ların beklediği yapıyı (class adları, etiketler)
+birebir taklit eder. Gerçek sayfalardan kaydedilmiş fixture'lar
+benchmarks/fixtures/<kaynak>/*.html altına konursa benchmark onları da çalıştırır.
+"""
+import html
+import json
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Küçükten çok büyüğe sayfa boyutları (sayfa başına kayıt sayısı)
+SIZES = {
+    'small': 10,
+    'medium': 100,
+    'large': 1000,
+    'xlarge': 5000,
+}
+
+SENTENCES = [
+    "Siparişim 15 gündür kargoya verilmedi, müşteri hizmetleri cevap vermiyor.",
+    "Ürün hasarlı geldi, iade talebim hâlâ sonuçlanmadı.",
+    "Para iadesi yapılmadı, defalarca aradım ama sorun çözülmedi.",
+    "Kargo gecikmesi yaşandı fakat sonunda ürün sorunsuz teslim edildi, teşekkür ederim.",
+    "Yanlış ürün gönderildi, değişim için ek ücret istendi.",
+    "Çok memnun kaldım, hızlı teslimat ve güzel paketleme.",
+    "Şikayetim firma tarafından yanıtlandı ve çözüldü.",
+]
+
+
+def _text(rng, min_sentences=1, max_sentences=4):
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(min_sentences, max_sentences)))
+
+
+def sikayetvar_page(count, company='ornek', page=1, seed=0):
+    """Şikayetvar şikayet listesi sayfası (article.card-v2)"""
+    rng = random.Random(f"sikayetvar-{company}-{page}-{seed}")
+    articles = []
+    for i in range(count):
+        idx = (page - 1) * count + i
+        title = html.escape(f"{company} şikayeti #{idx}: {rng.choice(SENTENCES)[:50]}")
+        resolved = '<span class="badge resolved">Çözüldü</span>' if rng.random() < 0.25 else ''
+        articles.append(f"""
+<article class="card-v2 complaint-card">
+  <header>
+    <a class="profile-user" href="/uye/kullanici-{idx}">Kullanıcı {idx}</a>
+    <time datetime="2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:{rng.randint(0, 59):02d}:00">tarih</time>
+    {resolved}
+  </header>
+  <h2 class="complaint-title"><a href="/{company}/sikayet-{idx}">{title}</a></h2>
+  <section>
+    <p class="complaint-description js-replace-to-link">{html.escape(_text(rng, 2, 6))}</p>
+  </section>
+  <footer><span class="view-count">{rng.randint(10, 9000)} görüntülenme</span></footer>
+</article>""")
+    return f"""<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>{company} Şikayetleri - Şikayetvar</title></head>
+<body><main class="complaint-list">{''.join(articles)}</main>
+<nav class="pagination"><a href="/{company}?page={page + 1}">Sonraki</a></nav></body></html>"""
+
+
+def trustpilot_page(count, term='ornek', seed=0):
+    """Trustpilot şirket yorum sayfası (article.review-card)"""
+    rng = random.Random(f"trustpilot-{term}-{seed}")
+    reviews = []
+    for i in range(count):
+        stars = rng.randint(1, 5)
+        star_spans = ''.join(
+            f'<span class="star {"filled" if s < stars else "empty"}"></span>' for s in range(5)
+        )
+        reply = '<div class="company-reply"><p>Merhaba, yaşadığınız sorun için üzgünüz.</p></div>' if rng.random() < 0.3 else ''
+        reviews.append(f"""
+<article class="review-card styles_reviewCard" data-review-rating="{stars}">
+  <span class="consumer-name">Müşteri {i}</span>
+  <div class="star-rating">{star_spans}</div>
+  <time datetime="2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T08:00:00">tarih</time>
+  <h2><a href="/reviews/{term}-{i}">{html.escape(rng.choice(SENTENCES)[:40])}</a></h2>
+  <p class="review-text">{html.escape(_text(rng, 1, 5))}</p>
+  {reply}
+</article>""")
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{term} Reviews | Trustpilot</title></head>
+<body><section class="business-unit">{''.join(reviews)}</section></body></html>"""
+
+
+def google_script(count, seed=0):
+    """Google Maps sayfa script'i içindeki yorum JSON'u"""
+    rng = random.Random(f"google-{seed}")
+    reviews = [
+        {
+            'reviewText': _text(rng, 1, 4),
+            'rating': rng.randint(1, 5),
+            'authorName': f"Google Kullanıcı {i}",
+        }
+        for i in range(count)
+    ]
+    return 'window.APP_INITIALIZATION_STATE = ' + json.dumps({'reviews': reviews}, ensure_ascii=False) + ';'
+
+
+def recorded_fixtures(source):
+    """benchmarks/fixtures/<kaynak>/ altındaki kaydedilmiş fixture dosyalarını (ad, içerik) olarak döndür"""
+    directory = os.path.join(FIXTURES_DIR, source)
+    if not os.path.isdir(directory):
+        return []
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.js', '.txt')):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                fixtures.append((name, f.read()))
+    return fixtures
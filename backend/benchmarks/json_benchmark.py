@@ -0,0 +1,118 @@
+"""
+JSON encode süresi ve sıkıştırılmış yanıt boyutu ölçümü.
+
+/api/site/<domain> yanıtına benzer sentetik bir şikayet listesi üretir ve
+eski yol (satır başına .isoformat() + stdlib json) ile yeni yolu (orjson,
+datetime doğrudan) karşılaştırır; ham/gzip/brotli byte sayılarını raporlar.
+
+Kullanım:
+    python benchmarks/json_benchmark.py --complaints 5000 --repeat 20
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SAMPLE_SENTENCES = [
+    "Siparişim 15 gündür kargoya verilmedi, müşteri hizmetleri cevap vermiyor.",
+    "Ürün hasarlı geldi, iade talebim hâlâ sonuçlanmadı.",
+    "Para iadesi yapılmadı, defalarca aradım ama sorun çözülmedi.",
+    "Kargo gecikmesi yaşandı fakat sonunda ürün sorunsuz teslim edildi, teşekkür ederim.",
+    "Yanlış ürün gönderildi, değişim için ek ücret istendi.",
+    "Çok memnun kaldım, hızlı teslimat ve güzel paketleme.",
+]
+
+
+def build_payload(count, seed=42):
+    """Sentetik site yanıtı üret (datetime alanları ham halde)"""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    complaints = []
+    for i in range(count):
+        content = " ".join(rng.choice(SAMPLE_SENTENCES) for _ in range(rng.randint(2, 6)))
+        complaints.append({
+            'source': rng.choice(['sikayetvar', 'trustpilot', 'google_reviews']),
+            'title': f"Şikayet #{i}: {rng.choice(SAMPLE_SENTENCES)[:40]}",
+            'content': content,
+            'author': f"Kullanıcı{rng.randint(1, 5000)}",
+            'date': now - timedelta(hours=rng.randint(0, 24 * 365)),
+            'rating': rng.choice([None, 1, 2, 3, 4, 5]),
+            'sentiment': rng.choice(['negative', 'positive', 'neutral']),
+            'url': f"https://www.sikayetvar.com/ornek/sikayet-{i}",
+            'is_resolved': rng.random() < 0.3,
+        })
+    return {
+        'site_id': 1,
+        'domain': 'ornek.com',
+        'site_name': 'Ornek',
+        'risk_score': 55,
+        'last_scanned_date': now,
+        'created_date': now - timedelta(days=30),
+        'complaints': complaints,
+        'total_complaints': count,
+    }
+
+
+def encode_legacy(payload):
+    """Eski yol: her satırda .isoformat() + stdlib json (Flask varsayılanı, sort_keys/ensure_ascii)"""
+    converted = dict(payload)
+    converted['last_scanned_date'] = payload['last_scanned_date'].isoformat()
+    converted['created_date'] = payload['created_date'].isoformat()
+    converted['complaints'] = [
+        {**c, 'date': c['date'].isoformat() if c['date'] else None} for c in payload['complaints']
+    ]
+    return json.dumps(converted, sort_keys=True).encode('utf-8')
+
+
+def encode_fast(payload):
+    """Yeni yol: orjson datetime'ı doğrudan yazar"""
+    if orjson is None:
+        return json.dumps(payload, default=lambda o: o.isoformat(), ensure_ascii=False).encode('utf-8')
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+
+def time_call(func, payload, repeat):
+    best = float('inf')
+    body = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON encode ve sıkıştırma ölçümü")
+    parser.add_argument('--complaints', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payload = build_payload(args.complaints)
+
+    print(f"Şikayet sayısı: {args.complaints}")
+    print(f"{'encoder':<10} {'encode ms':>10} {'raw KB':>10} {'gzip KB':>10} {'br KB':>10}")
+    for name, func in [('legacy', encode_legacy), ('fast', encode_fast)]:
+        seconds, body = time_call(func, payload, args.repeat)
+        gz = len(gzip.compress(body, compresslevel=6))
+        br = len(brotli.compress(body, quality=5)) if brotli else None
+        print(f"{name:<10} {seconds * 1000:>10.2f} {len(body) / 1024:>10.1f} {gz / 1024:>10.1f} "
+              f"{(br / 1024 if br else float('nan')):>10.1f}")
+
+    if orjson is None:
+        print("Not: orjson yüklü değil, 'fast' satırı stdlib json ile ölçüldü")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Şikayetvar/Trustpilot yerine geçen yerel HTTP sunucusu (uçtan uca yük testleri için).
+
+Scraper'ların oluşturduğu URL şekillerini sunar:
+    /{company}?page=N             -> Şikayetvar şikayet listesi
+    /review/{term}.com.tr         -> Trustpilot yorum sayfası (.com ve uzantısız da desteklenir)
+    /__stats                      -> sunucu istek istatistikleri (JSON)
+
+Scraper'ları yönlendirmek için:
+    SIKAYETVAR_BASE_URL=http://127.0.0.1:8765
+    TRUSTPILOT_BASE_URL=http://127.0.0.1:8765
+    TRUSTPILOT_TR_BASE_URL=http://127.0.0.1:8765
+
+Kullanım:
+    python benchmarks/mock_target_server.py --port 8765 --latency-ms 150 --rate-429 0.02 --error-rate 0.01
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+_REVIEW_RE = re.compile(r'^/review/(?P<term>[^/]+?)(?:\.com\.tr|\.com)?$')
+_COMPANY_RE = re.compile(r'^/(?P<company>[a-z0-9\-]+)$')
+
+
+class MockTargetHandler(BaseHTTPRequestHandler):
+    server_version = "MockTarget/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.record(status, len(data))
+
+    def do_GET(self):
+        options = self.server.options
+        parsed = urlparse(self.path)
+
+        if parsed.path == '/__stats':
+            self._send(200, json.dumps(self.server.snapshot()), 'application/json')
+            return
+
+        # Gecikme simülasyonu
+        latency = max(0.0, random.gauss(options.latency_ms, options.jitter_ms)) / 1000
+        if latency:
+            time.sleep(latency)
+
+        roll = random.random()
+        if roll < options.rate_429:
+            self._send(429, 'Too Many Requests', 'text/plain', {'Retry-After': '1'})
+            return
+        if roll < options.rate_429 + options.error_rate:
+            self._send(500, 'Internal Server Error', 'text/plain')
+            return
+
+        match = _REVIEW_RE.match(parsed.path)
+        if match:
+            term = match.group('term')
+            if self._is_unlisted(term):
+                self._send(404, 'Not Found', 'text/plain')
+                return
+            self._send(200, fixtures.trustpilot_page(options.records, term=term))
+            return
+
+        match = _COMPANY_RE.match(parsed.path)
+        if match:
+            company = match.group('company')
+            if self._is_unlisted(company):
+                self._send(404, 'Not Found', 'text/plain')
+                return
+            try:
+                page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+            except ValueError:
+                page = 1
+            # Son sayfadan sonrası boş liste döner (scraper sayfalamayı burada bitirir)
+            count = options.records if page <= options.pages else 0
+            self._send(200, fixtures.sikayetvar_page(count, company=company, page=page))
+            return
+
+        self._send(404, 'Not Found', 'text/plain')
+
+    def _is_unlisted(self, name):
+        """'yok' ile başlayan şirketler kaynakta listelenmemiş gibi davranır"""
+        return name.lower().startswith(self.server.options.unlisted_prefix)
+
+
+class MockTargetServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, MockTargetHandler)
+        self.options = options
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'bytes': 0, 'status': {}}
+
+    def record(self, status, size):
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['bytes'] += size
+            self._stats['status'][str(status)] = self._stats['status'].get(str(status), 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Scraper yük testleri için mock hedef sunucu")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--records', type=int, default=20, help="Sayfa başına kayıt sayısı")
+    parser.add_argument('--pages', type=int, default=5, help="Şikayetvar'da dolu sayfa sayısı")
+    parser.add_argument('--latency-ms', type=float, default=100.0)
+    parser.add_argument('--jitter-ms', type=float, default=30.0)
+    parser.add_argument('--rate-429', type=float, default=0.0, help="429 döndürme olasılığı")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 döndürme olasılığı")
+    parser.add_argument('--unlisted-prefix', default='yok', help="Bu önekle başlayan şirketler için 404")
+    parser.add_argument('--verbose', action='store_true')
+    return parser
+
+
+def start_server(options):
+    """Sunucuyu arka plan thread'inde başlat (throughput benchmark'ı için)"""
+    server = MockTargetServer((options.host, options.port), options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    options = build_arg_parser().parse_args()
+    server = MockTargetServer((options.host, options.port), options)
+    print(f"Mock hedef sunucu: http://{options.host}:{options.port} "
+          f"(gecikme {options.latency_ms}±{options.jitter_ms} ms, 429 %{options.rate_429 * 100:.1f}, "
+          f"500 %{options.error_rate * 100:.1f})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
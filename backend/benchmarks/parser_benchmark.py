@@ -0,0 +1,154 @@
+"""
+Scraper parser benchmark'ı (çevrimdışı).
+
+Her scraper'ın parse mantığını kaydedilmiş/sentetik fixture'lar üzerinde
+çalıştırır; kayıt/saniye ve tepe bellek kullanımını raporlar. Sonuçlar
+baseline dosyasıyla karşılaştırılır ve gerileme varsa çıkış kodu 1 olur. Baseline
+dosyası yoksa veya ölçülen bir fixture baseline'da yoksa çıkış kodu 2 olur (önce
+--update-baseline ile kaydedilmeli); eksik baseline hiçbir zaman başarı sayılmaz.
+
+Kullanım (backend dizininden):
+    python benchmarks/parser_benchmark.py                    # ölç ve baseline ile karşılaştır
+    python benchmarks/parser_benchmark.py --update-baseline  # baseline'ı güncelle
+    python benchmarks/parser_benchmark.py --sizes small medium --repeat 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_baseline.json')
+
+
+def build_cases(sizes):
+    """(kaynak, fixture adı, parse fonksiyonu, girdi) listesi oluştur"""
+    from scrapers.sikayetvar_scraper import SikayetvarScraper
+    from scrapers.trustpilot_scraper import TrustpilotScraper
+    from scrapers.google_reviews_scraper import GoogleReviewsScraper
+
+    sikayetvar = SikayetvarScraper()
+    trustpilot = TrustpilotScraper()
+    google = GoogleReviewsScraper()
+
+    parsers = {
+        'sikayetvar': lambda doc: sikayetvar.parse_page(doc, "https://www.sikayetvar.com/ornek") or [],
+        'trustpilot': lambda doc: trustpilot.parse_reviews(doc, "https://www.trustpilot.com/review/ornek.com.tr", "ornek"),
+        'google_reviews': lambda doc: google.parse_reviews_from_script(doc, "https://www.google.com/maps/place/ornek", max_reviews=10 ** 9),
+    }
+    generators = {
+        'sikayetvar': fixtures.sikayetvar_page,
+        'trustpilot': fixtures.trustpilot_page,
+        'google_reviews': fixtures.google_script,
+    }
+
+    cases = []
+    for source, parse in parsers.items():
+        for size in sizes:
+            cases.append((source, size, parse, generators[source](fixtures.SIZES[size])))
+        for name, content in fixtures.recorded_fixtures(source):
+            cases.append((source, f"recorded:{name}", parse, content))
+    return cases
+
+
+def measure(parse, document, repeat):
+    """En iyi süreyi, kayıt sayısını ve tepe belleği ölç"""
+    # Bellek ölçümü ayrı bir çalıştırmada yapılır (tracemalloc süreyi bozar)
+    tracemalloc.start()
+    records = len(parse(document))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(document)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'records': records,
+        'input_kb': round(len(document.encode('utf-8')) / 1024, 1),
+        'seconds': best,
+        'records_per_sec': records / best if best > 0 else 0.0,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Baseline'a göre gerilemeleri listele"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue  # main() baseline'da olmayan fixture'ları ayrıca raporlar
+        if previous['records_per_sec'] and current['records_per_sec'] < previous['records_per_sec'] * (1 - tolerance):
+            regressions.append(f"{key}: kayıt/sn {previous['records_per_sec']:.0f} -> {current['records_per_sec']:.0f}")
+        if previous['peak_kb'] and current['peak_kb'] > previous['peak_kb'] * (1 + tolerance):
+            regressions.append(f"{key}: tepe bellek {previous['peak_kb']:.0f} KB -> {current['peak_kb']:.0f} KB")
+        if current['records'] != previous['records']:
+            regressions.append(f"{key}: kayıt sayısı {previous['records']} -> {current['records']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper parser benchmark'ı")
+    parser.add_argument('--sizes', nargs='+', default=list(fixtures.SIZES), choices=list(fixtures.SIZES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="İzin verilen gerileme oranı (0.25 = %%25)")
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'kaynak':<16} {'fixture':<28} {'kayıt':>7} {'girdi KB':>9} {'ms':>9} {'kayıt/sn':>10} {'tepe KB':>9}")
+    cases = build_cases(args.sizes)
+    for source, name, parse, document in cases:
+        result = measure(parse, document, args.repeat)
+        results[f"{source}/{name}"] = result
+        print(f"{source:<16} {name:<28} {result['records']:>7} {result['input_kb']:>9.1f} "
+              f"{result['seconds'] * 1000:>9.2f} {result['records_per_sec']:>10.0f} {result['peak_kb']:>9.1f}")
+
+    if not any(name.startswith('recorded:') for _, name, _, _ in cases):
+        print(f"\n⚠ Kaydedilmiş fixture yok ({fixtures.FIXTURES_DIR}); sadece sentetik sayfalar ölçüldü")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline kaydedildi: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n✗ Baseline bulunamadı: {args.baseline} (önce --update-baseline ile kaydedin)")
+        return 2
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    missing = sorted(key for key in results if key not in baseline)
+    if missing:
+        print("\n✗ Baseline'da olmayan fixture'lar (--update-baseline ile kaydedin):")
+        for key in missing:
+            print(f"  - {key}")
+        return 2
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n✗ Performans gerilemesi:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("\n✓ Baseline'a göre gerileme yok")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Siteler arası sıralama (/api/rankings) ölçümü.
+
+SQLite backend'inde sentetik siteler ve site sayaçları (SiteComplaintCounters)
+oluşturur (varsayılan 100.000 site) ve şunları ölçer:
+- sayaçların tek sorguyla okunması (Database.get_ranking_rows)
+- NumPy ile yüzdelik/z-skoru hesabı (rankings.SiteRankings)
+- aynı hesabın saf Python karşılığı (karşılaştırma için)
+- cache'li istek: sürüm sorgusu + sayfa veya tek site (p50/p95/p99)
+
+Kullanım (backend dizininden):
+    python benchmarks/rankings_benchmark.py                      # 100k site
+    python benchmarks/rankings_benchmark.py --sites 20000 --requests 500
+    python benchmarks/rankings_benchmark.py --db /tmp/rankings.db    # mevcut dosyayı kullan
+"""
+import argparse
+import bisect
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rankings  # noqa: E402
+from config import RANKING_MIN_COMPLAINTS  # noqa: E402
+from sqlite_database import SqliteDatabase  # noqa: E402
+
+
+def populate(db, sites, seed=17):
+    """Sentetik siteler ve sayaçlar ekle (şikayet satırı eklenmez; sıralama sadece sayaçları okur)"""
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    scanned = datetime(2024, 1, 1)
+    cursor = db.conn.cursor()
+    cursor.executemany(
+        "INSERT INTO Sites (Domain, SiteName, RiskScore, LastScannedDate) VALUES (?, ?, ?, ?)",
+        [(f"site{i}.com", f"Site {i}", rng.randint(0, 100), scanned + timedelta(minutes=i)) for i in range(sites)]
+    )
+    counters = []
+    cursor.execute("SELECT SiteID FROM Sites")
+    for (site_id,) in cursor.fetchall():
+        total = int(rng.paretovariate(1.2)) - 1  # Çoğu sitede az, birkaçında çok şikayet
+        negative = rng.randint(0, total) if total else 0
+        resolved = rng.randint(0, total) if total else 0
+        rating_count = rng.randint(0, total) if total else 0
+        rating_sum = sum(rng.randint(1, 5) for _ in range(min(rating_count, 50))) * max(1, rating_count // 50)
+        counters.append((site_id, total, negative, total - negative, resolved, min(resolved, negative),
+                         rating_sum, rating_count))
+    cursor.executemany("""
+        INSERT INTO SiteComplaintCounters
+            (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, counters)
+    db.conn.commit()
+    cursor.close()
+    return time.perf_counter() - started
+
+
+def python_rankings(rows, min_complaints=RANKING_MIN_COMPLAINTS):
+    """SiteRankings'in saf Python karşılığı (yüzdelik + z-skoru, dört metrik)"""
+    min_complaints = max(1, min_complaints)
+    metrics = {'risk_score': [], 'negative_ratio': [], 'resolution_rate': [], 'average_rating': []}
+    for _, _, risk_score, total, negative, resolved, rating_sum, rating_count in rows:
+        enough = total >= min_complaints
+        metrics['risk_score'].append(float(risk_score))
+        metrics['negative_ratio'].append(negative / total if enough else None)
+        metrics['resolution_rate'].append(resolved / total if enough else None)
+        metrics['average_rating'].append(rating_sum / rating_count if rating_count >= min_complaints else None)
+    result = {}
+    for metric, values in metrics.items():
+        valid = sorted(v for v in values if v is not None)
+        mean = statistics.fmean(valid) if valid else None
+        std = statistics.pstdev(valid) if valid else None
+        result[metric] = [
+            None if v is None else (bisect.bisect_right(valid, v) * 100.0 / len(valid),
+                                    (v - mean) / std if std else 0.0)
+            for v in values
+        ]
+    return result
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Siteler arası sıralama ölçümü (NumPy)")
+    parser.add_argument('--sites', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=1000, help="Cache'li istek sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Hesaplama ölçümlerinin tekrar sayısı (en iyisi)")
+    parser.add_argument('--db', help="Veritabanı dosyası (yoksa oluşturulur ve doldurulur)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix='rankings-bench-'), 'rankings.db')
+    fresh = not os.path.exists(path)
+    db = SqliteDatabase(use_pool=False, path=path)
+    if not db.connect():
+        sys.exit("Veritabanına bağlanılamadı")
+    db.create_tables()
+    if fresh:
+        seconds = populate(db, args.sites)
+        print(f"{args.sites} site {seconds:.1f} sn'de eklendi: {path}")
+
+    rows, load_seconds = timed(db.get_ranking_rows, args.repeat)
+    print(f"{len(rows)} site")
+    import numpy  # noqa: F401  (import süresi hesaplama ölçümüne karışmasın)
+    ranking, numpy_seconds = timed(lambda: rankings.SiteRankings(rows, db.get_site_list_version()), args.repeat)
+    _, python_seconds = timed(lambda: python_rankings(rows), args.repeat)
+    print(f"  Sayaç okuma (get_ranking_rows): {load_seconds * 1000:8.1f} ms")
+    print(f"  NumPy hesaplama:                {numpy_seconds * 1000:8.1f} ms")
+    print(f"  Saf Python hesaplama:           {python_seconds * 1000:8.1f} ms ({python_seconds / numpy_seconds:.1f}x)")
+
+    # Cache'li istekler: sürüm sorgusu + rastgele sayfa veya tek site
+    rankings._cached = ranking
+    rng = random.Random(9)
+    latencies = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        current = rankings.get_rankings(db)
+        if rng.random() < 0.5:
+            current.find(f"site{rng.randrange(len(rows))}.com")
+        else:
+            metric = rng.choice(tuple(rankings.METRICS))
+            current.page(metric, rankings.METRICS[metric], 50, 50 * rng.choice((0, 0, 1, 2, 10)))
+        latencies.append(time.perf_counter() - start)
+    if current is not ranking:
+        print("  ⚠ Cache kullanılmadı (sürüm değişti)")
+    print(f"{args.requests} cache'li istek (sürüm sorgusu dahil)")
+    for pct in (50, 95, 99):
+        print(f"  p{pct}: {percentile(latencies, pct) * 1000:8.2f} ms")
+    print(f"  max: {max(latencies) * 1000:8.2f} ms")
+    db.close(force=True)
+
+
+if __name__ == '__main__':
+    main()
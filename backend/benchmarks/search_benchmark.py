@@ -0,0 +1,137 @@
+"""
+Tam metin arama (/api/search) gecikme ölçümü.
+
+SQLite backend'inde (FTS5) sentetik bir şikayet veritabanı oluşturur (varsayılan
+1.000.000 kayıt, 1000 site) ve Database.search_complaints'i karışık sorgularla
+(tek/çok terim, kaynak ve tarih filtreleri, ilk sayfalar) çalıştırıp p50/p95/p99
+gecikmeyi raporlar. Oluşturulan veritabanı dosyası --db ile tekrar kullanılabilir.
+
+Kullanım (backend dizininden):
+    python benchmarks/search_benchmark.py                        # 1M kayıt, 500 sorgu
+    python benchmarks/search_benchmark.py --rows 100000 --queries 200
+    python benchmarks/search_benchmark.py --db /tmp/search.db    # mevcut dosyayı kullan
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SEARCH_MAX_COUNT  # noqa: E402
+from models import Complaint  # noqa: E402
+from sqlite_database import SqliteDatabase  # noqa: E402
+
+SOURCES = ('sikayetvar', 'trustpilot', 'google_reviews')
+SENTIMENTS = ('negative', 'positive', 'neutral')
+WORDS = (
+    "sipariş kargo gecikmesi iade ürün para müşteri hizmetleri teslimat geç hasarlı eksik yanlış fatura "
+    "ödeme kart iptal değişim garanti destek telefon cevap bekliyorum mağdur rezalet berbat sorun çözüm "
+    "talep paket kırık defolu beden renk stok satıcı mağaza uygulama hesap kampanya indirim kupon"
+).split()
+# Nadir kelimeler: gerçek metinlerdeki kelime çeşitliliği için (ortak önekleri olmayan rastgele harf dizileri)
+_filler_rng = random.Random(3)
+FILLER = [''.join(_filler_rng.choice('abcçdefgğhıijklmnoöprsştuüvyz') for _ in range(_filler_rng.randint(5, 9)))
+          for _ in range(5000)]
+
+
+def make_text(rng, words):
+    return ' '.join(rng.choice(WORDS) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(words))
+
+
+def populate(db, rows, sites, seed=11):
+    """Sentetik siteler ve şikayetler ekle (FTS trigger'ları index'i doldurur)"""
+    rng = random.Random(seed)
+    start_date = datetime(2023, 1, 1)
+    per_site = max(1, rows // sites)
+    inserted = 0
+    started = time.perf_counter()
+    for site in range(sites):
+        site_id = db.get_or_create_site(f"site{site}.com")
+        batch = [
+            Complaint(
+                title=make_text(rng, 5),
+                content=make_text(rng, rng.randint(20, 60)),
+                author=f"Kullanıcı {rng.randrange(100000)}",
+                date=start_date + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+                rating=rng.choice((None, 1, 2, 3, 4, 5)),
+                sentiment=rng.choice(SENTIMENTS),
+                url=f"https://example.com/{site}/{i}",
+                is_resolved=rng.random() < 0.2,
+                source=rng.choice(SOURCES),
+            )
+            for i in range(min(per_site, rows - inserted))
+        ]
+        inserted += db.save_complaints(site_id, batch)
+        if inserted >= rows:
+            break
+    return inserted, time.perf_counter() - started
+
+
+def random_query(rng):
+    """(sorgu, filtreler) üret"""
+    terms = rng.sample(WORDS, rng.choice((1, 1, 2, 2, 3)))
+    if rng.random() < 0.3:
+        terms.append(rng.choice(FILLER))  # Seçici terim
+    filters = {'limit': 20, 'offset': 20 * rng.choice((0, 0, 0, 1, 2, 4))}
+    if rng.random() < 0.3:
+        filters['sources'] = [rng.choice(SOURCES)]
+    if rng.random() < 0.3:
+        start = datetime(2023, 1, 1) + timedelta(days=rng.randrange(600))
+        filters['date_from'] = start
+        filters['date_to'] = start + timedelta(days=rng.choice((7, 30, 90)))
+    return ' '.join(terms), filters
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tam metin arama gecikme ölçümü (SQLite FTS5)")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--sites', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--db', help="Veritabanı dosyası (yoksa oluşturulur ve doldurulur)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix='search-bench-'), 'search.db')
+    fresh = not os.path.exists(path)
+    db = SqliteDatabase(use_pool=False, path=path)
+    if not db.connect():
+        sys.exit("Veritabanına bağlanılamadı")
+    db.create_tables()
+    db.migrate_add_fulltext_search()
+
+    if fresh:
+        inserted, seconds = populate(db, args.rows, args.sites)
+        print(f"{inserted} kayıt {seconds:.1f} sn'de eklendi ({inserted / seconds:.0f} kayıt/sn, FTS dahil): {path}")
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Complaints")
+    print(f"Veritabanında {cursor.fetchone()[0]} şikayet var")
+    cursor.close()
+
+    rng = random.Random(5)
+    latencies, totals = [], []
+    for _ in range(args.queries):
+        query, filters = random_query(rng)
+        start = time.perf_counter()
+        _, total, _ = db.search_complaints(query, **filters)
+        latencies.append(time.perf_counter() - start)
+        totals.append(total)
+
+    print(f"{args.queries} sorgu (ortalama eşleşme: {statistics.mean(totals):.0f}, sayım üst sınırı: {SEARCH_MAX_COUNT})")
+    for pct in (50, 95, 99):
+        print(f"  p{pct}: {percentile(latencies, pct) * 1000:8.1f} ms")
+    print(f"  max: {max(latencies) * 1000:8.1f} ms")
+    db.close(force=True)
+
+
+if __name__ == '__main__':
+    main()
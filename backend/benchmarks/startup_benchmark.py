@@ -0,0 +1,126 @@
+"""
+API başlangıç (cold start) ve import süresi ölçümü.
+
+Her ölçüm temiz bir Python sürecinde yapılır: süreç başlangıcından
+`import app` tamamlanana kadar geçen süre, import süresi ve scraper'ların
+ilk kullanımda oluşturulma süresi raporlanır. `-X importtime` çıktısından
+en pahalı import'lar da listelenir.
+
+Kullanım (backend dizininden):
+    python benchmarks/startup_benchmark.py                  # app import'u, 5 tekrar
+    python benchmarks/startup_benchmark.py --module scraper_service --repeat 10
+    python benchmarks/startup_benchmark.py --top 20         # en pahalı 20 import
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Alt süreçte çalışan ölçüm kodu: import süresi ve scraper'ların ilk oluşturulma süreleri
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+module = __import__(sys.argv[1])
+import_seconds = time.perf_counter() - start
+heavy = [name for name in ('bs4', 'requests', 'selenium', 'pyodbc', 'numpy', 'pyarrow') if name in sys.modules]
+first_use = {}
+if sys.argv[2] == '1':
+    from scraper_service import ScraperService
+    service = ScraperService()
+    for source in service.source_names:
+        t = time.perf_counter()
+        try:
+            service.get_scraper(source)
+            first_use[source] = time.perf_counter() - t
+        except ImportError as e:
+            first_use[source] = str(e)
+print(json.dumps({'import_seconds': import_seconds, 'heavy_modules': heavy, 'first_use': first_use}))
+"""
+
+
+def run_child(args, measure_first_use, importtime=False):
+    """Temiz süreçte ölçüm yap; (duvar saati süresi, sonuç sözlüğü, stderr) döndür"""
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', CHILD_SCRIPT, args.module, '1' if measure_first_use else '0']
+    start = time.perf_counter()
+    proc = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Alt süreç hatası:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return wall, result, proc.stderr
+
+
+def interpreter_baseline(repeat):
+    """Boş Python sürecinin başlangıç süresi (cold start'tan çıkarılır)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def slowest_imports(importtime_output, top):
+    """-X importtime çıktısından kümülatif süreye göre en pahalı üst düzey paketleri döndür"""
+    totals = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line.split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        package = name.split('.')[0]
+        if name == package:  # Sadece paketin kendi (kümülatif) satırı
+            totals[package] = max(totals.get(package, 0), int(parts[1]))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold start ve import süresi ölçümü")
+    parser.add_argument('--module', default='app', help="İmport edilecek modül (varsayılan: app)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="Listelenecek en pahalı import sayısı")
+    args = parser.parse_args()
+
+    baseline = interpreter_baseline(args.repeat)
+    walls, imports = [], []
+    for _ in range(args.repeat):
+        wall, result, _ = run_child(args, measure_first_use=False)
+        walls.append(wall)
+        imports.append(result['import_seconds'])
+
+    _, first_use_result, _ = run_child(args, measure_first_use=True)
+    _, cold_result, importtime_output = run_child(args, measure_first_use=False, importtime=True)
+
+    print(f"Modül: {args.module} ({args.repeat} tekrar, medyan)")
+    print(f"  Boş yorumlayıcı başlangıcı : {baseline * 1000:8.1f} ms")
+    print(f"  Cold start (süreç toplamı) : {statistics.median(walls) * 1000:8.1f} ms")
+    print(f"  Cold start (yorumlayıcı hariç): {(statistics.median(walls) - baseline) * 1000:5.1f} ms")
+    print(f"  import {args.module:<20}: {statistics.median(imports) * 1000:8.1f} ms")
+    heavy = cold_result['heavy_modules']
+    print(f"  Başlangıçta yüklenen ağır modüller: {', '.join(heavy) if heavy else 'yok'}")
+
+    if first_use_result['first_use']:
+        print("\nScraper ilk kullanım (import + oluşturma):")
+        for source, seconds in first_use_result['first_use'].items():
+            if isinstance(seconds, str):
+                print(f"  {source:<16}import hatası: {seconds}")
+            else:
+                print(f"  {source:<16}{seconds * 1000:8.1f} ms")
+
+    print(f"\nEn pahalı {args.top} import (kümülatif):")
+    for package, micros in slowest_imports(importtime_output, args.top):
+        print(f"  {package:<24}{micros / 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Uçtan uca scraping throughput ölçümü (mock hedef sunucu ile).
+
+Scraper'ları yerel mock sunucuya yönlendirir, N domain'i C eşzamanlılıkla
+işler ve domain/dakika, kayıt sayısı ve gecikme yüzdeliklerini raporlar.
+
+Kullanım (backend dizininden):
+    python benchmarks/throughput_benchmark.py --domains 50 --concurrency 4
+    python benchmarks/throughput_benchmark.py --domains 20 --full   # process_site + veritabanı
+    python benchmarks/throughput_benchmark.py --no-server --port 8765  # ayrı çalışan mock sunucu
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def configure_environment(args):
+    """Backend modülleri import edilmeden önce scraper hedeflerini mock sunucuya yönlendir"""
+    base_url = f"http://{args.host}:{args.port}"
+    os.environ['SIKAYETVAR_BASE_URL'] = base_url
+    os.environ['TRUSTPILOT_BASE_URL'] = base_url
+    os.environ['TRUSTPILOT_TR_BASE_URL'] = base_url
+    os.environ.setdefault('ENABLED_SOURCES', 'sikayetvar,trustpilot')
+    os.environ['SCRAPER_DELAY_SCALE'] = str(args.delay_scale)
+    # Her çalıştırma boş bir cache dizini kullanır (dosya cache'i ölçümü bozmasın)
+    os.environ['SCRAPER_CACHE_DIR'] = tempfile.mkdtemp(prefix='scraper-bench-')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uçtan uca scraping throughput ölçümü")
+    parser.add_argument('--domains', type=int, default=30)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--full', action='store_true', help="process_site ile veritabanına kaydet")
+    parser.add_argument('--unlisted-ratio', type=float, default=0.2,
+                        help="Kaynaklarda listelenmeyen domain oranı")
+    parser.add_argument('--delay-scale', type=float, default=0.0,
+                        help="Scraper sayfa beklemesi çarpanı (1 = production)")
+    parser.add_argument('--no-server', action='store_true', help="Mock sunucuyu başlatma (zaten çalışıyor)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=100.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    configure_environment(args)
+
+    server = None
+    if not args.no_server:
+        import mock_target_server
+        server_args = mock_target_server.build_arg_parser().parse_args([
+            '--host', args.host, '--port', str(args.port),
+            '--latency-ms', str(args.latency_ms),
+            '--rate-429', str(args.rate_429), '--error-rate', str(args.error_rate),
+        ])
+        server = mock_target_server.start_server(server_args)
+
+    from scraper_service import ScraperService
+    service = ScraperService()
+
+    run_id = uuid.uuid4().hex[:6]
+    unlisted_every = int(1 / args.unlisted_ratio) if args.unlisted_ratio > 0 else 0
+    domains = []
+    for i in range(args.domains):
+        prefix = 'yok' if unlisted_every and i % unlisted_every == 0 else 'magaza'
+        domains.append(f"{prefix}{i}-{run_id}.com")
+
+    def work(domain):
+        start = time.perf_counter()
+        if args.full:
+            result = service.process_site(f"https://{domain}")
+            records = result.get('total_complaints', 0)
+        else:
+            complaints, _ = service.scrape_all_sources(domain, service.extract_site_name(domain))
+            records = len(complaints)
+        return time.perf_counter() - start, records
+
+    latencies = []
+    total_records = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(work, domain) for domain in domains]
+        for future in as_completed(futures):
+            seconds, records = future.result()
+            latencies.append(seconds)
+            total_records += records
+    elapsed = time.perf_counter() - started
+
+    print(f"Mod: {'process_site (DB dahil)' if args.full else 'scrape_all_sources'}; "
+          f"kaynaklar: {', '.join(service.source_names)}")
+    print(f"Domain: {args.domains}, eşzamanlılık: {args.concurrency}, süre: {elapsed:.2f} sn")
+    print(f"Throughput: {args.domains / elapsed * 60:.1f} domain/dakika, {total_records} kayıt "
+          f"({total_records / elapsed:.0f} kayıt/sn)")
+    print(f"Domain gecikmesi: p50 {statistics.median(latencies):.2f} sn, "
+          f"p95 {percentile(latencies, 95):.2f} sn, max {max(latencies):.2f} sn")
+    if server:
+        print(f"Mock sunucu: {server.snapshot()}")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Kaynak bazında devre kesici (circuit breaker).
+
+Google headless tarayıcıyı engellediğinde veya Trustpilot sayfa yapısını değiştirdiğinde
+kaynak her analizde tüm bekleme ve zaman aşımı süresini harcayıp yine hata verir.
+Art arda CIRCUIT_BREAKER_THRESHOLD başarısız çalışmadan sonra devre açılır ve kaynak
+CIRCUIT_BREAKER_COOLDOWN saniye boyunca hiç çalıştırılmaz. Süre dolunca tek bir
+deneme çalışmasına (half-open) izin verilir: başarılıysa devre kapanır, değilse
+bekleme süresi yeniden başlar.
+
+Başarısızlık: istisna, failure_reason ile biten çalışma veya daha önce kayıt bulunmuş
+(doğrulanmış tanımlayıcısı olan) kaynağın boş dönmesi. Tanımlayıcısız boş sonuç ve
+cache'den gelen sonuç kaynağın sağlığı hakkında bilgi vermez; sayacı değiştirmez.
+
+Durum süreç içindedir (her API/worker süreci kendi devrelerini tutar) ve
+scraper_circuit_state metriğiyle yayınlanır (0 = kapalı, 1 = yarı açık, 2 = açık).
+"""
+import logging
+import threading
+import time
+from config import CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+from metrics import SCRAPE_CIRCUIT_STATE, SCRAPE_CIRCUIT_SKIPS, SCRAPE_CIRCUIT_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_HALF_OPEN = 'half_open'
+STATE_OPEN = 'open'
+STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+
+class CircuitBreaker:
+    """Tek kaynağın devresi; thread'ler arasında paylaşılır"""
+
+    def __init__(self, source, threshold=CIRCUIT_BREAKER_THRESHOLD, cooldown=CIRCUIT_BREAKER_COOLDOWN):
+        self.source = source
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0  # Art arda başarısız çalışma sayısı
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.last_failure = None
+        SCRAPE_CIRCUIT_STATE.set(STATE_VALUES[STATE_CLOSED], source=source)
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def _transition(self, state):
+        # self._lock altında çağrılır
+        if state == self._state:
+            return
+        logger.info(f"{self.source}: devre {self._state} -> {state}")
+        self._state = state
+        SCRAPE_CIRCUIT_STATE.set(STATE_VALUES[state], source=self.source)
+        SCRAPE_CIRCUIT_TRANSITIONS.inc(source=self.source, state=state)
+
+    def allow(self):
+        """Kaynak şimdi çalıştırılabilir mi; bekleme süresi dolmuşsa tek deneme çalışmasına izin verir"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._transition(STATE_HALF_OPEN)
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        SCRAPE_CIRCUIT_SKIPS.inc(source=self.source)
+        return False
+
+    def retry_after(self):
+        """Devre açıksa deneme çalışmasına kalan saniye (değilse 0)"""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0
+            return max(0, int(self.cooldown - (time.monotonic() - self._opened_at)))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._transition(STATE_CLOSED)
+
+    def record_failure(self, reason=None):
+        with self._lock:
+            self._failures += 1
+            self.last_failure = reason
+            probe = self._state == STATE_HALF_OPEN
+            self._probe_in_flight = False
+            # Devre açılmadan önce başlamış çalışmaların hataları bekleme süresini uzatmaz
+            if self.enabled and self._state != STATE_OPEN and (probe or self._failures >= self.threshold):
+                logger.warning(f"⚠ {self.source}: {self._failures} art arda başarısız çalışma, "
+                               f"{self.cooldown} sn atlanacak (son hata: {reason})")
+                self._opened_at = time.monotonic()
+                self._transition(STATE_OPEN)
+
+    def record_neutral(self):
+        """Kaynağın sağlığını göstermeyen sonuç (cache, tanımlayıcısız boş sonuç); deneme hakkı geri verilir"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            return {'state': self._state, 'consecutive_failures': self._failures, 'last_failure': self.last_failure}
+
+
+class CircuitBreakerRegistry:
+    """Kaynak adı -> CircuitBreaker"""
+
+    def __init__(self, threshold=CIRCUIT_BREAKER_THRESHOLD, cooldown=CIRCUIT_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, source):
+        breaker = self._breakers.get(source)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(source)
+                if breaker is None:
+                    breaker = self._breakers[source] = CircuitBreaker(source, self.threshold, self.cooldown)
+        return breaker
+
+    def snapshot(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {source: breaker.snapshot() for source, breaker in breakers.items()}
+
+
+# Süreç genelinde tek kayıt: aynı süreçteki tüm ScraperService örnekleri devreleri paylaşır
+breakers = CircuitBreakerRegistry()
+
+
+def classify(stats, records_found, identity=None):
+    """
+    Kaynak çalışmasının devre için sonucu: 'failure', 'success' veya 'neutral'
+    identity: çalışmaya verilen doğrulanmış tanımlayıcı (önceki taramada kayıt bulunmuştu)
+    """
+    if stats.get('failure_reason'):
+        return 'failure'
+    # Daha önce kayıt bulunan sayfanın boş dönmesi genellikle sayfa yapısı değişikliği veya engellemedir.
+    # Bu çalışmalar negatif cache'e yazılmaz ve ona bakmaz (BaseScraper.run); art arda sayılabilirler
+    if identity and not records_found:
+        return 'failure'
+    if stats.get('cache_hit') or stats.get('negative_cache_hit'):
+        return 'neutral'
+    return 'success' if records_found else 'neutral'
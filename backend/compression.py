@@ -0,0 +1,66 @@
+import gzip
+import logging
+from config import COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {'application/json'}
+
+
+def choose_encoding(accept_encodings):
+    """İstemcinin Accept-Encoding başlığına göre en iyi kodlamayı seç (br > gzip)"""
+    if brotli is not None and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_body(body, encoding):
+    """Yanıt gövdesini verilen kodlama ile sıkıştır"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL)
+
+
+def init_compression(app):
+    """JSON yanıtları için gzip/brotli sıkıştırma hook'unu kaydet"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code >= 300
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+
+        try:
+            compressed = compress_body(body, encoding)
+        except Exception as e:
+            logger.warning(f"Yanıt sıkıştırma hatası ({encoding}): {str(e)}")
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = str(len(compressed))
+        return response
+
+    if brotli is None:
+        logger.info("brotli yüklü değil, sadece gzip sıkıştırma kullanılacak")
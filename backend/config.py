@@ -3,6 +3,11 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Storage Backend Configuration
+# 'sqlserver' (varsayılan) veya 'sqlite' (yerel geliştirme, yük testi, küçük kurulumlar)
+DB_BACKEND = os.getenv('DB_BACKEND', 'sqlserver').lower()
+SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'site_guvenlik.db'))
+
 # SQL Server Configuration
 SQL_SERVER = os.getenv('SQL_SERVER', 'localhost\SQLEXPRESS')
 SQL_DATABASE = os.getenv('SQL_DATABASE', '')
@@ -11,6 +16,11 @@ SQL_PASSWORD = os.getenv('SQL_PASSWORD', '')
 # SQL Server 2022 için ODBC Driver 18 önerilir
 # Yüklü driver'ları kontrol etmek için: python check_odbc_drivers.py
 SQL_DRIVER = os.getenv('SQL_DRIVER', 'ODBC Driver 18 for SQL Server')
+# Okuma endpoint'leri (site bilgisi, site listesi, trend, arama) yazma bağlantısından ayrı bir pool kullanır.
+# Boşsa okumalar aynı sunucuya ayrı bağlantıyla gider; doluysa bu ODBC bağlantı dizesindeki replikaya
+SQL_READ_CONNECTION_STRING = os.getenv('SQL_READ_CONNECTION_STRING', '')
+# Okuma bağlantılarında SNAPSHOT isolation (ALLOW_SNAPSHOT_ISOLATION gerekir; /api/init-db açar)
+DB_READ_SNAPSHOT = os.getenv('DB_READ_SNAPSHOT', 'True').lower() == 'true'
 
 # API Configuration
 # 0.0.0.0 = tüm network interface'lerini dinle (tüm IP'lerden erişim)
@@ -18,8 +28,103 @@ SQL_DRIVER = os.getenv('SQL_DRIVER', 'ODBC Driver 18 for SQL Server')
 API_HOST = os.getenv('API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('API_PORT', 5000))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+# Waitress thread sayısı; her açık ilerleme stream'i (SSE) bir thread tutar
+API_THREADS = int(os.getenv('API_THREADS', 256))
+# Bu süreçte aynı anda çalışan en fazla analiz (senkron ve async); thread sayısından bağımsızdır, fazlası sırada bekler
+ANALYSIS_MAX_CONCURRENT = int(os.getenv('ANALYSIS_MAX_CONCURRENT', 4))
 
 # Scraping Configuration
 SCRAPING_DELAY = int(os.getenv('SCRAPING_DELAY', 2))  # seconds between requests
 MAX_RESULTS = int(os.getenv('MAX_RESULTS', 50))
 
+
+# Response Compression Configuration
+# Bu boyutun (byte) altındaki JSON yanıtları sıkıştırılmaz
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+
+# Profiling Configuration
+# True ise her analiz cProfile ile çalıştırılır (istek bazında {"profile": true} ile de açılabilir)
+PROFILE_ANALYSIS = os.getenv('PROFILE_ANALYSIS', 'False').lower() == 'true'
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Profiller'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', 50))  # Saklanacak en fazla profil dosyası
+
+# Scraper Target Configuration
+# Yük testleri için scraper'lar yerel mock sunucuya yönlendirilebilir (benchmarks/mock_target_server.py)
+SIKAYETVAR_BASE_URL = os.getenv('SIKAYETVAR_BASE_URL', 'https://www.sikayetvar.com').rstrip('/')
+TRUSTPILOT_BASE_URL = os.getenv('TRUSTPILOT_BASE_URL', 'https://www.trustpilot.com').rstrip('/')
+TRUSTPILOT_TR_BASE_URL = os.getenv('TRUSTPILOT_TR_BASE_URL', 'https://tr.trustpilot.com').rstrip('/')
+# Virgülle ayrılmış aktif kaynaklar (boş = hepsi), ör: sikayetvar,trustpilot
+ENABLED_SOURCES = [s.strip() for s in os.getenv('ENABLED_SOURCES', '').split(',') if s.strip()]
+# Sayfa istekleri arası bekleme çarpanı (0 = beklemesiz, sadece test ortamı için)
+SCRAPER_DELAY_SCALE = float(os.getenv('SCRAPER_DELAY_SCALE', 1.0))
+SCRAPER_CACHE_DIR = os.getenv('SCRAPER_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Veriler'))
+# Scraper txt cache'i bu kadar saniye geçerlidir; eskiyse kaynak yeniden (yanıt cache'i ile koşullu) taranır (0 = kapalı)
+SCRAPER_CACHE_TTL = int(os.getenv('SCRAPER_CACHE_TTL', 24 * 3600))
+# Kaynakta bulunamayan domain'ler bu kadar saniye tekrar denenmez (negatif cache, 0 = kapalı)
+NEGATIVE_CACHE_TTL = int(os.getenv('NEGATIVE_CACHE_TTL', 7 * 24 * 3600))
+# Doğrulanmış kaynak tanımlayıcıları (Trustpilot sayfası, Şikayetvar slug'ı, Maps place URL'i) bu kadar gün tekrar çözülmez
+SOURCE_IDENTITY_TTL_DAYS = int(os.getenv('SOURCE_IDENTITY_TTL_DAYS', 30))
+# requests tabanlı scraper'lar sayfaları ETag/Last-Modified ile koşullu ister; 304'te gövde ve parse sonuçları cache'den okunur
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', os.path.join(SCRAPER_CACHE_DIR, 'http'))
+# Yanıt cache'i temizliği: bu kadar gün güncellenmeyen URL kayıtları ve hiçbir kaydın göstermediği gövdeler silinir;
+# gövdelerin toplamı RESPONSE_CACHE_MAX_MB'ı aşarsa en eski kayıtlar atılır (temizlik en fazla saatte bir, store sırasında)
+RESPONSE_CACHE_TTL_DAYS = int(os.getenv('RESPONSE_CACHE_TTL_DAYS', 30))
+RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', 500))
+RESPONSE_CACHE_SWEEP_INTERVAL = int(os.getenv('RESPONSE_CACHE_SWEEP_INTERVAL', 3600))  # saniye
+
+# Circuit Breaker Configuration
+# Art arda bu kadar başarısız çalışmadan sonra kaynak CIRCUIT_BREAKER_COOLDOWN saniye atlanır (0 = kapalı)
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', 5))
+CIRCUIT_BREAKER_COOLDOWN = int(os.getenv('CIRCUIT_BREAKER_COOLDOWN', 600))  # Süre dolunca tek deneme çalışması yapılır
+
+# Near-Duplicate Detection Configuration
+# Farklı kaynaklara yazılmış aynı şikayetler MinHash + LSH ile bulunup kayıt/skor öncesi birleştirilir
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'True').lower() == 'true'
+DEDUP_JACCARD_THRESHOLD = float(os.getenv('DEDUP_JACCARD_THRESHOLD', 0.6))  # Tahmini kelime ikilisi benzerliği
+DEDUP_NUM_HASHES = int(os.getenv('DEDUP_NUM_HASHES', 64))  # MinHash imza uzunluğu
+DEDUP_BANDS = int(os.getenv('DEDUP_BANDS', 16))  # LSH bant sayısı (imza uzunluğunu tam bölmeli)
+DEDUP_MIN_TOKENS = int(os.getenv('DEDUP_MIN_TOKENS', 6))  # Daha kısa metinler karşılaştırılmaz
+DEDUP_CROSS_SOURCE_ONLY = os.getenv('DEDUP_CROSS_SOURCE_ONLY', 'True').lower() == 'true'
+
+# Scraping Worker Configuration
+# True ise /api/analyze işi ScrapeJobs kuyruğuna yazar ve 202 döner; analiz `python -m scraper_worker` süreçlerinde çalışır
+SCRAPE_QUEUE_ENABLED = os.getenv('SCRAPE_QUEUE_ENABLED', 'False').lower() == 'true'
+WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 2))  # Kuyruk boşken bekleme (saniye)
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv('WORKER_HEARTBEAT_INTERVAL', 15))  # Çalışan iş için heartbeat aralığı
+WORKER_STALE_AFTER = int(os.getenv('WORKER_STALE_AFTER', 90))  # Bu kadar saniye heartbeat gelmeyen iş tekrar kuyruğa alınır
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))  # Worker çökmesiyle yarım kalan işin en fazla deneme sayısı
+
+# Risk Score Configuration
+# Skor formülünün sürümü (risk.py RISK_MODELS); değiştirildiğinde POST /api/rescore tüm siteleri yeniden skorlar
+RISK_MODEL = os.getenv('RISK_MODEL', 'v1')
+
+# Search Configuration
+SEARCH_MAX_PAGE_SIZE = int(os.getenv('SEARCH_MAX_PAGE_SIZE', 100))  # /api/search sayfa başına en fazla sonuç
+SEARCH_MAX_COUNT = int(os.getenv('SEARCH_MAX_COUNT', 10000))  # Toplam eşleşme sayımının üst sınırı
+
+# Trend Configuration
+TREND_DEFAULT_DAYS = int(os.getenv('TREND_DEFAULT_DAYS', 90))  # /api/site/<domain>/trend varsayılan gün aralığı
+TREND_MAX_DAYS = int(os.getenv('TREND_MAX_DAYS', 1095))  # Tek istekte en fazla gün (yanıt gün başına bir kayıt)
+
+# Site List Configuration
+SITES_DEFAULT_PAGE_SIZE = int(os.getenv('SITES_DEFAULT_PAGE_SIZE', 50))  # /api/sites varsayılan sayfa boyutu
+SITES_MAX_PAGE_SIZE = int(os.getenv('SITES_MAX_PAGE_SIZE', 500))  # /api/sites sayfa başına en fazla site
+
+# Ranking Configuration
+# GET /api/rankings: bundan az şikayeti (veya puanı) olan sitelerin oranları gürültülüdür; oran/puan sıralamasına ve istatistiklere katılmaz
+RANKING_MIN_COMPLAINTS = int(os.getenv('RANKING_MIN_COMPLAINTS', 5))
+RANKING_MAX_PAGE_SIZE = int(os.getenv('RANKING_MAX_PAGE_SIZE', 200))  # Sayfa başına en fazla site
+
+# Export Configuration
+# GET /api/export ve `python -m export`: şikayetler bu kadar satırlık parçalar halinde okunup yazılır (bellek parça boyutuyla sınırlı)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 5000))
+
+# Progress Stream (SSE) Configuration
+# GET /api/jobs/<job_id>/events: analiz ilerleme olayları; stream'ler bellekteki olayları bekler, veritabanına gitmez
+SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', 200))  # Aynı anda açık en fazla stream (API_THREADS'ten küçük olmalı)
+SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', 15))  # Olay yokken proxy'lerin bağlantıyı kesmemesi için yorum satırı
+SSE_EVENT_BUFFER = int(os.getenv('SSE_EVENT_BUFFER', 1000))  # İş başına bellekte tutulan en fazla olay
+SSE_RETENTION_SECONDS = int(os.getenv('SSE_RETENTION_SECONDS', 300))  # Biten işin olayları bu kadar saniye tekrar okunabilir
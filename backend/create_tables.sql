@@ -26,6 +26,8 @@ BEGIN
         [CreatedDate] DATETIME DEFAULT GETDATE(),
         [LastScannedDate] DATETIME,
         [RiskScore] INT DEFAULT 0,
+        [RiskModel] NVARCHAR(50), -- Skoru üreten risk modeli sürümü (backend/risk.py)
+        [ScoreRevision] INT NOT NULL DEFAULT 0, -- Her skor güncellemesinde artar (site listesi sürümü, ETag)
         [Status] NVARCHAR(50) DEFAULT 'Active',
         [Description] NVARCHAR(MAX),
         [Category] NVARCHAR(100)
@@ -38,6 +40,19 @@ BEGIN
 END
 GO
 
+-- /api/sites sayfalama, sıralama ve filtre index'leri (Domain öneki UNIQUE constraint index'iyle karşılanır)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Sites_LastScannedDate' AND object_id = OBJECT_ID(N'[dbo].[Sites]'))
+BEGIN
+    CREATE INDEX IX_Sites_LastScannedDate ON [dbo].[Sites]([LastScannedDate], [SiteID]) INCLUDE ([Domain], [SiteName], [RiskScore])
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Sites_RiskScore' AND object_id = OBJECT_ID(N'[dbo].[Sites]'))
+BEGIN
+    CREATE INDEX IX_Sites_RiskScore ON [dbo].[Sites]([RiskScore], [SiteID]) INCLUDE ([Domain], [SiteName], [LastScannedDate])
+END
+GO
+
 -- 2. Complaints Tablosu (Şikayet/Yorum Kayıtları)
 IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[Complaints]') AND type in (N'U'))
 BEGIN
@@ -105,11 +120,16 @@ BEGIN
         [HistoryID] INT PRIMARY KEY IDENTITY(1,1),
         [SiteID] INT NOT NULL,
         [Source] NVARCHAR(100) NOT NULL,
-        [Status] NVARCHAR(50), -- 'Success', 'Failed', 'Partial'
+        [Status] NVARCHAR(50), -- 'Success', 'Failed', 'Partial', 'Empty', 'Skipped'
         [RecordsFound] INT DEFAULT 0,
         [ErrorMessage] NVARCHAR(MAX),
         [ScrapedDate] DATETIME DEFAULT GETDATE(),
         [Duration] INT, -- Saniye cinsinden süre
+        [DurationMs] INT, -- Milisaniye cinsinden gerçek kaynak süresi
+        [PagesVisited] INT DEFAULT 0,
+        [BytesDownloaded] BIGINT DEFAULT 0,
+        [CacheHit] BIT DEFAULT 0,
+        [StageTimings] NVARCHAR(MAX), -- JSON: aşama adı -> milisaniye
         FOREIGN KEY ([SiteID]) REFERENCES [dbo].[Sites]([SiteID]) ON DELETE CASCADE
     )
     
@@ -126,7 +146,202 @@ BEGIN
 END
 GO
 
--- 5. Örnek Veri Ekleme (Opsiyonel)
+-- 5. ScrapingPageStats Tablosu (Sayfa Bazında Scraping Telemetrisi)
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ScrapingPageStats]') AND type in (N'U'))
+BEGIN
+    CREATE TABLE [dbo].[ScrapingPageStats] (
+        [PageStatID] INT PRIMARY KEY IDENTITY(1,1),
+        [HistoryID] INT NOT NULL,
+        [PageNumber] INT,
+        [URL] NVARCHAR(1000),
+        [StatusCode] INT,
+        [Bytes] INT DEFAULT 0,
+        [FetchMs] INT,
+        [ParseMs] INT,
+        [RecordsFound] INT DEFAULT 0,
+        FOREIGN KEY ([HistoryID]) REFERENCES [dbo].[ScrapingHistory]([HistoryID]) ON DELETE CASCADE
+    )
+    
+    CREATE INDEX IX_ScrapingPageStats_HistoryID ON [dbo].[ScrapingPageStats]([HistoryID])
+    
+    PRINT 'ScrapingPageStats tablosu oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'ScrapingPageStats tablosu zaten mevcut.'
+END
+GO
+
+-- 6. Complaints Full-Text Index (/api/search)
+-- Full-Text Search bileşeni gerektirir; yoksa arama LIKE ile çalışır
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+   AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(N'[dbo].[Complaints]'))
+BEGIN
+    IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'ComplaintsCatalog')
+        CREATE FULLTEXT CATALOG ComplaintsCatalog
+    
+    DECLARE @pk SYSNAME = (SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(N'[dbo].[Complaints]') AND is_primary_key = 1)
+    EXEC('CREATE FULLTEXT INDEX ON [dbo].[Complaints] ([Title] LANGUAGE 1055, [Content] LANGUAGE 1055)
+          KEY INDEX [' + @pk + '] ON ComplaintsCatalog WITH CHANGE_TRACKING AUTO')
+    
+    PRINT 'Complaints full-text index oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'Complaints full-text index zaten mevcut veya Full-Text Search kurulu değil.'
+END
+GO
+
+-- 7. ComplaintDailyStats Tablosu (Günlük Şikayet Sayaçları, /api/site/<domain>/trend)
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ComplaintDailyStats]') AND type in (N'U'))
+BEGIN
+    CREATE TABLE [dbo].[ComplaintDailyStats] (
+        [SiteID] INT NOT NULL,
+        [StatDate] DATE NOT NULL,
+        [Source] NVARCHAR(100) NOT NULL,
+        [Sentiment] NVARCHAR(50) NOT NULL,
+        [IsResolved] BIT NOT NULL,
+        [ComplaintCount] INT NOT NULL DEFAULT 0,
+        CONSTRAINT [PK_ComplaintDailyStats] PRIMARY KEY ([SiteID], [StatDate], [Source], [Sentiment], [IsResolved]),
+        FOREIGN KEY ([SiteID]) REFERENCES [dbo].[Sites]([SiteID]) ON DELETE CASCADE
+    )
+    
+    -- Mevcut şikayetlerden doldur
+    INSERT INTO [dbo].[ComplaintDailyStats] (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+    SELECT SiteID, CAST(COALESCE(Date, ScrapedDate) AS DATE), Source,
+           COALESCE(Sentiment, 'neutral'), COALESCE(IsResolved, 0), COUNT(*)
+    FROM [dbo].[Complaints]
+    WHERE SiteID IS NOT NULL
+    GROUP BY SiteID, CAST(COALESCE(Date, ScrapedDate) AS DATE), Source,
+             COALESCE(Sentiment, 'neutral'), COALESCE(IsResolved, 0)
+    
+    PRINT 'ComplaintDailyStats tablosu oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'ComplaintDailyStats tablosu zaten mevcut.'
+END
+GO
+
+-- 8. SiteComplaintCounters Tablosu (Site Bazında Şikayet Sayaçları, Risk Skoru)
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Sites]') AND name = 'RiskModel')
+BEGIN
+    ALTER TABLE [dbo].[Sites] ADD [RiskModel] NVARCHAR(50)
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Sites]') AND name = 'ScoreRevision')
+BEGIN
+    ALTER TABLE [dbo].[Sites] ADD [ScoreRevision] INT NOT NULL CONSTRAINT [DF_Sites_ScoreRevision] DEFAULT 0
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[SiteComplaintCounters]') AND type in (N'U'))
+BEGIN
+    CREATE TABLE [dbo].[SiteComplaintCounters] (
+        [SiteID] INT PRIMARY KEY,
+        [TotalCount] INT NOT NULL DEFAULT 0,
+        [NegativeCount] INT NOT NULL DEFAULT 0,
+        [PositiveCount] INT NOT NULL DEFAULT 0,
+        [ResolvedCount] INT NOT NULL DEFAULT 0,
+        [NegativeResolvedCount] INT NOT NULL DEFAULT 0,
+        [RatingSum] BIGINT NOT NULL DEFAULT 0,
+        [RatingCount] INT NOT NULL DEFAULT 0,
+        FOREIGN KEY ([SiteID]) REFERENCES [dbo].[Sites]([SiteID]) ON DELETE CASCADE
+    )
+    
+    -- Mevcut şikayetlerden doldur
+    INSERT INTO [dbo].[SiteComplaintCounters]
+        (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+    SELECT SiteID,
+           COUNT(*),
+           SUM(CASE WHEN Sentiment = 'negative' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN Sentiment = 'positive' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN IsResolved = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN Sentiment = 'negative' AND IsResolved = 1 THEN 1 ELSE 0 END),
+           COALESCE(SUM(CAST(Rating AS BIGINT)), 0),
+           COUNT(Rating)
+    FROM [dbo].[Complaints]
+    WHERE SiteID IS NOT NULL
+    GROUP BY SiteID
+    
+    PRINT 'SiteComplaintCounters tablosu oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'SiteComplaintCounters tablosu zaten mevcut.'
+END
+GO
+
+-- 9. ScrapeJobs Tablosu (scraper_worker İş Kuyruğu)
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ScrapeJobs]') AND type in (N'U'))
+BEGIN
+    CREATE TABLE [dbo].[ScrapeJobs] (
+        [JobID] NVARCHAR(32) PRIMARY KEY,
+        [URL] NVARCHAR(1000) NOT NULL,
+        [Domain] NVARCHAR(255),
+        [Status] NVARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+        [Profile] BIT DEFAULT 0,
+        [Attempts] INT NOT NULL DEFAULT 0,
+        [WorkerID] NVARCHAR(255),
+        [CreatedDate] DATETIME DEFAULT GETDATE(),
+        [StartedDate] DATETIME,
+        [HeartbeatDate] DATETIME,
+        [FinishedDate] DATETIME,
+        [Result] NVARCHAR(MAX),
+        [ErrorMessage] NVARCHAR(MAX)
+    )
+    
+    CREATE INDEX IX_ScrapeJobs_Status ON [dbo].[ScrapeJobs]([Status], [CreatedDate])
+    
+    PRINT 'ScrapeJobs tablosu oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'ScrapeJobs tablosu zaten mevcut.'
+END
+GO
+
+-- Domain başına en fazla bir aktif analiz (single-flight)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'UX_ScrapeJobs_ActiveDomain')
+BEGIN
+    CREATE UNIQUE INDEX UX_ScrapeJobs_ActiveDomain ON [dbo].[ScrapeJobs]([Domain]) WHERE [Status] IN ('queued', 'running')
+END
+GO
+
+-- 10. SourceIdentities Tablosu (Çözülmüş Kaynak Tanımlayıcıları)
+-- Trustpilot şirket sayfası, Şikayetvar slug'ı, Google Maps place URL'i; sonraki taramalar aramayı atlar
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[SourceIdentities]') AND type in (N'U'))
+BEGIN
+    CREATE TABLE [dbo].[SourceIdentities] (
+        [SiteID] INT NOT NULL,
+        [Source] NVARCHAR(100) NOT NULL,
+        [Identifier] NVARCHAR(1000) NOT NULL,
+        [ResolvedDate] DATETIME DEFAULT GETDATE(),
+        [VerifiedDate] DATETIME DEFAULT GETDATE(),
+        [ExpiresDate] DATETIME NOT NULL,
+        CONSTRAINT [PK_SourceIdentities] PRIMARY KEY ([SiteID], [Source]),
+        FOREIGN KEY ([SiteID]) REFERENCES [dbo].[Sites]([SiteID]) ON DELETE CASCADE
+    )
+    
+    PRINT 'SourceIdentities tablosu oluşturuldu.'
+END
+ELSE
+BEGIN
+    PRINT 'SourceIdentities tablosu zaten mevcut.'
+END
+GO
+
+-- 11. Okuma Bağlantıları için Snapshot Isolation
+-- Okuma endpoint'leri SNAPSHOT isolation ile çalışır, scraping transaction'larının kilitlerini beklemez
+IF NOT EXISTS (SELECT * FROM sys.databases WHERE name = DB_NAME() AND snapshot_isolation_state = 1)
+BEGIN
+    ALTER DATABASE CURRENT SET ALLOW_SNAPSHOT_ISOLATION ON
+    PRINT 'ALLOW_SNAPSHOT_ISOLATION açıldı.'
+END
+GO
+
+-- 12. Örnek Veri Ekleme (Opsiyonel)
 -- Test için örnek site ekle
 IF NOT EXISTS (SELECT * FROM [dbo].[Sites] WHERE Domain = 'example.com')
 BEGIN
@@ -1,8 +1,17 @@
-import pyodbc
-from config import SQL_SERVER, SQL_DATABASE, SQL_USERNAME, SQL_PASSWORD, SQL_DRIVER
+from config import (
+    SQL_SERVER, SQL_DATABASE, SQL_USERNAME, SQL_PASSWORD, SQL_DRIVER, DB_BACKEND, SEARCH_MAX_COUNT,
+    SQL_READ_CONNECTION_STRING, DB_READ_SNAPSHOT
+)
 import logging
 import threading
+import json
+import re
+from collections import Counter
+from datetime import datetime, timedelta
 from functools import lru_cache
+from metrics import timed_db_method, DB_POOL_CONNECTIONS, DB_POOL_IN_USE
+from models import Complaint
+from risk import RiskCounters
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,8 +25,190 @@ logger.setLevel(logging.WARNING)  # INFO yerine WARNING
 _db_lock = threading.Lock()
 _connection_pool = {}
 
+DB_POOL_CONNECTIONS.set_callback(lambda: len(_connection_pool))
+
+# Toplu insert'lerde tek executemany çağrısındaki en fazla satır
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Site/kaynak/sentiment/çözüm durumu bazında günlük şikayet sayaçları (save_complaints ile artımlı güncellenir)
+DAILY_STATS_TABLE_SQL = """
+    IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ComplaintDailyStats]') AND type in (N'U'))
+    CREATE TABLE ComplaintDailyStats (
+        SiteID INT NOT NULL FOREIGN KEY REFERENCES Sites(SiteID),
+        StatDate DATE NOT NULL,
+        Source NVARCHAR(100) NOT NULL,
+        Sentiment NVARCHAR(50) NOT NULL,
+        IsResolved BIT NOT NULL,
+        ComplaintCount INT NOT NULL DEFAULT 0,
+        CONSTRAINT PK_ComplaintDailyStats PRIMARY KEY (SiteID, StatDate, Source, Sentiment, IsResolved)
+    )
+"""
+
+# Site bazında toplam şikayet sayaçları (risk skoru O(1) bunlardan hesaplanır, bkz. risk.py)
+SITE_COUNTERS_TABLE_SQL = """
+    IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[SiteComplaintCounters]') AND type in (N'U'))
+    CREATE TABLE SiteComplaintCounters (
+        SiteID INT PRIMARY KEY FOREIGN KEY REFERENCES Sites(SiteID),
+        TotalCount INT NOT NULL DEFAULT 0,
+        NegativeCount INT NOT NULL DEFAULT 0,
+        PositiveCount INT NOT NULL DEFAULT 0,
+        ResolvedCount INT NOT NULL DEFAULT 0,
+        NegativeResolvedCount INT NOT NULL DEFAULT 0,
+        RatingSum BIGINT NOT NULL DEFAULT 0,
+        RatingCount INT NOT NULL DEFAULT 0
+    )
+"""
+
+# Sayaç tablosu boşsa mevcut şikayetlerden doldur (iki backend'de de geçerli SQL)
+SITE_COUNTERS_BACKFILL_SQL = """
+    INSERT INTO SiteComplaintCounters
+        (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+    SELECT SiteID,
+           COUNT(*),
+           SUM(CASE WHEN Sentiment = 'negative' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN Sentiment = 'positive' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN IsResolved = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN Sentiment = 'negative' AND IsResolved = 1 THEN 1 ELSE 0 END),
+           COALESCE(SUM(CAST(Rating AS BIGINT)), 0),
+           COUNT(Rating)
+    FROM Complaints
+    WHERE SiteID IS NOT NULL AND NOT EXISTS (SELECT 1 FROM SiteComplaintCounters)
+    GROUP BY SiteID
+"""
+
+# Analiz iş kuyruğu (scraper_worker süreçleri işleri buradan alır)
+SCRAPE_JOBS_TABLE_SQL = """
+    IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ScrapeJobs]') AND type in (N'U'))
+    BEGIN
+        CREATE TABLE ScrapeJobs (
+            JobID NVARCHAR(32) PRIMARY KEY,
+            URL NVARCHAR(1000) NOT NULL,
+            Domain NVARCHAR(255),
+            Status NVARCHAR(20) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed'
+            Profile BIT DEFAULT 0,
+            Attempts INT NOT NULL DEFAULT 0,
+            WorkerID NVARCHAR(255), -- host:pid
+            CreatedDate DATETIME DEFAULT GETDATE(),
+            StartedDate DATETIME,
+            HeartbeatDate DATETIME,
+            FinishedDate DATETIME,
+            Result NVARCHAR(MAX), -- JSON: process_site sonucu
+            ErrorMessage NVARCHAR(MAX)
+        )
+        CREATE INDEX IX_ScrapeJobs_Status ON ScrapeJobs(Status, CreatedDate)
+    END
+    -- Domain başına en fazla bir aktif iş (single-flight: aynı domain için ikinci analiz çalışana bağlanır)
+    IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'UX_ScrapeJobs_ActiveDomain')
+    CREATE UNIQUE INDEX UX_ScrapeJobs_ActiveDomain ON ScrapeJobs(Domain) WHERE Status IN ('queued', 'running')
+"""
+
+# Site -> kaynaktaki tanımlayıcı eşlemesi (Trustpilot şirket sayfası, Şikayetvar slug'ı, Google Maps place URL'i)
+# Kayıt bulunan her taramada doğrulanır ve süresi uzatılır; süresi dolan eşlemeler yeniden çözülür
+SOURCE_IDENTITIES_TABLE_SQL = """
+    IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[SourceIdentities]') AND type in (N'U'))
+    CREATE TABLE SourceIdentities (
+        SiteID INT NOT NULL FOREIGN KEY REFERENCES Sites(SiteID),
+        Source NVARCHAR(100) NOT NULL,
+        Identifier NVARCHAR(1000) NOT NULL,
+        ResolvedDate DATETIME DEFAULT GETDATE(), -- Tanımlayıcının ilk bulunduğu (veya değiştiği) zaman
+        VerifiedDate DATETIME DEFAULT GETDATE(), -- Son kez kayıt döndürdüğü zaman
+        ExpiresDate DATETIME NOT NULL,
+        CONSTRAINT PK_SourceIdentities PRIMARY KEY (SiteID, Source)
+    )
+"""
+
+# /api/sites filtreleri ve sıralamaları için index'ler (Domain öneki UNIQUE constraint index'iyle karşılanır)
+SITES_INDEXES_SQL = """
+    IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Sites_LastScannedDate' AND object_id = OBJECT_ID(N'[dbo].[Sites]'))
+    CREATE INDEX IX_Sites_LastScannedDate ON Sites(LastScannedDate, SiteID) INCLUDE (Domain, SiteName, RiskScore)
+    IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Sites_RiskScore' AND object_id = OBJECT_ID(N'[dbo].[Sites]'))
+    CREATE INDEX IX_Sites_RiskScore ON Sites(RiskScore, SiteID) INCLUDE (Domain, SiteName, LastScannedDate)
+"""
+
+# /api/sites sıralamaları (en yeni tarama, en yüksek risk skoru, domain alfabetik)
+SITE_LIST_SORTS = ('last_scanned', 'risk_score', 'domain')
+
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_SUCCEEDED = 'succeeded'
+JOB_STATUS_FAILED = 'failed'
+
+# Tam metin aramada kullanılan en fazla terim (tüm terimler AND ile birleştirilir)
+SEARCH_MAX_TERMS = 8
+_SEARCH_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Full-text index durumu (bağlantı dizesi -> bool), her aramada sistem tablolarına gitmemek için
+_fulltext_status = {}
+
+
+def daily_stat_counts(rows):
+    """
+    Complaints satırlarını (SiteID, Source, ..., Date, ..., Sentiment, URL, IsResolved) günlük
+    sayaçlara indir: {(gün, kaynak, sentiment, çözüldü mü): adet}
+    Tarihi olmayan şikayetler kaydedildikleri güne yazılır (ScrapedDate ile aynı)
+    """
+    today = datetime.now().date()
+    counts = Counter()
+    for _, source, _, _, _, date, _, sentiment, _, is_resolved in rows:
+        day = date.date() if isinstance(date, datetime) else (date or today)
+        counts[(day, source, sentiment, is_resolved)] += 1
+    return counts
+
+
+def site_counter_deltas(rows):
+    """Complaints satırlarının SiteComplaintCounters artışları (RiskCounters.FIELDS sırasında)"""
+    total = negative = positive = resolved = negative_resolved = rating_sum = rating_count = 0
+    for _, _, _, _, _, _, rating, sentiment, _, is_resolved in rows:
+        total += 1
+        if sentiment == 'negative':
+            negative += 1
+            if is_resolved:
+                negative_resolved += 1
+        elif sentiment == 'positive':
+            positive += 1
+        if is_resolved:
+            resolved += 1
+        if rating is not None:
+            rating_sum += rating
+            rating_count += 1
+    return total, negative, positive, resolved, negative_resolved, rating_sum, rating_count
+
+
+def prefix_upper_bound(prefix):
+    """Öneki olan değerlerin üst sınırı: prefix <= değer < üst sınır (LIKE 'prefix%' yerine index aralığı)"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search_terms(query):
+    """Arama metnini terimlere ayır (noktalama ve full-text operatörleri atılır)"""
+    return _SEARCH_TERM_RE.findall(query or '')[:SEARCH_MAX_TERMS]
+
+
+def create_database(use_pool=True, read_only=False):
+    """
+    Config'deki DB_BACKEND'e göre Database örneği oluştur ('sqlserver' veya 'sqlite')
+    read_only=True: okuma pool'u (varsa SQL_READ_CONNECTION_STRING replikası, snapshot isolation)
+    """
+    if DB_BACKEND == 'sqlite':
+        from sqlite_database import SqliteDatabase
+        return SqliteDatabase(use_pool=use_pool, read_only=read_only)
+    return Database(use_pool=use_pool, read_only=read_only)
+
+
 class Database:
-    def __init__(self, use_pool=True):
+    """
+    SQL Server (pyodbc) depolama katmanı.
+    
+    Lehçeye özgü kısımlar (bağlantı açma, zaman fonksiyonu, eklenen satırın ID'si,
+    tablo oluşturma/migration) ayrı metodlarda tutulur; SqliteDatabase bunları override eder.
+    """
+    
+    backend_name = 'SQL Server'
+    NOW_SQL = 'GETDATE()'  # Sorgularda şimdiki zaman ifadesi
+    # DATETIME sütunuyla karşılaştırılan parametre (pyodbc datetime2 gönderir; DATETIME'ın 3 ms yuvarlaması eşitliği bozmasın)
+    DATETIME_PARAM_SQL = 'CAST(? AS DATETIME)'
+    
+    def __init__(self, use_pool=True, read_only=False):
         # SQL Server 2022 ve ODBC Driver 18 için gerekli parametreler
         # Driver 18 TLS 1.2+ zorunlu kılar
         # Config'den gelen server adını kullan (instance adı dahil)
@@ -35,8 +226,26 @@ class Database:
         )
         self.conn = None
         self.use_pool = use_pool
-        self.pool_key = f"{server}_{SQL_DATABASE}_{SQL_USERNAME}"
+        self.read_only = read_only
+        pool_key = f"{server}_{SQL_DATABASE}_{SQL_USERNAME}"
+        if read_only:
+            # Okumalar yazma bağlantısını paylaşmaz: toplu şikayet kaydı dashboard okumalarını bekletmez
+            if SQL_READ_CONNECTION_STRING:
+                self.connection_string = SQL_READ_CONNECTION_STRING
+                pool_key = f"replica_{SQL_READ_CONNECTION_STRING}"
+            pool_key += ':read'
+        self.pool_key = pool_key
+        self._in_use = False
+    
+    def _mark_in_use(self, in_use):
+        """Pool kullanım metriğini güncelle (aynı nesne için çift sayımı önle)"""
+        if in_use and not self._in_use:
+            DB_POOL_IN_USE.inc()
+        elif not in_use and self._in_use:
+            DB_POOL_IN_USE.dec()
+        self._in_use = in_use
     
+    @timed_db_method
     def connect(self):
         try:
             # Connection pool kullan
@@ -51,6 +260,7 @@ class Database:
                             cursor.fetchone()
                             cursor.close()  # Cursor'ı kapat
                             self.conn = conn
+                            self._mark_in_use(True)
                             return True
                         except:
                             # Bağlantı geçersiz, yeni bağlantı oluştur
@@ -61,19 +271,60 @@ class Database:
                             del _connection_pool[self.pool_key]
             
             # Yeni bağlantı oluştur
-            self.conn = pyodbc.connect(self.connection_string)
+            self.conn = self._open_connection()
+            if self.read_only:
+                self._prepare_read_connection(self.conn)
             
             if self.use_pool:
                 with _db_lock:
                     _connection_pool[self.pool_key] = self.conn
             
+            self._mark_in_use(True)
             # Sadece yeni bağlantı oluşturulduğunda log (pool'dan alınan bağlantılar için log yok)
-            logger.info("✓ SQL Server bağlantısı oluşturuldu")
+            logger.info(f"✓ {self.backend_name} bağlantısı oluşturuldu")
             return True
         except Exception as e:
-            logger.error(f"SQL Server bağlantı hatası: {str(e)}")
+            logger.error(f"{self.backend_name} bağlantı hatası: {str(e)}")
             return False
     
+    def _open_connection(self):
+        """Yeni fiziksel bağlantı aç"""
+        import pyodbc  # SQLite backend'inde pyodbc gerekmez
+        return pyodbc.connect(self.connection_string)
+    
+    def _prepare_read_connection(self, conn):
+        """
+        Okuma bağlantısı: her sorgu kendi transaction'ında (autocommit; pool'daki bağlantı eski
+        snapshot'ta kalmaz) ve SNAPSHOT isolation ile çalışır, scraping transaction'larının
+        kilitlerini beklemez
+        """
+        conn.autocommit = True
+        if not DB_READ_SNAPSHOT:
+            return
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT snapshot_isolation_state FROM sys.databases WHERE name = DB_NAME()")
+            row = cursor.fetchone()
+            if row and row[0] == 1:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+            else:
+                logger.warning("ALLOW_SNAPSHOT_ISOLATION kapalı, okumalar READ COMMITTED ile yapılıyor (/api/init-db ile açılır)")
+        finally:
+            cursor.close()
+    
+    def _insert_returning_id(self, cursor, table, columns, params, id_column):
+        """INSERT çalıştır ve oluşan satırın ID'sini döndür"""
+        placeholders = ', '.join('?' for _ in columns)
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) OUTPUT INSERTED.{id_column} VALUES ({placeholders})",
+            params
+        )
+        return cursor.fetchone()[0]
+    
+    def _prepare_bulk_cursor(self, cursor):
+        """executemany için cursor'ı hazırla (pyodbc: parametreleri tek seferde gönder)"""
+        cursor.fast_executemany = True
+    
     def close(self, force=False):
         """
         Bağlantıyı kapat
@@ -83,6 +334,8 @@ class Database:
         if not self.conn:
             return
         
+        self._mark_in_use(False)
+        
         if self.use_pool and not force:
             # Pool kullanılıyorsa bağlantıyı kapatma, sadece referansı temizle
             self.conn = None
@@ -97,12 +350,13 @@ class Database:
                     if self.pool_key in _connection_pool:
                         del _connection_pool[self.pool_key]
             # Sadece gerçekten kapatıldığında log
-            logger.info("✓ SQL Server bağlantısı kapatıldı")
+            logger.info(f"✓ {self.backend_name} bağlantısı kapatıldı")
         except Exception as e:
             logger.warning(f"Bağlantı kapatılırken hata: {str(e)}")
         finally:
             self.conn = None
     
+    @timed_db_method
     def create_tables(self):
         """Veritabanı tablolarını oluştur"""
         try:
@@ -119,6 +373,8 @@ class Database:
                     CreatedDate DATETIME DEFAULT GETDATE(),
                     LastScannedDate DATETIME,
                     RiskScore INT DEFAULT 0,
+                    RiskModel NVARCHAR(50), -- Skoru üreten risk modeli sürümü (risk.py)
+                    ScoreRevision INT NOT NULL DEFAULT 0, -- Her skor güncellemesinde artar (site listesi sürümü)
                     Status NVARCHAR(50) DEFAULT 'Active'
                 )
             """)
@@ -186,15 +442,63 @@ class Database:
                     HistoryID INT PRIMARY KEY IDENTITY(1,1),
                     SiteID INT FOREIGN KEY REFERENCES Sites(SiteID),
                     Source NVARCHAR(100),
-                    Status NVARCHAR(50), -- 'Success', 'Failed', 'Partial'
+                    Status NVARCHAR(50), -- 'Success', 'Failed', 'Partial', 'Empty', 'Skipped'
                     RecordsFound INT DEFAULT 0,
                     ErrorMessage NVARCHAR(MAX),
                     ScrapedDate DATETIME DEFAULT GETDATE(),
-                    Duration INT -- Saniye cinsinden süre
+                    Duration INT, -- Saniye cinsinden süre
+                    DurationMs INT, -- Milisaniye cinsinden gerçek kaynak süresi
+                    PagesVisited INT DEFAULT 0,
+                    BytesDownloaded BIGINT DEFAULT 0,
+                    CacheHit BIT DEFAULT 0,
+                    StageTimings NVARCHAR(MAX) -- JSON: aşama adı -> milisaniye (fetch, parse, selenium_startup, ...)
                 )
             """)
             cursor.close()
             
+            # Sayfa bazında scraping telemetrisi
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ScrapingPageStats]') AND type in (N'U'))
+                CREATE TABLE ScrapingPageStats (
+                    PageStatID INT PRIMARY KEY IDENTITY(1,1),
+                    HistoryID INT FOREIGN KEY REFERENCES ScrapingHistory(HistoryID) ON DELETE CASCADE,
+                    PageNumber INT,
+                    URL NVARCHAR(1000),
+                    StatusCode INT,
+                    Bytes INT DEFAULT 0,
+                    FetchMs INT,
+                    ParseMs INT,
+                    RecordsFound INT DEFAULT 0
+                )
+            """)
+            cursor.close()
+            
+            # Günlük şikayet sayaçları (trend grafikleri)
+            cursor = self.conn.cursor()
+            cursor.execute(DAILY_STATS_TABLE_SQL)
+            cursor.close()
+            
+            # Site bazında şikayet sayaçları (risk skoru)
+            cursor = self.conn.cursor()
+            cursor.execute(SITE_COUNTERS_TABLE_SQL)
+            cursor.close()
+            
+            # Analiz iş kuyruğu
+            cursor = self.conn.cursor()
+            cursor.execute(SCRAPE_JOBS_TABLE_SQL)
+            cursor.close()
+            
+            # Kaynak tanımlayıcıları (çözülmüş Trustpilot/Şikayetvar/Google Maps adresleri)
+            cursor = self.conn.cursor()
+            cursor.execute(SOURCE_IDENTITIES_TABLE_SQL)
+            cursor.close()
+            
+            # Site listesi filtre/sıralama index'leri
+            cursor = self.conn.cursor()
+            cursor.execute(SITES_INDEXES_SQL)
+            cursor.close()
+            
             self.conn.commit()
             logger.info("✓ Tablolar başarıyla oluşturuldu")
             return True
@@ -206,6 +510,7 @@ class Database:
                 pass
             return False
     
+    @timed_db_method
     def get_or_create_site(self, domain):
         """Site'yi getir veya oluştur"""
         cursor = None
@@ -221,11 +526,7 @@ class Database:
             else:
                 # INSERT için yeni cursor aç
                 cursor = self.conn.cursor()
-                cursor.execute(
-                    "INSERT INTO Sites (Domain) OUTPUT INSERTED.SiteID VALUES (?)",
-                    (domain,)
-                )
-                site_id = cursor.fetchone()[0]
+                site_id = self._insert_returning_id(cursor, 'Sites', ['Domain'], (domain,), 'SiteID')
                 cursor.close()
                 self.conn.commit()
                 return site_id
@@ -237,6 +538,7 @@ class Database:
                     pass
             raise e
     
+    @timed_db_method
     def save_complaint(self, site_id, source, title, content, author, date, rating, sentiment, url, is_resolved=False):
         """Şikayet kaydını kaydet"""
         cursor = None
@@ -247,8 +549,10 @@ class Database:
                 (SiteID, Source, Title, Content, Author, Date, Rating, Sentiment, URL, IsResolved)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (site_id, source, title, content, author, date, rating, sentiment, url, 1 if is_resolved else 0))
-            self.conn.commit()
             cursor.close()
+            self._update_complaint_counters(site_id, [(site_id, source, title, content, author, date, rating,
+                                                       sentiment or 'neutral', url, 1 if is_resolved else 0)])
+            self.conn.commit()
             return True
         except Exception as e:
             logger.error(f"Şikayet kaydetme hatası: {str(e)}")
@@ -257,20 +561,111 @@ class Database:
                     cursor.close()
                 except:
                     pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
             return False
     
-    def save_scraping_history(self, site_id, source, status, records_found, error_message=None, duration=None):
-        """Scraping geçmişini kaydet"""
+    @timed_db_method
+    def save_complaints(self, site_id, complaints):
+        """
+        Şikayetleri toplu olarak kaydet (executemany, tek commit)
+        ComplaintDailyStats ve SiteComplaintCounters sayaçları aynı transaction içinde artırılır
+        Toplu kayıt başarısız olursa (ör. fazla uzun alan, hatalı tarih) şikayetler tek tek kaydedilir:
+        hatalı satırlar atlanır, sayaçlar sadece kaydedilen satırlar için artırılır
+        complaints: models.Complaint listesi
+        Kaydedilen kayıt sayısını döndürür
+        """
+        if not complaints:
+            return 0
+        
+        rows = [
+            (site_id, c.source or 'unknown', c.title, c.content, c.author,
+             c.date, c.rating, c.sentiment or 'neutral', c.url, 1 if c.is_resolved else 0)
+            for c in complaints
+        ]
         cursor = None
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO ScrapingHistory (SiteID, Source, Status, RecordsFound, ErrorMessage, Duration)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (site_id, source, status, records_found, error_message, duration))
+            self._prepare_bulk_cursor(cursor)
+            for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                cursor.executemany("""
+                    INSERT INTO Complaints 
+                    (SiteID, Source, Title, Content, Author, Date, Rating, Sentiment, URL, IsResolved)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows[start:start + BULK_INSERT_CHUNK_SIZE])
+            cursor.close()
+            cursor = None
+            self._update_complaint_counters(site_id, rows)  # Aynı transaction: sayaçlar şikayetlerle birlikte commit edilir
             self.conn.commit()
+            return len(rows)
+        except Exception as e:
+            logger.warning(f"Toplu şikayet kaydetme hatası, şikayetler tek tek kaydediliyor: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+        
+        # Her satır ayrı transaction'da; hatalı satır diğerlerini geri almaz
+        saved = sum(1 for row in rows if self.save_complaint(*row))
+        if saved < len(rows):
+            logger.warning(f"⚠ {len(rows) - saved}/{len(rows)} şikayet reddedildi (hatalı alan), {saved} şikayet kaydedildi")
+        return saved
+    
+    @timed_db_method
+    def save_scraping_history(self, site_id, source, status, records_found, error_message=None, duration=None, stats=None):
+        """
+        Scraping geçmişini kaydet
+        stats: BaseScraper.run() istatistikleri (verilirse sayfa bazında telemetri de yazılır)
+        Başarılıysa HistoryID, değilse None döner
+        """
+        cursor = None
+        try:
+            stats = stats or {}
+            duration_seconds = stats.get('duration_seconds')
+            if duration is None and duration_seconds is not None:
+                duration = int(round(duration_seconds))
+            duration_ms = int(duration_seconds * 1000) if duration_seconds is not None else None
+            stage_timings = json.dumps({
+                name: int(seconds * 1000) for name, seconds in stats.get('stages', {}).items()
+            }) if stats.get('stages') else None
+            pages = stats.get('pages', [])
+            
+            cursor = self.conn.cursor()
+            history_id = self._insert_returning_id(
+                cursor, 'ScrapingHistory',
+                ['SiteID', 'Source', 'Status', 'RecordsFound', 'ErrorMessage', 'Duration',
+                 'DurationMs', 'PagesVisited', 'BytesDownloaded', 'CacheHit', 'StageTimings'],
+                (site_id, source, status, records_found, error_message, duration,
+                 duration_ms, len(pages), stats.get('bytes_downloaded', 0),
+                 1 if stats.get('cache_hit') else 0, stage_timings),
+                'HistoryID'
+            )
             cursor.close()
-            return True
+            
+            if pages:
+                cursor = self.conn.cursor()
+                self._prepare_bulk_cursor(cursor)
+                cursor.executemany("""
+                    INSERT INTO ScrapingPageStats
+                    (HistoryID, PageNumber, URL, StatusCode, Bytes, FetchMs, ParseMs, RecordsFound)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (history_id, idx, (page.get('url') or '')[:1000], page.get('status'), page.get('bytes', 0),
+                     int(page.get('fetch_seconds', 0) * 1000), int(page.get('parse_seconds', 0) * 1000),
+                     page.get('records', 0))
+                    for idx, page in enumerate(pages, 1)
+                ])
+                cursor.close()
+            
+            self.conn.commit()
+            return history_id
         except Exception as e:
             logger.error(f"Scraping geçmişi kaydetme hatası: {str(e)}")
             if cursor:
@@ -278,8 +673,13 @@ class Database:
                     cursor.close()
                 except:
                     pass
-            return False
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return None
     
+    @timed_db_method
     def test_connection(self):
         """Veritabanı bağlantısını test et (hızlı test, log yok)"""
         cursor = None
@@ -310,16 +710,22 @@ class Database:
             self.conn = None
             return self.connect()
     
-    def update_site_risk_score(self, site_id, risk_score):
-        """Site risk skorunu güncelle"""
+    @timed_db_method
+    def update_site_risk_score(self, site_id, risk_score, risk_model=None, touch_scanned=True):
+        """
+        Site risk skorunu (ve skoru üreten model sürümünü) güncelle
+        touch_scanned=False: yeniden skorlamada LastScannedDate değiştirilmez
+        ScoreRevision her güncellemede artar; site listesi sürümü (get_site_list_version) yeniden skorlamada da değişir
+        """
         cursor = None
         try:
+            scanned_sql = f", LastScannedDate = {self.NOW_SQL}" if touch_scanned else ""
             cursor = self.conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE Sites 
-                SET RiskScore = ?, LastScannedDate = GETDATE()
+                SET RiskScore = ?, RiskModel = COALESCE(?, RiskModel), ScoreRevision = ScoreRevision + 1{scanned_sql}
                 WHERE SiteID = ?
-            """, (risk_score, site_id))
+            """, (risk_score, risk_model, site_id))
             self.conn.commit()
             cursor.close()
             return True
@@ -332,6 +738,635 @@ class Database:
                     pass
             return False
     
+    def _daily_stats_upsert_sql(self):
+        """(SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount) satırını ekleyen veya sayacı artıran ifade"""
+        return """
+            MERGE ComplaintDailyStats WITH (HOLDLOCK) AS t
+            USING (VALUES (?, ?, ?, ?, ?, ?)) AS s (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+            ON t.SiteID = s.SiteID AND t.StatDate = s.StatDate AND t.Source = s.Source
+               AND t.Sentiment = s.Sentiment AND t.IsResolved = s.IsResolved
+            WHEN MATCHED THEN UPDATE SET ComplaintCount = t.ComplaintCount + s.ComplaintCount
+            WHEN NOT MATCHED THEN INSERT (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+                VALUES (s.SiteID, s.StatDate, s.Source, s.Sentiment, s.IsResolved, s.ComplaintCount);
+        """
+    
+    def _upsert_daily_stats(self, site_id, rows):
+        """Kaydedilen Complaints satırlarını günlük sayaçlara ekle (commit çağıran tarafta)"""
+        counts = daily_stat_counts(rows)
+        cursor = self.conn.cursor()
+        try:
+            self._prepare_bulk_cursor(cursor)
+            cursor.executemany(self._daily_stats_upsert_sql(), [
+                (site_id, day, source, sentiment, is_resolved, count)
+                for (day, source, sentiment, is_resolved), count in counts.items()
+            ])
+        finally:
+            cursor.close()
+    
+    def _site_counters_upsert_sql(self):
+        """SiteComplaintCounters satırını ekleyen veya sayaçları artıran ifade (SiteID + RiskCounters.FIELDS)"""
+        return """
+            MERGE SiteComplaintCounters WITH (HOLDLOCK) AS t
+            USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?)) AS s
+                (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+            ON t.SiteID = s.SiteID
+            WHEN MATCHED THEN UPDATE SET
+                TotalCount = t.TotalCount + s.TotalCount,
+                NegativeCount = t.NegativeCount + s.NegativeCount,
+                PositiveCount = t.PositiveCount + s.PositiveCount,
+                ResolvedCount = t.ResolvedCount + s.ResolvedCount,
+                NegativeResolvedCount = t.NegativeResolvedCount + s.NegativeResolvedCount,
+                RatingSum = t.RatingSum + s.RatingSum,
+                RatingCount = t.RatingCount + s.RatingCount
+            WHEN NOT MATCHED THEN INSERT
+                (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+                VALUES (s.SiteID, s.TotalCount, s.NegativeCount, s.PositiveCount, s.ResolvedCount,
+                        s.NegativeResolvedCount, s.RatingSum, s.RatingCount);
+        """
+    
+    def _update_complaint_counters(self, site_id, rows):
+        """Kaydedilen Complaints satırlarını günlük ve site sayaçlarına ekle (commit çağıran tarafta)"""
+        self._upsert_daily_stats(site_id, rows)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(self._site_counters_upsert_sql(), (site_id,) + site_counter_deltas(rows))
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_site_counters(self, site_id):
+        """Sitenin şikayet sayaçları (RiskCounters, tek satır okuma)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount
+                FROM SiteComplaintCounters WHERE SiteID = ?
+            """, (site_id,))
+            return RiskCounters.from_row(cursor.fetchone())
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_all_site_counters(self):
+        """Tüm sitelerin sayaçları: [(SiteID, RiskCounters)] (yeniden skorlama için)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT s.SiteID, c.TotalCount, c.NegativeCount, c.PositiveCount, c.ResolvedCount,
+                       c.NegativeResolvedCount, c.RatingSum, c.RatingCount
+                FROM Sites s LEFT JOIN SiteComplaintCounters c ON c.SiteID = s.SiteID
+            """)
+            return [(row[0], RiskCounters.from_row(row[1:])) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_site_list_version(self):
+        """
+        Site listesinin sürümü: (site sayısı, en son tarama zamanı, skor revizyonlarının toplamı)
+        Her tarama LastScannedDate'i, her skor güncellemesi (yeniden skorlama dahil) ScoreRevision'ı değiştirir;
+        sürüm veritabanından okunduğu için tüm API süreçleri değişikliği görür
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*), MAX(LastScannedDate), SUM(CAST(ScoreRevision AS BIGINT)) FROM Sites")
+            row = cursor.fetchone()
+            return row[0], row[1], row[2] or 0
+        finally:
+            cursor.close()
+    
+    def _site_list_sort(self, sort):
+        """Sıralama adı -> (sütun, azalan mı, NULL olabilir mi, parametre ifadesi)"""
+        return {
+            'last_scanned': ('LastScannedDate', True, True, self.DATETIME_PARAM_SQL),
+            'risk_score': ('RiskScore', True, True, '?'),
+            'domain': ('Domain', False, False, '?'),
+        }[sort]
+    
+    @timed_db_method
+    def list_sites(self, limit, sort='last_scanned', after=None, risk_min=None, risk_max=None,
+                   scanned_from=None, scanned_to=None, domain_prefix=None):
+        """
+        Sitelerin bir sayfası (keyset sayfalama): [(Domain, SiteName, RiskScore, LastScannedDate, SiteID)]
+        sort: SITE_LIST_SORTS; after: önceki sayfanın son satırının (sıralama değeri, SiteID) çifti
+        risk_min/risk_max: RiskScore aralığı (dahil), scanned_from/scanned_to: LastScannedDate aralığı
+        (scanned_to hariç), domain_prefix: Domain öneki
+        Sayfa, sıralama sütununun index'inden (IX_Sites_LastScannedDate, IX_Sites_RiskScore, Domain UNIQUE) okunur;
+        OFFSET kullanılmadığından derin sayfalar da ilk sayfa kadar hızlıdır
+        """
+        column, descending, nullable, param_sql = self._site_list_sort(sort)
+        conditions, params = [], []
+        if risk_min is not None:
+            conditions.append("RiskScore >= ?")
+            params.append(risk_min)
+        if risk_max is not None:
+            conditions.append("RiskScore <= ?")
+            params.append(risk_max)
+        if scanned_from is not None:
+            conditions.append(f"LastScannedDate >= {self.DATETIME_PARAM_SQL}")
+            params.append(scanned_from)
+        if scanned_to is not None:
+            conditions.append(f"LastScannedDate < {self.DATETIME_PARAM_SQL}")
+            params.append(scanned_to)
+        if domain_prefix:
+            # LIKE yerine aralık: SQLite'ta LIKE büyük/küçük harf duyarsız olduğu için index kullanılmaz
+            conditions.append("Domain >= ? AND Domain < ?")
+            params.extend((domain_prefix, prefix_upper_bound(domain_prefix)))
+        direction = 'DESC' if descending else 'ASC'
+        order_sql = f"ORDER BY {column} {direction}, SiteID {direction}"
+        if after is None:
+            return self._query_sites(conditions, params, order_sql, limit)
+        
+        value, site_id = after
+        if value is None:
+            # NULL değerler azalan sıralamada en sonda gelir
+            return self._query_sites(conditions + [f"{column} IS NULL AND SiteID < ?"], params + [site_id],
+                                     order_sql, limit)
+        # Önce sütun üzerinde aralık (index seek, sıralama index'ten), eşit değerlerde SiteID ile devam
+        op = '<' if descending else '>'
+        rows = self._query_sites(
+            conditions + [f"{column} {op}= {param_sql} AND ({column} {op} {param_sql} OR SiteID {op} ?)"],
+            params + [value, value, site_id], order_sql, limit
+        )
+        if nullable and descending and len(rows) < limit:
+            # Değerli satırlar bitti; sayfanın kalanı NULL değerli satırlardan
+            rows += self._query_sites(conditions + [f"{column} IS NULL"], params, order_sql, limit - len(rows))
+        return rows
+    
+    def _query_sites(self, conditions, params, order_sql, limit):
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        page_sql, page_params = self._paginate_sql(limit, 0)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT Domain, SiteName, RiskScore, LastScannedDate, SiteID
+                FROM Sites
+                {where_sql}
+                {order_sql}
+                {page_sql}
+            """, params + page_params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_ranking_rows(self):
+        """
+        Sıralama için tüm sitelerin sayaçları:
+        [(Domain, SiteName, RiskScore, TotalCount, NegativeCount, ResolvedCount, RatingSum, RatingCount)]
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT s.Domain, s.SiteName, s.RiskScore, COALESCE(c.TotalCount, 0), COALESCE(c.NegativeCount, 0),
+                       COALESCE(c.ResolvedCount, 0), COALESCE(c.RatingSum, 0), COALESCE(c.RatingCount, 0)
+                FROM Sites s LEFT JOIN SiteComplaintCounters c ON c.SiteID = s.SiteID
+            """)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_source_identities(self, site_id):
+        """Sitenin süresi dolmamış kaynak tanımlayıcıları: {kaynak: tanımlayıcı}"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT Source, Identifier FROM SourceIdentities
+                WHERE SiteID = ? AND ExpiresDate > {self.NOW_SQL}
+            """, (site_id,))
+            return {row[0]: row[1] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+    
+    def _source_identity_upsert_sql(self):
+        """(SiteID, Source, Identifier, geçerlilik günü) ile tanımlayıcıyı ekleyen veya doğrulayan ifade"""
+        return """
+            MERGE SourceIdentities WITH (HOLDLOCK) AS t
+            USING (VALUES (?, ?, ?, DATEADD(day, ?, GETDATE()))) AS s (SiteID, Source, Identifier, ExpiresDate)
+            ON t.SiteID = s.SiteID AND t.Source = s.Source
+            WHEN MATCHED THEN UPDATE SET
+                ResolvedDate = CASE WHEN t.Identifier = s.Identifier THEN t.ResolvedDate ELSE GETDATE() END,
+                Identifier = s.Identifier, VerifiedDate = GETDATE(), ExpiresDate = s.ExpiresDate
+            WHEN NOT MATCHED THEN INSERT (SiteID, Source, Identifier, ResolvedDate, VerifiedDate, ExpiresDate)
+                VALUES (s.SiteID, s.Source, s.Identifier, GETDATE(), GETDATE(), s.ExpiresDate);
+        """
+    
+    @timed_db_method
+    def save_source_identity(self, site_id, source, identifier, ttl_days):
+        """Kayıt döndüren kaynak tanımlayıcısını kaydet; ttl_days gün boyunca tekrar çözülmez"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(self._source_identity_upsert_sql(), (site_id, source, identifier, ttl_days))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def delete_source_identity(self, site_id, source):
+        """Artık kayıt döndürmeyen tanımlayıcıyı sil (sonraki taramada yeniden çözülür)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("DELETE FROM SourceIdentities WHERE SiteID = ? AND Source = ?", (site_id, source))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_complaint_trend(self, site_id, date_from, date_to, sources=None):
+        """
+        Sitenin günlük şikayet sayıları (ComplaintDailyStats'tan, şikayet sayısından bağımsız)
+        date_from/date_to: date (ikisi de dahil), sources: kaynak adları listesi
+        Gün sırasıyla [{date, total, negative, positive, neutral, resolved, unresolved, sources}] döndürür;
+        aralıktaki şikayet olmayan günler sıfırla doldurulur
+        """
+        params = [site_id, date_from, date_to]
+        source_sql = ''
+        if sources:
+            source_sql = f"AND Source IN ({', '.join('?' for _ in sources)})"
+            params.extend(sources)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT StatDate, Source, Sentiment, IsResolved, ComplaintCount
+                FROM ComplaintDailyStats
+                WHERE SiteID = ? AND StatDate >= ? AND StatDate <= ? {source_sql}
+            """, params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        
+        days = {}
+        day = date_from
+        while day <= date_to:
+            days[day] = {'date': day, 'total': 0, 'negative': 0, 'positive': 0, 'neutral': 0,
+                         'resolved': 0, 'unresolved': 0, 'sources': {}}
+            day += timedelta(days=1)
+        for stat_date, source, sentiment, is_resolved, count in rows:
+            bucket = days[stat_date]
+            bucket['total'] += count
+            if sentiment in ('negative', 'positive'):
+                bucket[sentiment] += count
+            else:
+                bucket['neutral'] += count
+            bucket['resolved' if is_resolved else 'unresolved'] += count
+            bucket['sources'][source] = bucket['sources'].get(source, 0) + count
+        return list(days.values())
+    
+    def _paginate_sql(self, limit, offset):
+        """ORDER BY sonrasına eklenecek sayfalama ifadesi ve parametreleri"""
+        return "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY", [offset, limit]
+    
+    def _has_fulltext_index(self):
+        """Complaints tablosunda aktif full-text index var mı (sonuç önbelleğe alınır)"""
+        status = _fulltext_status.get(self.connection_string)
+        if status is None:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT OBJECTPROPERTY(OBJECT_ID(N'[dbo].[Complaints]'), 'TableHasActiveFulltextIndex')")
+            row = cursor.fetchone()
+            cursor.close()
+            status = bool(row and row[0])
+            _fulltext_status[self.connection_string] = status
+            if not status:
+                logger.warning("Complaints full-text index'i yok, arama LIKE ile yapılacak (yavaş)")
+        return status
+    
+    def _search_condition(self, terms):
+        """
+        Tam metin arama koşulu: (FROM ifadesi, WHERE ifadesi, parametreler, ORDER BY ifadesi)
+        SQL Server: CONTAINS (terimler önek eşleşmesiyle: "kargo*" -> kargoya, kargom...)
+        Sonuçlar en son kaydedilenden eskiye sıralanır (ComplaintID index'i üzerinden, ek sıralama yok)
+        """
+        if self._has_fulltext_index():
+            fulltext_query = ' AND '.join(f'"{term}*"' for term in terms)
+            return "Complaints c", "CONTAINS((c.Title, c.Content), ?)", [fulltext_query], "c.ComplaintID DESC"
+        conditions = ' AND '.join("(c.Title LIKE ? OR c.Content LIKE ?)" for _ in terms)
+        params = []
+        for term in terms:
+            params.extend([f"%{term}%", f"%{term}%"])
+        return "Complaints c", conditions, params, "c.ComplaintID DESC"
+    
+    def _capped_count_sql(self, from_sql):
+        """En fazla ? (son parametre) satır sayan COUNT sorgusu; büyük eşleşmelerde tüm index taranmaz"""
+        return f"SELECT COUNT(*) FROM (SELECT 1 AS x {from_sql} ORDER BY (SELECT NULL) OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY) t"
+    
+    @timed_db_method
+    def search_complaints(self, query, sources=None, date_from=None, date_to=None, limit=20, offset=0,
+                          max_count=None):
+        """
+        Tüm sitelerdeki şikayetlerde tam metin arama
+        sources: kaynak adları listesi, date_from/date_to: Complaints.Date aralığı (date_to hariç)
+        max_count: toplam eşleşme sayımının üst sınırı (varsayılan SEARCH_MAX_COUNT)
+        (sonuç sözlükleri, toplam eşleşme sayısı, toplam sınıra takıldı mı) döndürür
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], 0, False
+        max_count = max_count or SEARCH_MAX_COUNT
+        
+        table_sql, where_sql, params, order_sql = self._search_condition(terms)
+        conditions = [where_sql]
+        if sources:
+            conditions.append(f"c.Source IN ({', '.join('?' for _ in sources)})")
+            params.extend(sources)
+        if date_from is not None:
+            conditions.append("c.Date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("c.Date < ?")
+            params.append(date_to)
+        from_sql = f"FROM {table_sql} WHERE {' AND '.join(conditions)}"
+        
+        cursor = None
+        try:
+            # Sayım sınır+1 satırda durur; sınırı aşan sorgularda toplam "en az max_count" olarak döner
+            cursor = self.conn.cursor()
+            cursor.execute(self._capped_count_sql(from_sql), params + [max_count + 1])
+            total = cursor.fetchone()[0]
+            cursor.close()
+            capped = total > max_count
+            total = min(total, max_count)
+            
+            results = []
+            if total and offset < total:
+                page_sql, page_params = self._paginate_sql(limit, offset)
+                cursor = self.conn.cursor()
+                cursor.execute(f"""
+                    SELECT c.Source, c.Title, c.Content, c.Author, c.Date, c.Rating, c.Sentiment, c.URL, c.IsResolved,
+                           c.ComplaintID, s.Domain, s.SiteName
+                    FROM {table_sql}
+                    JOIN Sites s ON s.SiteID = c.SiteID
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY {order_sql}
+                    {page_sql}
+                """, params + page_params)
+                rows = cursor.fetchall()
+                cursor.close()
+                for row in rows:
+                    result = Complaint.from_row(row[:9]).to_dict()
+                    result['complaint_id'] = row[9]
+                    result['domain'] = row[10]
+                    result['site_name'] = row[11]
+                    results.append(result)
+            return results, total, capped
+        except Exception as e:
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            raise e
+    
+    @timed_db_method
+    def export_complaints(self, after_id, limit, domains=None, sources=None, sentiments=None,
+                          date_from=None, date_to=None):
+        """
+        ComplaintID'si after_id'den büyük en fazla limit şikayet, ComplaintID sırasıyla (keyset sayfalama)
+        domains/sources/sentiments: listeler, date_from/date_to: Complaints.Date aralığı (date_to hariç)
+        Satırlar export.EXPORT_COLUMNS sırasındadır
+        """
+        conditions = ["c.ComplaintID > ?"]
+        params = [after_id]
+        for column, values in (('s.Domain', domains), ('c.Source', sources), ('c.Sentiment', sentiments)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        if date_from is not None:
+            conditions.append("c.Date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("c.Date < ?")
+            params.append(date_to)
+        page_sql, page_params = self._paginate_sql(limit, 0)
+        
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT c.ComplaintID, s.Domain, s.SiteName, c.Source, c.Title, c.Content, c.Author, c.Date,
+                       c.Rating, c.Sentiment, c.URL, c.IsResolved, c.ScrapedDate
+                FROM Complaints c
+                JOIN Sites s ON s.SiteID = c.SiteID
+                WHERE {' AND '.join(conditions)}
+                ORDER BY c.ComplaintID
+                {page_sql}
+            """, params + page_params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    def _claim_job_sql(self):
+        """
+        Kuyruktaki en eski işi 'running' yapıp (JobID, URL, Profile, Attempts) döndüren ifade (parametre: WorkerID)
+        UPDLOCK + READPAST: başka bir worker'ın kilitlediği satır atlanır, aynı iş iki worker'a verilmez
+        """
+        return f"""
+            WITH next_job AS (
+                SELECT TOP (1) * FROM ScrapeJobs WITH (UPDLOCK, READPAST, ROWLOCK)
+                WHERE Status = '{JOB_STATUS_QUEUED}'
+                ORDER BY CreatedDate
+            )
+            UPDATE next_job
+            SET Status = '{JOB_STATUS_RUNNING}', WorkerID = ?, Attempts = Attempts + 1,
+                StartedDate = {self.NOW_SQL}, HeartbeatDate = {self.NOW_SQL}
+            OUTPUT INSERTED.JobID, INSERTED.URL, INSERTED.Profile, INSERTED.Attempts
+        """
+    
+    def _seconds_ago_sql(self):
+        """Veritabanı saatine göre ? saniye önceki zaman ifadesi"""
+        return "DATEADD(second, -?, GETDATE())"
+    
+    def _get_active_job_id(self, domain):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT JobID FROM ScrapeJobs
+                WHERE Domain = ? AND Status IN ('{JOB_STATUS_QUEUED}', '{JOB_STATUS_RUNNING}')
+            """, (domain,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            cursor.close()
+    
+    def _insert_job_or_attach(self, job_id, url, domain, profile, worker_id, attempts):
+        """
+        Domain için aktif iş yoksa yeni iş ekle, varsa onun JobID'sini döndür: (job_id, yeni mi)
+        Tekillik UX_ScrapeJobs_ActiveDomain index'iyle veritabanında sağlanır (süreçler/makineler arası)
+        """
+        if worker_id is None:
+            sql = "INSERT INTO ScrapeJobs (JobID, URL, Domain, Status, Profile, Attempts) VALUES (?, ?, ?, ?, ?, ?)"
+            params = (job_id, url, domain, JOB_STATUS_QUEUED, 1 if profile else 0, attempts)
+        else:
+            sql = f"""
+                INSERT INTO ScrapeJobs (JobID, URL, Domain, Status, Profile, Attempts, WorkerID, StartedDate, HeartbeatDate)
+                VALUES (?, ?, ?, ?, ?, ?, ?, {self.NOW_SQL}, {self.NOW_SQL})
+            """
+            params = (job_id, url, domain, JOB_STATUS_RUNNING, 1 if profile else 0, attempts, worker_id)
+        
+        for _ in range(3):  # Aktif iş INSERT ile SELECT arasında bitebilir; tekrar dene
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                self.conn.commit()
+                return job_id, True
+            except Exception:
+                self.conn.rollback()
+                active_job_id = self._get_active_job_id(domain)
+                if active_job_id is not None:
+                    return active_job_id, False
+                if domain is None:
+                    raise
+            finally:
+                cursor.close()
+        raise RuntimeError(f"{domain} için iş oluşturulamadı")
+    
+    @timed_db_method
+    def enqueue_job(self, job_id, url, domain, profile=False):
+        """
+        Analiz işini kuyruğa ekle; domain için kuyrukta/çalışan iş varsa ona bağlan
+        (job_id, yeni mi) döndürür
+        """
+        return self._insert_job_or_attach(job_id, url, domain, profile, None, 0)
+    
+    @timed_db_method
+    def start_inline_job(self, job_id, url, domain, worker_id, profile=False, attempts=1):
+        """
+        API sürecinde çalışacak analizi doğrudan 'running' olarak kaydet; domain için aktif iş varsa ona bağlan
+        attempts=JOB_MAX_ATTEMPTS verilirse süreç çökünce iş worker'lara kuyruklanmaz, başarısız sayılır
+        (job_id, yeni mi) döndürür
+        """
+        return self._insert_job_or_attach(job_id, url, domain, profile, worker_id, attempts)
+    
+    @timed_db_method
+    def claim_job(self, worker_id):
+        """Sıradaki işi bu worker'a ata; iş yoksa None, varsa {job_id, url, profile, attempts} döndür"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(self._claim_job_sql(), (worker_id,))
+            row = cursor.fetchone()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        if row is None:
+            return None
+        return {'job_id': row[0], 'url': row[1], 'profile': bool(row[2]), 'attempts': row[3]}
+    
+    @timed_db_method
+    def heartbeat_job(self, job_id, worker_id):
+        """Çalışan işin heartbeat zamanını güncelle; iş artık bu worker'da değilse False"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                UPDATE ScrapeJobs SET HeartbeatDate = {self.NOW_SQL}
+                WHERE JobID = ? AND WorkerID = ? AND Status = '{JOB_STATUS_RUNNING}'
+            """, (job_id, worker_id))
+            updated = cursor.rowcount
+            self.conn.commit()
+            return updated > 0
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def complete_job(self, job_id, worker_id, succeeded, result=None, error_message=None):
+        """
+        İşi 'succeeded' veya 'failed' olarak kapat (result JSON olarak saklanır)
+        İş bu arada başka worker'a verildiyse (heartbeat zaman aşımı) dokunulmaz ve False döner
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"""
+                UPDATE ScrapeJobs
+                SET Status = ?, Result = ?, ErrorMessage = ?, FinishedDate = {self.NOW_SQL}, HeartbeatDate = {self.NOW_SQL}
+                WHERE JobID = ? AND WorkerID = ? AND Status = '{JOB_STATUS_RUNNING}'
+            """, (
+                JOB_STATUS_SUCCEEDED if succeeded else JOB_STATUS_FAILED,
+                json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                error_message, job_id, worker_id
+            ))
+            updated = cursor.rowcount
+            self.conn.commit()
+            return updated > 0
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def requeue_stale_jobs(self, stale_after_seconds, max_attempts):
+        """
+        stale_after_seconds boyunca heartbeat gelmeyen 'running' işleri (çöken worker) tekrar kuyruğa al;
+        max_attempts denemeye ulaşmış işler 'failed' olur. (kuyruğa alınan, başarısız sayılan) döndürür
+        """
+        cursor = self.conn.cursor()
+        try:
+            stale_sql = f"Status = '{JOB_STATUS_RUNNING}' AND HeartbeatDate < {self._seconds_ago_sql()}"
+            cursor.execute(f"""
+                UPDATE ScrapeJobs
+                SET Status = '{JOB_STATUS_FAILED}', WorkerID = NULL, FinishedDate = {self.NOW_SQL},
+                    ErrorMessage = 'Worker yanıt vermedi (heartbeat zaman aşımı)'
+                WHERE {stale_sql} AND Attempts >= ?
+            """, (stale_after_seconds, max_attempts))
+            failed = cursor.rowcount
+            cursor.execute(f"""
+                UPDATE ScrapeJobs SET Status = '{JOB_STATUS_QUEUED}', WorkerID = NULL
+                WHERE {stale_sql}
+            """, (stale_after_seconds,))
+            requeued = cursor.rowcount
+            self.conn.commit()
+            return requeued, failed
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @timed_db_method
+    def get_job(self, job_id):
+        """İş durumunu sözlük olarak döndür (yoksa None)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT JobID, URL, Domain, Status, Attempts, WorkerID, CreatedDate, StartedDate,
+                       HeartbeatDate, FinishedDate, Result, ErrorMessage
+                FROM ScrapeJobs WHERE JobID = ?
+            """, (job_id,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if row is None:
+            return None
+        return {
+            'job_id': row[0],
+            'url': row[1],
+            'domain': row[2],
+            'status': row[3],
+            'attempts': row[4],
+            'worker_id': row[5],
+            'created_date': row[6],
+            'started_date': row[7],
+            'heartbeat_date': row[8],
+            'finished_date': row[9],
+            'result': json.loads(row[10]) if row[10] else None,
+            'error': row[11],
+        }
+    
+    @timed_db_method
+    def count_queued_jobs(self):
+        """Kuyrukta bekleyen ('queued') iş sayısı (IX_ScrapeJobs_Status'tan okunur)"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM ScrapeJobs WHERE Status = '{JOB_STATUS_QUEUED}'")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+    
+    @timed_db_method
     def migrate_add_isresolved_column(self):
         """Complaints tablosuna IsResolved sütunu ekle (migration)"""
         cursor = None
@@ -383,4 +1418,296 @@ class Database:
             except:
                 pass
             return False
-
+    
+    @timed_db_method
+    def migrate_add_scraping_telemetry(self):
+        """ScrapingHistory tablosuna telemetri sütunlarını ve ScrapingPageStats tablosunu ekle (migration)"""
+        cursor = None
+        try:
+            columns = [
+                ('DurationMs', 'INT'),
+                ('PagesVisited', 'INT DEFAULT 0'),
+                ('BytesDownloaded', 'BIGINT DEFAULT 0'),
+                ('CacheHit', 'BIT DEFAULT 0'),
+                ('StageTimings', 'NVARCHAR(MAX)'),
+            ]
+            for column, definition in columns:
+                cursor = self.conn.cursor()
+                cursor.execute(f"""
+                    IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[ScrapingHistory]') AND name = '{column}')
+                    BEGIN
+                        ALTER TABLE ScrapingHistory ADD {column} {definition}
+                    END
+                """)
+                cursor.close()
+            
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'[dbo].[ScrapingPageStats]') AND type in (N'U'))
+                CREATE TABLE ScrapingPageStats (
+                    PageStatID INT PRIMARY KEY IDENTITY(1,1),
+                    HistoryID INT FOREIGN KEY REFERENCES ScrapingHistory(HistoryID) ON DELETE CASCADE,
+                    PageNumber INT,
+                    URL NVARCHAR(1000),
+                    StatusCode INT,
+                    Bytes INT DEFAULT 0,
+                    FetchMs INT,
+                    ParseMs INT,
+                    RecordsFound INT DEFAULT 0
+                )
+            """)
+            cursor.close()
+            
+            self.conn.commit()
+            logger.info("✓ Scraping telemetri sütunları başarıyla eklendi")
+            return True
+        except Exception as e:
+            logger.error(f"Scraping telemetri migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_daily_stats(self):
+        """ComplaintDailyStats tablosunu oluştur ve boşsa mevcut şikayetlerden doldur (migration)"""
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(DAILY_STATS_TABLE_SQL)
+            cursor.close()
+            
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                IF NOT EXISTS (SELECT 1 FROM ComplaintDailyStats)
+                INSERT INTO ComplaintDailyStats (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+                SELECT SiteID, CAST(COALESCE(Date, ScrapedDate) AS DATE), Source,
+                       COALESCE(Sentiment, 'neutral'), COALESCE(IsResolved, 0), COUNT(*)
+                FROM Complaints
+                WHERE SiteID IS NOT NULL
+                GROUP BY SiteID, CAST(COALESCE(Date, ScrapedDate) AS DATE), Source,
+                         COALESCE(Sentiment, 'neutral'), COALESCE(IsResolved, 0)
+            """)
+            cursor.close()
+            
+            self.conn.commit()
+            logger.info("✓ ComplaintDailyStats tablosu hazır")
+            return True
+        except Exception as e:
+            logger.error(f"Günlük şikayet sayaçları migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_risk_counters(self):
+        """
+        Sites.RiskModel/ScoreRevision sütunlarını ve SiteComplaintCounters tablosunu ekle,
+        boşsa mevcut şikayetlerden doldur (migration)
+        """
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Sites]') AND name = 'RiskModel')
+                BEGIN
+                    ALTER TABLE Sites ADD RiskModel NVARCHAR(50)
+                END
+                IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[dbo].[Sites]') AND name = 'ScoreRevision')
+                BEGIN
+                    ALTER TABLE Sites ADD ScoreRevision INT NOT NULL CONSTRAINT DF_Sites_ScoreRevision DEFAULT 0
+                END
+            """)
+            cursor.close()
+            
+            cursor = self.conn.cursor()
+            cursor.execute(SITE_COUNTERS_TABLE_SQL)
+            cursor.close()
+            
+            cursor = self.conn.cursor()
+            cursor.execute(SITE_COUNTERS_BACKFILL_SQL)
+            cursor.close()
+            
+            self.conn.commit()
+            logger.info("✓ SiteComplaintCounters tablosu hazır")
+            return True
+        except Exception as e:
+            logger.error(f"Risk sayaçları migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_scrape_jobs(self):
+        """ScrapeJobs iş kuyruğu tablosunu ekle (migration)"""
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(SCRAPE_JOBS_TABLE_SQL)
+            cursor.close()
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"İş kuyruğu migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_source_identities(self):
+        """SourceIdentities tablosunu ekle (migration)"""
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(SOURCE_IDENTITIES_TABLE_SQL)
+            cursor.close()
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Kaynak tanımlayıcıları migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_fulltext_search(self):
+        """Complaints.Title/Content üzerine full-text catalog ve index oluştur (migration)"""
+        cursor = None
+        autocommit = self.conn.autocommit
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')")
+            installed = cursor.fetchone()[0] == 1
+            cursor.close()
+            if not installed:
+                logger.warning("SQL Server Full-Text Search bileşeni kurulu değil, arama LIKE ile yapılacak")
+                return False
+            
+            # Full-text DDL transaction içinde çalıştırılamaz
+            self.conn.autocommit = True
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'ComplaintsCatalog')
+                CREATE FULLTEXT CATALOG ComplaintsCatalog
+            """)
+            cursor.close()
+            
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT name FROM sys.indexes
+                WHERE object_id = OBJECT_ID(N'[dbo].[Complaints]') AND is_primary_key = 1
+            """)
+            key_index = cursor.fetchone()[0]
+            cursor.close()
+            
+            # CHANGE_TRACKING AUTO: yeni eklenen şikayetler index'e otomatik yansır
+            cursor = self.conn.cursor()
+            cursor.execute(f"""
+                IF NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(N'[dbo].[Complaints]'))
+                CREATE FULLTEXT INDEX ON Complaints (Title LANGUAGE 1055, Content LANGUAGE 1055)
+                KEY INDEX [{key_index}] ON ComplaintsCatalog
+                WITH CHANGE_TRACKING AUTO
+            """)
+            cursor.close()
+            _fulltext_status.pop(self.connection_string, None)
+            logger.info("✓ Complaints full-text index'i oluşturuldu")
+            return True
+        except Exception as e:
+            logger.error(f"Full-text index oluşturma hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            return False
+        finally:
+            self.conn.autocommit = autocommit
+    
+    @timed_db_method
+    def migrate_enable_snapshot_isolation(self):
+        """Okuma bağlantılarının SNAPSHOT isolation kullanabilmesi için ALLOW_SNAPSHOT_ISOLATION'ı aç (migration)"""
+        cursor = None
+        autocommit = self.conn.autocommit
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT snapshot_isolation_state FROM sys.databases WHERE name = DB_NAME()")
+            enabled = cursor.fetchone()[0] == 1
+            cursor.close()
+            cursor = None
+            if enabled:
+                return True
+            
+            # ALTER DATABASE transaction içinde çalıştırılamaz; açık transaction'ların bitmesini bekler
+            self.conn.autocommit = True
+            cursor = self.conn.cursor()
+            cursor.execute("ALTER DATABASE CURRENT SET ALLOW_SNAPSHOT_ISOLATION ON")
+            cursor.close()
+            logger.info("✓ ALLOW_SNAPSHOT_ISOLATION açıldı")
+            return True
+        except Exception as e:
+            logger.error(f"Snapshot isolation migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            return False
+        finally:
+            self.conn.autocommit = autocommit
+    
+    @timed_db_method
+    def migrate_add_site_list_indexes(self):
+        """Sites üzerine /api/sites filtre ve sıralama index'lerini ekle (migration)"""
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(SITES_INDEXES_SQL)
+            cursor.close()
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Site listesi index migration hatası: {str(e)}")
+            if cursor:
+                try:
+                    cursor.close()
+                except:
+                    pass
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
@@ -0,0 +1,172 @@
+"""
+Kaynaklar arası yakın-kopya şikayet tespiti (MinHash + LSH).
+
+Aynı müşteri aynı şikayeti Şikayetvar, Trustpilot ve Google'a yazabilir. Her
+kaydın normalize edilmiş metninden kelime ikilisi kümesi çıkarılır ve MinHash
+imzası hesaplanır (tek hash ile bölmeli MinHash: özellik başına bir hash, boş
+bölmeler komşudan doldurulur). İmza DEDUP_BANDS banda bölünür; sadece en az bir
+bandı aynı olan adaylar karşılaştırılır, böylece maliyet kayıt sayısıyla yaklaşık
+doğrusal artar. Adaylar tahmini Jaccard benzerliği eşiği geçerse birleştirilir.
+DEDUP_CROSS_SOURCE_ONLY açıkken bir grupta her kaynaktan en fazla bir kayıt olur:
+A~B ve B~C benzerliği aynı kaynaktaki A ile C'yi B üzerinden birleştirmez.
+"""
+import re
+import unicodedata
+import zlib
+from config import (
+    DEDUP_JACCARD_THRESHOLD, DEDUP_NUM_HASHES, DEDUP_BANDS, DEDUP_MIN_TOKENS, DEDUP_CROSS_SOURCE_ONLY
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_MIX = 0x9E3779B1  # crc32 çıktısını bölmelere dağıtmak için çarpımsal karıştırma
+_EMPTY = -1
+
+
+def normalize_text(text):
+    """Küçük harfe çevir (Türkçe İ/I dahil), noktalamayı at; token listesi döndür"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKC', text).translate(_TURKISH_LOWER).lower()
+    return _TOKEN_RE.findall(text)
+
+
+def shingles(tokens):
+    """Kelime ikilileri kümesi (tek kelimelik metinde kelimenin kendisi)"""
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash_signature(features, num_hashes=None):
+    """Özellik kümesinin MinHash imzası (tuple, uzunluk num_hashes)"""
+    num_hashes = num_hashes or DEDUP_NUM_HASHES
+    bins = [_EMPTY] * num_hashes
+    for feature in features:
+        hashed = (zlib.crc32(feature.encode('utf-8')) * _MIX) & 0xFFFFFFFF
+        index, value = hashed % num_hashes, hashed // num_hashes
+        if bins[index] == _EMPTY or value < bins[index]:
+            bins[index] = value
+    if _EMPTY in bins:
+        if all(value == _EMPTY for value in bins):
+            return tuple(bins)
+        # Boş bölmeyi sağdaki ilk dolu bölmeden doldur; uzaklık değere eklenir ki farklı bölmeler karışmasın
+        filled = list(bins)
+        for index in range(num_hashes):
+            if bins[index] != _EMPTY:
+                continue
+            distance = 1
+            while bins[(index + distance) % num_hashes] == _EMPTY:
+                distance += 1
+            filled[index] = bins[(index + distance) % num_hashes] + (distance << 32)
+        bins = filled
+    return tuple(bins)
+
+
+def estimated_jaccard(signature_a, signature_b):
+    """İki imzanın aynı olan bölme oranı (Jaccard benzerliği tahmini)"""
+    same = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return same / len(signature_a)
+
+
+def complaint_text(complaint):
+    """Karşılaştırmada kullanılan metin (başlık + içerik)"""
+    return f"{complaint.title or ''} {complaint.content or ''}"
+
+
+class _DisjointSet:
+    def __init__(self, size, sources=None):
+        self.parent = list(range(size))
+        # Kök -> gruptaki kaynaklar (sadece kaynaklar arası birleştirmede tutulur)
+        self.sources = [{source} for source in sources] if sources is not None else None
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        # Listede önce gelen kayıt grubun temsilcisi olur
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.sources is not None:
+            self.sources[root_a] |= self.sources[root_b]
+
+    def can_union(self, a, b):
+        """Kaynaklar arası modda iki grubun ortak kaynağı yoksa True"""
+        if self.sources is None:
+            return True
+        return self.sources[self.find(a)].isdisjoint(self.sources[self.find(b)])
+
+
+def find_duplicate_groups(complaints, threshold=None, num_hashes=None, bands=None,
+                          min_tokens=None, cross_source_only=None):
+    """
+    Yakın-kopya grupları bul.
+    Dönüş: {temsilci indeksi: [kopya indeksleri]} (temsilci = gruptaki ilk kayıt)
+    """
+    threshold = DEDUP_JACCARD_THRESHOLD if threshold is None else threshold
+    num_hashes = num_hashes or DEDUP_NUM_HASHES
+    bands = bands or DEDUP_BANDS
+    min_tokens = DEDUP_MIN_TOKENS if min_tokens is None else min_tokens
+    cross_source_only = DEDUP_CROSS_SOURCE_ONLY if cross_source_only is None else cross_source_only
+    if num_hashes % bands:
+        raise ValueError(f"DEDUP_NUM_HASHES ({num_hashes}) DEDUP_BANDS ({bands}) ile tam bölünmeli")
+    rows = num_hashes // bands
+
+    signatures = []
+    for complaint in complaints:
+        tokens = normalize_text(complaint_text(complaint))
+        signatures.append(minhash_signature(shingles(tokens), num_hashes) if len(tokens) >= min_tokens else None)
+
+    sets = _DisjointSet(len(complaints), [c.source for c in complaints] if cross_source_only else None)
+    buckets = {}
+    exact = {}  # Birebir aynı imza -> ilk indeks (aynı metnin kopyaları bant taramasına girmez)
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        first = exact.get(signature)
+        if first is not None and sets.can_union(first, index):
+            sets.union(first, index)
+            continue
+        exact.setdefault(signature, index)
+
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            members = buckets.setdefault(key, [])
+            for other in members:
+                if sets.find(other) == sets.find(index) or not sets.can_union(other, index):
+                    continue
+                if estimated_jaccard(signature, signatures[other]) >= threshold:
+                    sets.union(other, index)
+            members.append(index)
+
+    groups = {}
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        root = sets.find(index)
+        if root != index:
+            groups.setdefault(root, []).append(index)
+    return groups
+
+
+def collapse_duplicates(complaints, **options):
+    """
+    Yakın-kopyaları birleştir: her gruptan sadece temsilci kalır.
+    Dönüş: (tekilleştirilmiş liste, [(temsilci, [kopya Complaint'ler]), ...])
+    """
+    groups = find_duplicate_groups(complaints, **options)
+    if not groups:
+        return complaints, []
+    duplicate_indexes = {index for members in groups.values() for index in members}
+    unique = [c for index, c in enumerate(complaints) if index not in duplicate_indexes]
+    links = [(complaints[root], [complaints[index] for index in members]) for root, members in sorted(groups.items())]
+    return unique, links
@@ -0,0 +1,250 @@
+"""
+Şikayetlerin analitik için toplu dışa aktarımı (CSV / Parquet).
+
+GET /api/export ve komut satırı aynı kodu kullanır. Şikayetler ComplaintID üzerinden
+keyset sayfalamayla EXPORT_CHUNK_SIZE satırlık parçalar halinde okunur (OFFSET
+taraması ve açık kalan cursor yok) ve her parça okunduğu anda yazılır; bellek
+kullanımı toplam satır sayısından bağımsızdır. Okumalar okuma pool'undan (varsa
+SQL_READ_CONNECTION_STRING replikası) yapılır.
+
+Parquet için pyarrow gerekir; her parça ayrı bir row group olarak yazılır. pyarrow ilk
+Parquet dışa aktarımında import edilir (API başlangıç süresine eklenmez).
+
+Kullanım (backend dizininden):
+    python -m export --format csv --output sikayetler.csv
+    python -m export --format parquet --output sikayetler.parquet --source trustpilot --from 2024-01-01
+"""
+import argparse
+import csv
+import importlib.util
+import io
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from config import EXPORT_CHUNK_SIZE
+from database import create_database
+from metrics import EXPORT_ROWS
+
+logger = logging.getLogger(__name__)
+
+# Database.export_complaints satır sırası
+EXPORT_COLUMNS = (
+    'complaint_id', 'domain', 'site_name', 'source', 'title', 'content', 'author', 'date',
+    'rating', 'sentiment', 'url', 'is_resolved', 'scraped_date'
+)
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+_RESOLVED_INDEX = EXPORT_COLUMNS.index('is_resolved')
+
+
+def parquet_available():
+    """pyarrow kurulu mu (import etmeden; Parquet opsiyonel, CSV her zaman çalışır)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+class ExportStats:
+    """Yazılan satır/byte sayısı ve hız"""
+
+    def __init__(self, export_format):
+        self.format = export_format
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f"{self.rows} satır, {self.bytes / 1024 / 1024:.1f} MB, "
+                f"{self.elapsed:.1f} sn ({self.rows_per_second:.0f} satır/sn)")
+
+
+def iter_chunks(db, chunk_size=EXPORT_CHUNK_SIZE, **filters):
+    """Filtrelere uyan şikayetleri en fazla chunk_size satırlık listeler halinde üret"""
+    after_id = 0
+    while True:
+        rows = db.export_complaints(after_id, chunk_size, **filters)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1][0]
+
+
+def _normalize(row):
+    row = list(row)
+    if row[_RESOLVED_INDEX] is not None:
+        row[_RESOLVED_INDEX] = bool(row[_RESOLVED_INDEX])
+    return row
+
+
+def write_csv(chunks, stats):
+    """Parçaları CSV byte'larına çevir (başlık satırı + parça başına bir blok)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows(_normalize(row) for row in rows)
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        stats.rows += len(rows)
+        stats.bytes += len(data)
+        yield data
+    data = buffer.getvalue().encode('utf-8')  # Hiç satır yoksa sadece başlık
+    if data:
+        stats.bytes += len(data)
+        yield data
+
+
+def _parquet_schema(pa):
+    return pa.schema([
+        ('complaint_id', pa.int64()),
+        ('domain', pa.string()),
+        ('site_name', pa.string()),
+        ('source', pa.string()),
+        ('title', pa.string()),
+        ('content', pa.string()),
+        ('author', pa.string()),
+        ('date', pa.timestamp('us')),
+        ('rating', pa.int32()),
+        ('sentiment', pa.string()),
+        ('url', pa.string()),
+        ('is_resolved', pa.bool_()),
+        ('scraped_date', pa.timestamp('us')),
+    ])
+
+
+class _ChunkSink:
+    """ParquetWriter'ın yazdığı byte'ları biriktiren, her row group sonrası boşaltılan dosya nesnesi"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def write_parquet(chunks, stats):
+    """Parçaları Parquet byte'larına çevir (parça başına bir row group; footer en sonda)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet dışa aktarımı için pyarrow gerekli (pip install pyarrow)")
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for rows in chunks:
+            columns = list(zip(*(_normalize(row) for row in rows)))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+            ))
+            data = sink.drain()
+            stats.rows += len(rows)
+            stats.bytes += len(data)
+            yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    stats.bytes += len(data)
+    yield data
+
+
+WRITERS = {'csv': write_csv, 'parquet': write_parquet}
+
+
+def export_complaints(export_format, chunk_size=EXPORT_CHUNK_SIZE, stats=None, progress=None, **filters):
+    """
+    Filtrelere uyan şikayetleri export_format (csv/parquet) byte parçaları olarak üret
+    filters: domains, sources, sentiments (listeler), date_from, date_to (date_to hariç)
+    progress: her parçadan sonra ExportStats ile çağrılır
+    Kendi okuma bağlantısını açar ve generator bitince (veya kapatılınca) kapatır
+    """
+    stats = stats or ExportStats(export_format)
+    db = create_database(use_pool=False, read_only=True)  # Uzun süren okuma pool bağlantısını tutmasın
+    if not db.connect():
+        raise RuntimeError('Veritabanı bağlantı hatası')
+    try:
+        for data in WRITERS[export_format](iter_chunks(db, chunk_size, **filters), stats):
+            yield data
+            if progress:
+                progress(stats)
+    finally:
+        db.close(force=True)
+        EXPORT_ROWS.inc(stats.rows, format=export_format)
+        logger.info(f"Dışa aktarım ({export_format}): {stats.summary()}")
+
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Şikayetleri CSV veya Parquet olarak dışa aktar")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+    parser.add_argument('--output', required=True, help="Çıktı dosyası ('-' = stdout, sadece CSV)")
+    parser.add_argument('--domain', action='append', default=[], help="Site domain'i (tekrarlanabilir)")
+    parser.add_argument('--source', action='append', default=[], help="Kaynak (tekrarlanabilir)")
+    parser.add_argument('--sentiment', action='append', default=[], help="positive/negative/neutral (tekrarlanabilir)")
+    parser.add_argument('--from', dest='date_from', type=_parse_date, help="Şikayet tarihi başlangıcı (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', type=_parse_date, help="Şikayet tarihi bitişi (YYYY-MM-DD, dahil)")
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.output == '-' and args.format != 'csv':
+        parser.error("stdout'a sadece CSV yazılabilir")
+    if args.format == 'parquet' and not parquet_available():
+        parser.error("Parquet dışa aktarımı için pyarrow gerekli (pip install pyarrow)")
+
+    def report(stats):
+        print(f"\r{stats.rows} satır ({stats.rows_per_second:.0f} satır/sn)", end='', file=sys.stderr, flush=True)
+
+    stats = ExportStats(args.format)
+    chunks = export_complaints(
+        args.format, chunk_size=args.chunk_size, stats=stats, progress=report,
+        domains=args.domain, sources=args.source, sentiments=args.sentiment, date_from=args.date_from,
+        date_to=args.date_to + timedelta(days=1) if args.date_to else None
+    )
+    if args.output == '-':
+        for data in chunks:
+            sys.stdout.buffer.write(data)
+    else:
+        with open(args.output, 'wb') as f:
+            for data in chunks:
+                f.write(data)
+    print(f"\n✓ {stats.summary()}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
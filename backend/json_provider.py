@@ -0,0 +1,61 @@
+from flask.json.provider import DefaultJSONProvider
+from datetime import date, datetime
+from decimal import Decimal
+import logging
+from models import Complaint
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """orjson'un doğrudan desteklemediği tipler (Decimal, Complaint) ve stdlib json için dönüşüm"""
+    if isinstance(obj, Complaint):
+        return obj.to_dict()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson varsa onu, yoksa stdlib json'u kullanan JSON provider.
+
+    datetime değerleri her iki durumda da ISO 8601 formatında yazılır; böylece
+    satır başına .isoformat() çağrısına gerek kalmaz.
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False  # Türkçe karakterler \\uXXXX yerine UTF-8 olarak yazılır
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # orjson bytes üretir, str'e çevirmeden doğrudan yanıt gövdesi olarak kullan
+        body = orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    """Uygulamaya hızlı JSON provider'ı bağla"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    if orjson is None:
+        logger.warning("orjson yüklü değil, standart json kullanılıyor (pip install orjson)")
@@ -0,0 +1,248 @@
+"""
+Prometheus metin formatında metrikler (harici bağımlılık olmadan).
+
+Metrikler süreç içinde tutulur; /api/metrics endpoint'i render() çıktısını döndürür.
+Birden fazla worker süreci çalıştırılıyorsa her süreç kendi metriklerini raporlar.
+"""
+import threading
+import time
+import functools
+from contextlib import contextmanager
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} için etiketler hatalı: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç"""
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        with self._lock:
+            return dict(self._values)
+
+    def _render_samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.values().items())]
+
+
+class Gauge(_Metric):
+    """Anlık değer; callback verilirse değer render sırasında hesaplanır"""
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+        self._callback = callback
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_callback(self, callback):
+        """callback() -> {etiket_tuple: değer} veya tek sayı"""
+        self._callback = callback
+
+    def values(self):
+        if self._callback:
+            try:
+                result = self._callback()
+            except Exception:
+                return {}
+            if isinstance(result, dict):
+                return result
+            return {(): result}
+        with self._lock:
+            if not self._values and not self.labelnames:
+                return {(): 0}
+            return dict(self._values)
+
+    def _render_samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.values().items())]
+
+
+class Histogram(_Metric):
+    """Kümülatif bucket'lı histogram"""
+    metric_type = 'histogram'
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series = {}  # key -> [bucket_counts, sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Blok süresini ölç ve gözlemle"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_samples(self):
+        with self._lock:
+            series = {key: (list(s[0]), s[1], s[2]) for key, s in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render():
+    """Tüm metrikleri Prometheus metin formatında döndür"""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Uygulama metrikleri
+# ---------------------------------------------------------------------------
+
+SCRAPE_DURATION = Histogram(
+    'scrape_duration_seconds', 'Kaynak bazında scraping süresi (saniye)', ['source'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+)
+SCRAPE_PAGES = Counter('scrape_pages_fetched_total', 'Kaynak bazında indirilen sayfa sayısı', ['source'])
+SCRAPE_BYTES = Counter('scrape_bytes_downloaded_total', 'Kaynak bazında indirilen byte miktarı', ['source'])
+SCRAPE_HTTP_RESPONSES = Counter(
+    'scrape_http_responses_total', 'Kaynak ve HTTP durum koduna göre yanıt sayısı', ['source', 'status']
+)
+SCRAPE_BYTES_SAVED = Counter(
+    'scrape_not_modified_bytes_total', '304 yanıtıyla indirilmeyip cache\'den okunan byte miktarı', ['source']
+)
+SCRAPE_CACHE_REQUESTS = Counter(
+    'scrape_cache_requests_total', 'Scraper cache sorguları (hit/negative_hit/miss)', ['source', 'result']
+)
+SCRAPE_CIRCUIT_STATE = Gauge(
+    'scraper_circuit_state', 'Kaynak devre kesici durumu (0 = kapalı, 1 = yarı açık, 2 = açık)', ['source']
+)
+SCRAPE_CIRCUIT_SKIPS = Counter(
+    'scraper_circuit_skips_total', 'Devre açık olduğu için atlanan kaynak çalışması sayısı', ['source']
+)
+SCRAPE_CIRCUIT_TRANSITIONS = Counter(
+    'scraper_circuit_transitions_total', 'Devre kesici durum geçişleri', ['source', 'state']
+)
+SELENIUM_STARTUP = Histogram(
+    'selenium_driver_startup_seconds', 'Selenium WebDriver başlatma süresi (saniye)',
+    buckets=(0.5, 1, 2, 3, 5, 10, 20, 30, 60)
+)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds', 'Database metodu bazında sorgu süresi (saniye)', ['method']
+)
+DB_POOL_CONNECTIONS = Gauge('db_pool_connections', "Pool'daki açık bağlantı sayısı")
+DB_POOL_IN_USE = Gauge('db_pool_connections_in_use', 'Şu anda kullanımda olan bağlantı sayısı')
+ANALYSIS_IN_PROGRESS = Gauge('analysis_jobs_in_progress', 'Çalışmakta olan site analizi sayısı')
+SCRAPE_JOBS_QUEUED = Gauge('scrape_jobs_queued', "ScrapeJobs kuyruğunda bekleyen (Status = 'queued') iş sayısı")
+EXPORT_ROWS = Counter('export_rows_total', 'Dışa aktarılan şikayet satırı sayısı', ['format'])
+
+
+def _cache_hit_ratio():
+    hits = {}
+    totals = {}
+    for (source, result), value in SCRAPE_CACHE_REQUESTS.values().items():
+        totals[source] = totals.get(source, 0) + value
+        if result in ('hit', 'negative_hit'):
+            hits[source] = hits.get(source, 0) + value
+    return {(source,): hits.get(source, 0) / total for source, total in totals.items() if total}
+
+
+SCRAPE_CACHE_HIT_RATIO = Gauge(
+    'scrape_cache_hit_ratio', 'Kaynak bazında cache isabet oranı', ['source'], callback=_cache_hit_ratio
+)
+
+
+def timed_db_method(func):
+    """Database metodlarının süresini DB_QUERY_DURATION histogramına yaz"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with DB_QUERY_DURATION.time(method=func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,65 @@
+"""
+Scraper'lar, ScraperService, cache ve API arasında taşınan kayıt tipleri.
+
+Şikayetler toplu taramalarda yüz binlerce adet tutulabildiği için sözlük yerine
+__slots__'lu sınıf kullanılır (nesne başına __dict__ yok). JSON'a dönüşüm
+sadece yanıt sınırında yapılır (json_provider Complaint'i to_dict() ile yazar).
+"""
+
+
+class Complaint:
+    """Tek bir şikayet/yorum kaydı"""
+
+    # JSON ve veritabanı alan sırası
+    FIELDS = ('source', 'title', 'content', 'author', 'date', 'rating', 'sentiment', 'url', 'is_resolved')
+
+    __slots__ = FIELDS + ('cached',)
+
+    def __init__(self, title='', content='', author='', date=None, rating=None, sentiment='neutral',
+                 url='', is_resolved=False, source=None, cached=False):
+        self.source = source
+        self.title = title
+        self.content = content
+        self.author = author
+        self.date = date  # datetime veya None
+        self.rating = rating
+        self.sentiment = sentiment
+        self.url = url
+        self.is_resolved = is_resolved
+        self.cached = cached  # Dosya cache'inden geldiyse DB'ye tekrar kaydedilmez
+
+    @classmethod
+    def from_dict(cls, data):
+        """Sözlükten Complaint oluştur (bilinmeyen anahtarlar yok sayılır)"""
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+    @classmethod
+    def from_row(cls, row):
+        """FIELDS sırasındaki veritabanı satırından Complaint oluştur"""
+        source, title, content, author, date, rating, sentiment, url, is_resolved = row
+        return cls(title, content, author, date, rating, sentiment, url,
+                   bool(is_resolved) if is_resolved is not None else False, source)
+
+    def to_dict(self):
+        """JSON yanıtı için sözlük"""
+        return {
+            'source': self.source,
+            'title': self.title,
+            'content': self.content,
+            'author': self.author,
+            'date': self.date,
+            'rating': self.rating,
+            'sentiment': self.sentiment,
+            'url': self.url,
+            'is_resolved': self.is_resolved,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, Complaint):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Complaint(source={self.source!r}, title={self.title!r}, sentiment={self.sentiment!r})"
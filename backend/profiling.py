@@ -0,0 +1,94 @@
+"""
+Analiz bazında cProfile kaydı.
+
+Profil dosyaları PROFILE_DIR altında "<zaman>_<job_id>_<domain>.prof" adıyla yazılır;
+snakeviz, flameprof veya `python -m pstats` ile açılabilir.
+"""
+import cProfile
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from config import PROFILE_ANALYSIS, PROFILE_DIR, PROFILE_KEEP
+
+logger = logging.getLogger(__name__)
+
+# cProfile aynı anda tek profiler'ı güvenilir şekilde destekler; eşzamanlı analizler profilsiz çalışır
+_profile_lock = threading.Lock()
+_PROFILE_NAME_RE = re.compile(r'^[\w.\-]+\.prof$')
+
+
+def is_profiling_requested(flag=None):
+    """Env değişkeni veya istek bayrağına göre profil alınıp alınmayacağını belirle"""
+    if flag is None:
+        return PROFILE_ANALYSIS
+    if isinstance(flag, str):
+        return flag.lower() in ('1', 'true', 'yes')
+    return bool(flag)
+
+
+def _profile_filename(job_id, domain):
+    clean_domain = re.sub(r'[^\w.\-]', '_', domain or 'unknown')
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return f"{timestamp}_{job_id}_{clean_domain}.prof"
+
+
+def run_profiled(job_id, domain, func, *args, **kwargs):
+    """func'ı cProfile altında çalıştır; (sonuç, profil dosya adı) döndür"""
+    if not _profile_lock.acquire(blocking=False):
+        logger.warning(f"Başka bir analiz profilleniyor, {domain} profilsiz çalıştırılıyor")
+        return func(*args, **kwargs), None
+
+    profiler = cProfile.Profile()
+    filename = _profile_filename(job_id, domain)
+    try:
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                profiler.dump_stats(os.path.join(PROFILE_DIR, filename))
+                logger.info(f"Profil kaydedildi: {filename}")
+                _prune_profiles()
+            except Exception as e:
+                logger.error(f"Profil kaydetme hatası: {str(e)}")
+                filename = None
+    finally:
+        _profile_lock.release()
+    return result, filename
+
+
+def list_profiles():
+    """Kayıtlı profilleri en yeniden eskiye listele"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(PROFILE_DIR):
+        if not _PROFILE_NAME_RE.match(name):
+            continue
+        path = os.path.join(PROFILE_DIR, name)
+        stat = os.stat(path)
+        profiles.append({
+            'name': name,
+            'size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_mtime),
+        })
+    profiles.sort(key=lambda p: p['created'], reverse=True)
+    return profiles
+
+
+def is_valid_profile_name(name):
+    """Dosya adının profil dizini dışına çıkmadığını doğrula"""
+    return bool(_PROFILE_NAME_RE.match(name)) and os.path.isfile(os.path.join(PROFILE_DIR, name))
+
+
+def _prune_profiles():
+    """PROFILE_KEEP sayısını aşan eski profilleri sil"""
+    for profile in list_profiles()[PROFILE_KEEP:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, profile['name']))
+        except OSError:
+            pass
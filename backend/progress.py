@@ -0,0 +1,217 @@
+"""
+Çalışan analizlerin ilerleme olayları (GET /api/jobs/<job_id>/events, Server-Sent Events).
+
+Analiz bu süreçte çalışırken ScraperService ve scraper'lar progress.report() ile olay
+yayınlar (kaynak başladı/bitti, sayfa indirildi, kayıt bulundu, veritabanına kaydedildi).
+Olaylar iş başına bellekte tutulur (ProgressHub); açık stream'ler bir Condition üzerinde
+bekler, veritabanına gitmez. Yüzlerce stream CPU harcamadan açık kalabilir; her biri
+sadece bir bekleyen sunucu thread'i tutar.
+
+Başka bir süreçte çalışan işler (scraper_worker, diğer API süreçleri) için iş başına tek
+bir arka plan thread'i ScrapeJobs durumunu izler ve durum değişikliklerini tüm
+abonelere yayınlar.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from config import WORKER_POLL_INTERVAL, SSE_EVENT_BUFFER, SSE_RETENTION_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Akışı sonlandıran olaylar
+TERMINAL_EVENTS = ('result', 'error')
+
+
+class _Channel:
+    """Tek bir işin olay geçmişi ve bekleyen aboneleri"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.events = []  # (id, olay adı, veri); en fazla SSE_EVENT_BUFFER olay tutulur
+        self.next_id = 1
+        self.updated_at = time.monotonic()
+        self.closed_at = None
+        self.subscribers = 0
+        self.condition = threading.Condition()
+
+    @property
+    def closed(self):
+        return self.closed_at is not None
+
+
+class ProgressHub:
+    """Süreç içi iş -> olay kanalı kaydı"""
+
+    def __init__(self, buffer_size=SSE_EVENT_BUFFER, retention_seconds=SSE_RETENTION_SECONDS):
+        self.buffer_size = buffer_size
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._domains = {}  # domain -> bu süreçte çalışan işin JobID'si
+        self._watchers = set()  # Durumu veritabanından izlenen işler
+
+    def _prune(self):
+        # Bitmiş veya sahipsiz (izleyicisi kalmamış uzak iş) kanallar retention süresi sonra silinir
+        now = time.monotonic()
+        running = set(self._domains.values())
+        for job_id, channel in list(self._channels.items()):
+            if channel.subscribers or job_id in running or now - channel.updated_at <= self.retention_seconds:
+                continue
+            del self._channels[job_id]
+
+    def _channel(self, job_id, create=True):
+        with self._lock:
+            channel = self._channels.get(job_id)
+            if channel is None and create:
+                self._prune()
+                channel = self._channels[job_id] = _Channel(job_id)
+            return channel
+
+    def open(self, job_id, domain=None):
+        """Bu süreçte başlayan iş için kanal aç"""
+        self._channel(job_id)
+        if domain:
+            with self._lock:
+                self._domains[domain] = job_id
+
+    def active_job(self, domain):
+        """Domain için bu süreçte çalışan işin JobID'si (yoksa None)"""
+        with self._lock:
+            job_id = self._domains.get(domain)
+            channel = self._channels.get(job_id) if job_id else None
+            return job_id if channel is not None and not channel.closed else None
+
+    def needs_watch(self, job_id):
+        """İşin olayları bu süreçte üretilmiyorsa (başka süreçte çalışıyor) True"""
+        with self._lock:
+            channel = self._channels.get(job_id)
+            if channel is None:
+                return True
+            return not channel.closed and job_id not in self._domains.values()
+
+    def publish(self, job_id, event, data=None):
+        """Olayı kanala ekle ve bekleyen stream'leri uyandır; akış bitmişse yok sayılır"""
+        channel = self._channel(job_id)
+        with channel.condition:
+            if channel.closed:
+                return
+            channel.events.append((channel.next_id, event, data or {}))
+            channel.next_id += 1
+            channel.updated_at = time.monotonic()
+            if len(channel.events) > self.buffer_size:
+                # Eski sayfa olaylarını at; ilk olay (iş başladı) korunur
+                del channel.events[1:len(channel.events) - self.buffer_size + 1]
+            if event in TERMINAL_EVENTS:
+                channel.closed_at = time.monotonic()
+                with self._lock:
+                    self._domains = {d: j for d, j in self._domains.items() if j != job_id}
+            channel.condition.notify_all()
+
+    def subscribe(self, job_id, last_event_id=0, keepalive=15):
+        """
+        (id, olay adı, veri) üreten generator; keepalive saniye olay gelmezse None üretir
+        last_event_id: yeniden bağlanan istemcinin son aldığı olay (Last-Event-ID)
+        Sonlandırıcı olay (result/error) üretildikten sonra biter
+        """
+        channel = self._channel(job_id)
+        with channel.condition:
+            channel.subscribers += 1
+        try:
+            while True:
+                with channel.condition:
+                    pending = [item for item in channel.events if item[0] > last_event_id]
+                    if not pending:
+                        if channel.closed:
+                            return
+                        channel.condition.wait(keepalive)
+                        pending = [item for item in channel.events if item[0] > last_event_id]
+                if not pending:
+                    yield None
+                    continue
+                for item in pending:
+                    last_event_id = item[0]
+                    yield item
+                    if item[1] in TERMINAL_EVENTS:
+                        return
+        finally:
+            with channel.condition:
+                channel.subscribers -= 1
+
+    def watch_job(self, job_id, create_db, poll_interval=WORKER_POLL_INTERVAL):
+        """
+        Başka bir süreçte çalışan işin durumunu izle (iş başına tek thread, abone kalmayınca durur)
+        Durum değişiklikleri 'status', bitiş 'result'/'error' olayı olarak yayınlanır
+        """
+        with self._lock:
+            if job_id in self._watchers:
+                return
+            self._watchers.add(job_id)
+        channel = self._channel(job_id)
+        thread = threading.Thread(target=self._watch, args=(channel, create_db, poll_interval),
+                                  name=f"progress-{job_id}", daemon=True)
+        thread.start()
+
+    def _watch(self, channel, create_db, poll_interval):
+        from database import JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED
+        job_id = channel.job_id
+        db = create_db()
+        last_status = None
+        idle_polls = 0
+        try:
+            # Stream generator'ı abone sayısını ilk okumada artırır; art arda iki turda abone yoksa dur
+            while idle_polls < 2 and not channel.closed:
+                idle_polls = idle_polls + 1 if channel.subscribers == 0 else 0
+                try:
+                    if db.conn is None and not db.connect():
+                        time.sleep(poll_interval)
+                        continue
+                    job = db.get_job(job_id)
+                except Exception as e:
+                    logger.error(f"{job_id}: iş durumu okunamadı: {str(e)}")
+                    db.close(force=True)
+                    time.sleep(poll_interval)
+                    continue
+                if job is None:
+                    self.publish(job_id, 'error', {'job_id': job_id, 'error': 'İş bulunamadı'})
+                    break
+                if job['status'] != last_status:
+                    last_status = job['status']
+                    self.publish(job_id, 'status', {
+                        'job_id': job_id, 'status': last_status, 'attempts': job['attempts'], 'worker_id': job['worker_id']
+                    })
+                if last_status == JOB_STATUS_SUCCEEDED:
+                    self.publish(job_id, 'result', job['result'] or {'success': True, 'job_id': job_id})
+                    break
+                if last_status == JOB_STATUS_FAILED:
+                    self.publish(job_id, 'error', {'job_id': job_id, 'error': job['error'] or 'Analiz başarısız'})
+                    break
+                time.sleep(poll_interval)
+        finally:
+            db.close(force=True)
+            with self._lock:
+                self._watchers.discard(job_id)
+
+
+hub = ProgressHub()
+
+# Analizi çalıştıran thread'in iş kimliği (scraper'lar ve ScraperService olayları bu işe yayınlar)
+_current = threading.local()
+
+
+@contextmanager
+def bind(job_id):
+    """with bloğu içinde bu thread'den yapılan report() çağrılarını job_id kanalına yönlendir"""
+    previous = getattr(_current, 'job_id', None)
+    _current.job_id = job_id
+    try:
+        yield
+    finally:
+        _current.job_id = previous
+
+
+def report(event, **data):
+    """Bu thread'e bağlı işe ilerleme olayı yayınla (bağlı iş yoksa hiçbir şey yapmaz)"""
+    job_id = getattr(_current, 'job_id', None)
+    if job_id is not None:
+        hub.publish(job_id, event, data)
@@ -0,0 +1,150 @@
+"""
+Siteler arası risk sıralaması ve yüzdelikler (GET /api/rankings).
+
+Site başına sayaçlar (Sites.RiskScore + SiteComplaintCounters) tek sorguyla okunup
+NumPy dizilerine yüklenir; risk skoru, negatif oran, çözüm oranı ve ortalama puanın
+yüzdelikleri ve z-skorları tüm siteler için vektörel hesaplanır (site başına Python
+döngüsü yok). Sonuç site listesinin sürümü (site sayısı, en son tarama zamanı
+ve skor revizyonları) değişene, yani bir sonraki tarama veya yeniden skorlama bitene
+kadar bellekte tutulur; her istek sadece sürüm sorgusunu çalıştırır. Sürüm veritabanından
+okunduğu için başka süreçte yapılan yeniden skorlama da tüm süreçlerin sonucunu yeniler.
+
+NumPy ilk sıralama isteğinde import edilir (API başlangıç süresine eklenmez).
+"""
+import threading
+from datetime import datetime
+from config import RANKING_MIN_COMPLAINTS
+
+# Sıralanabilen metrikler -> yüksek değer daha mı riskli (varsayılan sıralama yönü)
+METRICS = {
+    'risk_score': True,
+    'negative_ratio': True,
+    'resolution_rate': False,
+    'average_rating': False,
+}
+SUMMARY_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def _float(value):
+    """NumPy değerini JSON'a yazılabilir float'a çevir (NaN -> None)"""
+    value = float(value)
+    return None if value != value else round(value, 4)
+
+
+class SiteRankings:
+    """Tüm sitelerin metrikleri, yüzdelikleri ve z-skorları"""
+
+    def __init__(self, rows, version=None, min_complaints=RANKING_MIN_COMPLAINTS):
+        import numpy as np
+
+        self.version = version
+        self.computed_at = datetime.now()
+        self.count = len(rows)
+        columns = list(zip(*rows)) if rows else [()] * 8
+        self.domains = list(columns[0])
+        self.site_names = list(columns[1])
+        self._index = {domain: i for i, domain in enumerate(self.domains)}
+
+        risk_score, total, negative, resolved, rating_sum, rating_count = (
+            np.array(column, dtype=np.float64) for column in columns[2:8]
+        )
+        self.total = total
+        min_complaints = max(1, min_complaints)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Az şikayeti olan sitelerin oranları NaN: sıralamaya ve dağılım istatistiklerine katılmaz
+            enough = total >= min_complaints
+            self.values = {
+                'risk_score': risk_score,
+                'negative_ratio': np.where(enough, negative / total, np.nan),
+                'resolution_rate': np.where(enough, resolved / total, np.nan),
+                'average_rating': np.where(rating_count >= min_complaints, rating_sum / rating_count, np.nan),
+            }
+
+        self.percentiles = {}
+        self.z_scores = {}
+        self.summary = {}
+        for metric, values in self.values.items():
+            missing = np.isnan(values)
+            valid = np.sort(values[~missing])
+            # Yüzdelik: değeri bu sitenin değerine eşit veya küçük sitelerin oranı (0-100)
+            percentile = np.searchsorted(valid, values, side='right') * (100.0 / max(len(valid), 1))
+            percentile[missing] = np.nan
+            mean = valid.mean() if len(valid) else np.nan
+            std = valid.std() if len(valid) else np.nan
+            if std > 0:
+                z_score = (values - mean) / std
+            else:
+                z_score = np.where(missing, np.nan, 0.0)
+            quantiles = np.percentile(valid, SUMMARY_PERCENTILES) if len(valid) else [np.nan] * len(SUMMARY_PERCENTILES)
+            self.percentiles[metric] = percentile
+            self.z_scores[metric] = z_score
+            self.summary[metric] = {
+                'sites': int(len(valid)),
+                'mean': _float(mean),
+                'std': _float(std),
+                'percentiles': {f"p{p}": _float(v) for p, v in zip(SUMMARY_PERCENTILES, quantiles)},
+            }
+
+        # Risk sırası: 1 = en riskli; eşit skorlu siteler aynı sırayı alır
+        scores = np.nan_to_num(risk_score, nan=-np.inf)
+        self.risk_rank = self.count - np.searchsorted(np.sort(scores), scores, side='right') + 1
+        self._orders = {}
+
+    def _order(self, metric, descending):
+        """metric'e göre sıralı site indeksleri (NaN değerli siteler hariç)"""
+        import numpy as np
+
+        key = (metric, descending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self.values[metric]
+            order = np.argsort(-values if descending else values, kind='stable')
+            order = order[:int(np.count_nonzero(~np.isnan(values)))]  # NaN'lar argsort'ta sona düşer
+            self._orders[key] = order
+        return order
+
+    def site(self, index):
+        """Tek sitenin değerleri, yüzdelikleri ve z-skorları"""
+        return {
+            'domain': self.domains[index],
+            'site_name': self.site_names[index],
+            'risk_rank': int(self.risk_rank[index]),
+            'total_complaints': int(self.total[index]),
+            'metrics': {
+                metric: {
+                    'value': _float(self.values[metric][index]),
+                    'percentile': _float(self.percentiles[metric][index]),
+                    'z_score': _float(self.z_scores[metric][index]),
+                }
+                for metric in METRICS
+            },
+        }
+
+    def find(self, domain):
+        """Domain'in sıralama kaydı (yoksa None)"""
+        index = self._index.get(domain)
+        return None if index is None else self.site(index)
+
+    def page(self, metric, descending, limit, offset):
+        """metric'e göre sıralanmış sitelerden bir sayfa; (siteler, sıralamaya giren site sayısı) döndürür"""
+        order = self._order(metric, descending)
+        return [self.site(int(index)) for index in order[offset:offset + limit]], len(order)
+
+
+_lock = threading.Lock()
+_cached = None
+
+
+def get_rankings(db):
+    """Güncel sıralamayı döndür; site listesi sürümü değişmediyse bellekteki sonuç kullanılır"""
+    global _cached
+    version = db.get_site_list_version()
+    cached = _cached
+    if cached is not None and cached.version == version:
+        return cached
+    with _lock:
+        # Aynı anda gelen istekler sıralamayı bir kez hesaplar
+        cached = _cached
+        if cached is None or cached.version != version:
+            cached = _cached = SiteRankings(db.get_ranking_rows(), version)
+        return cached
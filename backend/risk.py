@@ -0,0 +1,130 @@
+"""
+Site risk skoru modelleri.
+
+Skor, sitenin kayıtlı tüm şikayetleri için artımlı tutulan sayaçlardan
+(SiteComplaintCounters) O(1) hesaplanır; şikayet listesi taranmaz. Modeller
+sürüm adıyla kayıtlıdır ve Sites.RiskModel skoru hangi sürümün ürettiğini tutar.
+Yeni model eklemek için @register_risk_model('v3') ile bir fonksiyon tanımlayıp
+RISK_MODEL=v3 yapılandırılır; POST /api/rescore mevcut siteleri yeni modelle skorlar.
+"""
+from config import RISK_MODEL
+
+
+class RiskCounters:
+    """Bir sitenin şikayet sayaçları (SiteComplaintCounters satırı)"""
+
+    # Veritabanı sütun sırası
+    FIELDS = ('total', 'negative', 'positive', 'resolved', 'negative_resolved', 'rating_sum', 'rating_count')
+
+    __slots__ = FIELDS
+
+    def __init__(self, total=0, negative=0, positive=0, resolved=0, negative_resolved=0,
+                 rating_sum=0, rating_count=0):
+        self.total = total
+        self.negative = negative
+        self.positive = positive
+        self.resolved = resolved
+        self.negative_resolved = negative_resolved  # Çözüldü olarak işaretlenmiş negatif şikayetler
+        self.rating_sum = rating_sum
+        self.rating_count = rating_count  # Puanı olan şikayet sayısı
+
+    @classmethod
+    def from_row(cls, row):
+        """FIELDS sırasındaki veritabanı satırından oluştur (satır yoksa sıfır sayaçlar)"""
+        if row is None:
+            return cls()
+        return cls(*(value or 0 for value in row))
+
+    @property
+    def neutral(self):
+        return self.total - self.negative - self.positive
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'negative': self.negative,
+            'positive': self.positive,
+            'neutral': self.neutral,
+            'resolved': self.resolved,
+            'unresolved': self.total - self.resolved,
+            'average_rating': self.average_rating,
+        }
+
+    def __repr__(self):
+        return f"RiskCounters(total={self.total}, negative={self.negative}, positive={self.positive})"
+
+
+# Sürüm adı -> fonksiyon(RiskCounters) -> 0-100 arası int
+RISK_MODELS = {}
+
+
+def register_risk_model(version):
+    """Risk modeli fonksiyonunu sürüm adıyla kaydet"""
+    def decorator(func):
+        RISK_MODELS[version] = func
+        return func
+    return decorator
+
+
+@register_risk_model('v1')
+def sentiment_ratio(counters):
+    """Negatif yorumlar riski artırır, pozitif yorumlar azaltır (ilk sürüm formülü)"""
+    negative_ratio = counters.negative / counters.total
+    positive_ratio = counters.positive / counters.total
+    return int((negative_ratio * 80) - (positive_ratio * 20) + 20)
+
+
+@register_risk_model('v2')
+def unresolved_weighted(counters):
+    """
+    v1 + çözüm durumu ve puan: çözülmüş negatif şikayetler yarım ağırlıkla sayılır,
+    ortalama puan 3'ün altındaysa en fazla 10 puan eklenir
+    """
+    weighted_negative = counters.negative - counters.negative_resolved / 2
+    score = (weighted_negative / counters.total * 80) - (counters.positive / counters.total * 20) + 20
+    average_rating = counters.average_rating
+    if average_rating is not None and average_rating < 3:
+        score += (3 - average_rating) / 2 * 10
+    return int(score)
+
+
+def get_risk_model(version=None):
+    """(sürüm, model fonksiyonu) döndür; bilinmeyen sürümde ValueError"""
+    version = version or RISK_MODEL
+    try:
+        return version, RISK_MODELS[version]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen risk modeli: {version} (mevcut: {', '.join(sorted(RISK_MODELS))})")
+
+
+def calculate_risk_score(counters, version=None):
+    """Sayaçlardan 0-100 arası risk skoru hesapla; (skor, model sürümü) döndür"""
+    version, model = get_risk_model(version)
+    if not counters.total:
+        return 0, version
+    return max(0, min(100, model(counters))), version
+
+
+# Risk seviyesi -> (en düşük, en yüksek) skor; determine_risk_level eşikleriyle aynı
+RISK_LEVEL_RANGES = {
+    'Low': (0, 24),
+    'Medium': (25, 49),
+    'High': (50, 74),
+    'Critical': (75, 100),
+}
+
+
+def determine_risk_level(risk_score):
+    """Risk skoruna göre risk seviyesi belirle"""
+    if risk_score >= 75:
+        return 'Critical'
+    elif risk_score >= 50:
+        return 'High'
+    elif risk_score >= 25:
+        return 'Medium'
+    else:
+        return 'Low'
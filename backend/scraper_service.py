@@ -1,8 +1,14 @@
-from scrapers.sikayetvar_scraper import SikayetvarScraper
-from scrapers.trustpilot_scraper import TrustpilotScraper
-from scrapers.google_reviews_scraper import GoogleReviewsScraper
-from database import Database
+from scrapers import SCRAPER_REGISTRY, get_scraper_class
+from database import create_database
+from config import ENABLED_SOURCES, DEDUP_ENABLED, SOURCE_IDENTITY_TTL_DAYS
+from dedup import collapse_duplicates
+from circuit_breaker import breakers, classify
+import risk
+import progress
+from metrics import SCRAPE_DURATION, ANALYSIS_IN_PROGRESS
 import logging
+import threading
+import time
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -10,21 +16,31 @@ logger = logging.getLogger(__name__)
 
 class ScraperService:
     def __init__(self):
-        self.db = Database()
-        self.scrapers = {
-            'sikayetvar': SikayetvarScraper(),
-            'trustpilot': TrustpilotScraper(),
-            'google_reviews': GoogleReviewsScraper()
-        }
+        # Scraper'lar isimle tutulur; sınıfları ilk kullanımda import edilip oluşturulur
+        self.source_names = [name for name in SCRAPER_REGISTRY if not ENABLED_SOURCES or name in ENABLED_SOURCES]
+        self._scrapers = {}
+        self._scrapers_lock = threading.Lock()
     
-    def extract_domain(self, url):
+    def get_scraper(self, source_name):
+        """Kaynağın scraper örneğini döndür, gerekirse oluştur"""
+        scraper = self._scrapers.get(source_name)
+        if scraper is None:
+            with self._scrapers_lock:
+                scraper = self._scrapers.get(source_name)
+                if scraper is None:
+                    scraper = get_scraper_class(source_name)()
+                    self._scrapers[source_name] = scraper
+        return scraper
+    
+    @staticmethod
+    def extract_domain(url):
         """URL'den domain çıkar"""
         try:
             parsed = urlparse(url)
             domain = parsed.netloc or parsed.path
-            # www. ve protokolü temizle
+            # www. ve protokolü temizle; küçük harf (aynı sitenin analizleri tek kayıtta birleşsin)
             domain = domain.replace('www.', '').replace('https://', '').replace('http://', '')
-            return domain
+            return domain.strip().rstrip('/').lower()
         except:
             return url
     
@@ -34,57 +50,127 @@ class ScraperService:
         site_name = domain.split('.')[0]
         return site_name.capitalize()
     
-    def calculate_risk_score(self, complaints):
-        """Şikayetlere göre risk skoru hesapla"""
-        if not complaints:
-            return 0
-        
-        total = len(complaints)
-        negative_count = sum(1 for c in complaints if c.get('sentiment') == 'negative')
-        positive_count = sum(1 for c in complaints if c.get('sentiment') == 'positive')
-        
-        # Risk skoru: 0-100 arası
-        # Negatif yorumlar riski artırır, pozitif yorumlar azaltır
-        negative_ratio = negative_count / total if total > 0 else 0
-        positive_ratio = positive_count / total if total > 0 else 0
-        
-        risk_score = int((negative_ratio * 80) - (positive_ratio * 20) + 20)
-        risk_score = max(0, min(100, risk_score))  # 0-100 arası sınırla
-        
-        return risk_score
+    def calculate_risk_score(self, counters, version=None):
+        """Sitenin şikayet sayaçlarından (risk.RiskCounters) risk skoru hesapla; (skor, model sürümü) döndür"""
+        return risk.calculate_risk_score(counters, version)
     
     def determine_risk_level(self, risk_score):
         """Risk skoruna göre risk seviyesi belirle"""
-        if risk_score >= 75:
-            return 'Critical'
-        elif risk_score >= 50:
-            return 'High'
-        elif risk_score >= 25:
-            return 'Medium'
-        else:
-            return 'Low'
+        return risk.determine_risk_level(risk_score)
     
-    def scrape_all_sources(self, domain, site_name):
-        """Tüm kaynaklardan veri topla"""
+    def rescore_all_sites(self, version=None):
+        """
+        Tüm siteleri sayaçlardan verilen (varsayılan RISK_MODEL) modelle yeniden skorla
+        Şikayetler okunmaz; site başına tek satır. Güncellenen site sayısını döndürür
+        """
+        version, _ = risk.get_risk_model(version)
+        db = create_database()
+        if not db.connect():
+            raise RuntimeError('Veritabanı bağlantı hatası')
+        try:
+            updated = 0
+            for site_id, counters in db.get_all_site_counters():
+                risk_score, _ = self.calculate_risk_score(counters, version)
+                if db.update_site_risk_score(site_id, risk_score, risk_model=version, touch_scanned=False):
+                    updated += 1
+            return updated
+        finally:
+            db.close(force=False)
+    
+    def determine_scrape_status(self, records_found, stats):
+        """Kaynak çalışmasının durumunu kayıt sayısı ve hata nedenine göre belirle"""
+        if stats.get('circuit_open'):
+            return 'Skipped'  # Devre açık, kaynak çalıştırılmadı
+        failed = bool(stats.get('failure_reason'))
+        if records_found and failed:
+            return 'Partial'
+        if records_found:
+            return 'Success'
+        if failed:
+            return 'Failed'
+        return 'Empty'  # Hata yok ama kaynakta kayıt bulunamadı
+    
+    def scrape_all_sources(self, domain, site_name, identities=None):
+        """
+        Tüm kaynaklardan veri topla; (şikayetler, kaynak bazında istatistikler) döndür
+        identities: {kaynak: tanımlayıcı} önceki taramalarda doğrulanmış kaynak adresleri
+        """
         all_complaints = []
+        source_stats = {}
+        identities = identities or {}
         
-        for source_name, scraper in self.scrapers.items():
+        for source_name in self.source_names:
+            breaker = breakers.get(source_name)
+            if not breaker.allow():
+                # Kaynak art arda başarısız oldu; bekleme süresi dolana kadar zaman harcanmaz
+                logger.info(f"⏭ {source_name} atlandı: devre açık ({breaker.retry_after()} sn sonra denenecek)")
+                source_stats[source_name] = {'failure_reason': 'Devre açık: kaynak geçici olarak atlandı',
+                                             'circuit_open': True}
+                progress.report('source_skipped', source=source_name, reason='circuit_open',
+                                retry_after=breaker.retry_after())
+                continue
+            scraper = None
             try:
+                scraper = self.get_scraper(source_name)
                 logger.info(f"→ {source_name} scraping başlatılıyor...")
-                complaints = scraper.scrape(domain, site_name)
+                progress.report('source_started', source=source_name)
+                with SCRAPE_DURATION.time(source=source_name):
+                    complaints, stats = scraper.run(domain, site_name, identities.get(source_name))
+                source_stats[source_name] = stats
                 # Her complaint'e source ekle
                 for complaint in complaints:
-                    complaint['source'] = source_name
+                    complaint.source = source_name
                 all_complaints.extend(complaints)
                 logger.info(f"✓ {source_name}'dan {len(complaints)} kayıt bulundu")
             except Exception as e:
                 logger.error(f"✗ {source_name} scraping hatası: {str(e)}")
+                source_stats[source_name] = scraper.stats if scraper else {'failure_reason': str(e)}
+                if not source_stats[source_name].get('failure_reason'):
+                    source_stats[source_name]['failure_reason'] = str(e)
+                complaints = []
+            stats = source_stats[source_name]
+            outcome = classify(stats, len(complaints), identities.get(source_name))
+            if outcome == 'failure':
+                breaker.record_failure(stats.get('failure_reason') or 'Kayıtlı tanımlayıcı boş döndü')
+            elif outcome == 'success':
+                breaker.record_success()
+            else:
+                breaker.record_neutral()
+            progress.report('source_finished', source=source_name, records=len(complaints),
+                            pages=len(stats.get('pages', ())), duration_seconds=stats.get('duration_seconds'),
+                            cache_hit=stats.get('cache_hit', False), failure_reason=stats.get('failure_reason'))
         
-        return all_complaints
+        return all_complaints, source_stats
+    
+    def update_source_identities(self, db, site_id, identities, source_stats):
+        """
+        Kayıt bulunan kaynak tanımlayıcılarını doğrulanmış olarak kaydet; kayıtlı tanımlayıcı
+        hatasız bir taramada kayıt döndürmediyse sil (sonraki taramada yeniden çözülür)
+        """
+        for source_name, stats in source_stats.items():
+            identifier = stats.get('identity')
+            try:
+                if identifier:
+                    db.save_source_identity(site_id, source_name, identifier, SOURCE_IDENTITY_TTL_DAYS)
+                elif source_name in identities and not stats.get('cache_hit') and not stats.get('failure_reason'):
+                    logger.info(f"{source_name}: kayıtlı tanımlayıcı artık kayıt döndürmüyor ({identities[source_name]})")
+                    db.delete_source_identity(site_id, source_name)
+            except Exception as e:
+                logger.error(f"{source_name} tanımlayıcısı kaydedilemedi: {str(e)}")
     
     def process_site(self, url):
         """Site için tüm işlemleri gerçekleştir"""
-        import time
+        ANALYSIS_IN_PROGRESS.inc()
+        # Eşzamanlı analizler aynı Database örneğini paylaşmaz (bir analizin close()'u diğerinin bağlantısını silmesin)
+        db = create_database()
+        try:
+            return self._process_site(db, url)
+        finally:
+            if db.conn:
+                db.close()
+            ANALYSIS_IN_PROGRESS.dec()
+    
+    def _process_site(self, db, url):
         start_time = time.time()
         
         try:
@@ -95,60 +181,63 @@ class ScraperService:
             logger.info(f"→ Site işleniyor: {domain} ({site_name})")
             
             # Veritabanına bağlan (scraping için pool kullan)
-            if not self.db.connect():
+            if not db.connect():
                 return {'error': 'Veritabanı bağlantı hatası'}
             
             # Site'yi getir veya oluştur
-            site_id = self.db.get_or_create_site(domain)
+            site_id = db.get_or_create_site(domain)
             
-            # Tüm kaynaklardan veri topla
-            all_complaints = self.scrape_all_sources(domain, site_name)
+            # Tüm kaynaklardan veri topla (daha önce çözülmüş kaynak adresleriyle)
+            identities = db.get_source_identities(site_id)
+            all_complaints, source_stats = self.scrape_all_sources(domain, site_name, identities)
+            self.update_source_identities(db, site_id, identities, source_stats)
             
-            # Verileri veritabanına kaydet (cache'den gelenleri hariç tut)
-            saved_count = 0
+            # Kaynak bazında bulunan kayıt sayıları (tekilleştirme öncesi, scraping geçmişi için)
+            records_by_source = {}
             for complaint in all_complaints:
-                # Cache'den gelen veriler DB'ye kaydedilmez
-                if complaint.get('cached'):
-                    logger.debug(f"⚡ Cache'den gelen veri DB'ye kaydedilmedi: {complaint.get('title')}")
-                    continue
-                
-                if self.db.save_complaint(
-                    site_id=site_id,
-                    source=complaint.get('source', 'unknown'),
-                    title=complaint.get('title', ''),
-                    content=complaint.get('content', ''),
-                    author=complaint.get('author', ''),
-                    date=complaint.get('date'),
-                    rating=complaint.get('rating'),
-                    sentiment=complaint.get('sentiment', 'neutral'),
-                    url=complaint.get('url', ''),
-                    is_resolved=complaint.get('is_resolved', False)
-                ):
-                    saved_count += 1
+                source = complaint.source
+                records_by_source[source] = records_by_source.get(source, 0) + 1
+            
+            # Kaynaklar arası yakın-kopyaları kayıt ve skor öncesi birleştir
+            duplicates_collapsed = 0
+            if DEDUP_ENABLED:
+                all_complaints, duplicate_links = collapse_duplicates(all_complaints)
+                duplicates_collapsed = sum(len(duplicates) for _, duplicates in duplicate_links)
+                if duplicates_collapsed:
+                    logger.info(f"✓ {duplicates_collapsed} yakın-kopya kayıt birleştirildi")
+            
+            # Verileri veritabanına toplu kaydet (cache'den gelen veriler DB'ye kaydedilmez)
+            new_complaints = [c for c in all_complaints if not c.cached]
+            if len(new_complaints) < len(all_complaints):
+                logger.debug(f"⚡ Cache'den gelen {len(all_complaints) - len(new_complaints)} veri DB'ye kaydedilmedi")
+            saved_count = db.save_complaints(site_id, new_complaints)
+            progress.report('saved', saved_count=saved_count, total_complaints=len(all_complaints),
+                            duplicates_collapsed=duplicates_collapsed)
             
-            # Risk skorunu hesapla ve güncelle
-            risk_score = self.calculate_risk_score(all_complaints)
+            # Risk skoru sitenin tüm kayıtlı şikayetlerinin sayaçlarından (save_complaints ile güncel) hesaplanır
+            counters = db.get_site_counters(site_id)
+            risk_score, risk_model = self.calculate_risk_score(counters)
             risk_level = self.determine_risk_level(risk_score)
-            self.db.update_site_risk_score(site_id, risk_score)
+            db.update_site_risk_score(site_id, risk_score, risk_model=risk_model)
+            progress.report('scored', risk_score=risk_score, risk_level=risk_level, risk_model=risk_model)
             
-            # Scraping geçmişini kaydet (her kaynak için ayrı süre hesapla)
-            scraping_start = time.time()
-            for source_name in self.scrapers.keys():
-                source_start = time.time()
-                source_complaints = [c for c in all_complaints if c.get('source') == source_name]
-                source_duration = int(time.time() - source_start)
+            # Scraping geçmişini kaydet (scraper'ların ölçtüğü gerçek süre ve sayfa telemetrisi ile)
+            for source_name in self.source_names:
+                stats = source_stats.get(source_name, {})
+                records_found = records_by_source.get(source_name, 0)
                 
-                self.db.save_scraping_history(
+                db.save_scraping_history(
                     site_id=site_id,
                     source=source_name,
-                    status='Success' if source_complaints else 'Failed',
-                    records_found=len(source_complaints),
-                    duration=source_duration
+                    status=self.determine_scrape_status(records_found, stats),
+                    records_found=records_found,
+                    error_message=stats.get('failure_reason'),
+                    stats=stats
                 )
             
             total_duration = int(time.time() - start_time)
             
-            self.db.close(force=False)  # Pool'da tut, scraping sık yapılabilir
+            db.close(force=False)  # Pool'da tut, scraping sık yapılabilir
             
             return {
                 'success': True,
@@ -157,14 +246,15 @@ class ScraperService:
                 'site_name': site_name,
                 'total_complaints': len(all_complaints),
                 'saved_count': saved_count,
+                'duplicates_collapsed': duplicates_collapsed,
                 'risk_score': risk_score,
                 'risk_level': risk_level,
+                'risk_model': risk_model,
+                'statistics': counters.to_dict(),
                 'duration': total_duration
             }
             
         except Exception as e:
             logger.error(f"✗ Site işleme hatası: {str(e)}")
-            if self.db.conn:
-                self.db.close()
             return {'error': str(e)}
 
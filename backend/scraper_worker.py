@@ -0,0 +1,220 @@
+"""
+Veritabanı kuyruğundan (ScrapeJobs) analiz işi alan bağımsız scraping worker'ı.
+
+Scraping (Selenium, HTTP, BeautifulSoup) Flask sürecinden ayrılır; API sadece işi
+kuyruğa yazar (SCRAPE_QUEUE_ENABLED=true). Aynı veritabanına bağlı, farklı
+makinelerde çalışan worker'lar kuyruğu paralel boşaltır: SQL Server'da işler
+UPDLOCK/READPAST ile alınır, aynı iş iki worker'a verilmez. Çalışan iş
+WORKER_HEARTBEAT_INTERVAL saniyede bir heartbeat yazar; WORKER_STALE_AFTER saniye
+heartbeat gelmeyen işler (çöken worker) JOB_MAX_ATTEMPTS denemeye kadar tekrar
+kuyruğa alınır.
+
+Kullanım (backend dizininden):
+    python -m scraper_worker                  # tek süreç
+    python -m scraper_worker --processes 4    # 4 süreç (çekirdek başına bir worker)
+    python -m scraper_worker --once           # kuyruktaki işler bitince çık
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from config import (
+    WORKER_POLL_INTERVAL, WORKER_HEARTBEAT_INTERVAL, WORKER_STALE_AFTER, JOB_MAX_ATTEMPTS
+)
+from database import create_database
+
+logger = logging.getLogger(__name__)
+
+
+class JobHeartbeat:
+    """
+    İş çalıştığı sürece arka planda ScrapeJobs.HeartbeatDate'i günceller (with bloğu).
+    Kendi bağlantısını kullanır; sqlite3/pyodbc bağlantıları thread'ler arasında paylaşılmaz.
+    """
+
+    def __init__(self, job_id, worker_id, interval=WORKER_HEARTBEAT_INTERVAL):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self._done = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._loop, name=f"heartbeat-{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._thread.join()
+        return False
+
+    def _loop(self):
+        db = create_database(use_pool=False)
+        try:
+            while not self._done.wait(self.interval):
+                try:
+                    if db.conn is None and not db.connect():
+                        continue
+                    if not db.heartbeat_job(self.job_id, self.worker_id):
+                        logger.warning(f"{self.job_id}: iş artık bu çalışanda değil (heartbeat zaman aşımına uğramış)")
+                        return
+                except Exception as e:
+                    logger.error(f"{self.job_id}: heartbeat hatası: {str(e)}")
+                    db.close(force=True)
+        finally:
+            db.close(force=True)
+
+
+class ScraperWorker:
+    """Kuyruktan iş alıp ScraperService.process_site ile çalıştıran tek worker (süreç başına bir tane)"""
+
+    def __init__(self, worker_id=None, poll_interval=WORKER_POLL_INTERVAL,
+                 heartbeat_interval=WORKER_HEARTBEAT_INTERVAL, stale_after=WORKER_STALE_AFTER):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.db = create_database(use_pool=False)  # Kuyruk işlemleri için ayrı bağlantı
+        self.stop_event = threading.Event()
+        self._service = None
+        self._last_requeue = 0.0
+
+    @property
+    def service(self):
+        # Scraper import maliyeti ilk işte ödenir
+        if self._service is None:
+            from scraper_service import ScraperService
+            self._service = ScraperService()
+        return self._service
+
+    def stop(self, *_):
+        """Çalışan iş bittikten sonra dur"""
+        logger.info(f"{self.worker_id}: durduruluyor (çalışan iş tamamlanacak)")
+        self.stop_event.set()
+
+    def _ensure_connection(self):
+        if self.db.conn is not None:
+            return True
+        return self.db.connect()
+
+    def _reset_connection(self):
+        try:
+            self.db.close(force=True)
+        except Exception:
+            pass
+
+    def requeue_stale(self):
+        """Yarım kalmış işleri en fazla stale_after / 2 saniyede bir tekrar kuyruğa al"""
+        now = time.monotonic()
+        if now - self._last_requeue < self.stale_after / 2:
+            return
+        self._last_requeue = now
+        requeued, failed = self.db.requeue_stale_jobs(self.stale_after, JOB_MAX_ATTEMPTS)
+        if requeued or failed:
+            logger.warning(f"Heartbeat zaman aşımı: {requeued} iş tekrar kuyruğa alındı, {failed} iş başarısız")
+
+    def run(self, once=False):
+        """Kuyruk boşaldıkça bekleyerek işleri çalıştır; once=True ise kuyruk boşalınca dön"""
+        logger.info(f"{self.worker_id}: başladı")
+        while not self.stop_event.is_set():
+            try:
+                if not self._ensure_connection():
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+                self.requeue_stale()
+                job = self.db.claim_job(self.worker_id)
+            except Exception as e:
+                logger.error(f"{self.worker_id}: kuyruk hatası: {str(e)}")
+                self._reset_connection()
+                self.stop_event.wait(self.poll_interval)
+                continue
+
+            if job is None:
+                if once:
+                    break
+                self.stop_event.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+        self._reset_connection()
+        logger.info(f"{self.worker_id}: durdu")
+
+    def run_job(self, job):
+        """İşi çalıştır ve sonucunu ScrapeJobs'a yaz"""
+        job_id = job['job_id']
+        logger.info(f"{job_id}: {job['url']} analiz ediliyor (deneme {job['attempts']})")
+        start = time.perf_counter()
+        result, error = None, None
+        try:
+            with JobHeartbeat(job_id, self.worker_id, self.heartbeat_interval):
+                result = self._process(job)
+            result['job_id'] = job_id
+            error = result.get('error')
+        except Exception as e:
+            logger.error(f"{job_id}: analiz hatası: {str(e)}", exc_info=True)
+            error = f'Analiz hatası: {str(e)}'
+
+        try:
+            self._ensure_connection()
+            if not self.db.complete_job(job_id, self.worker_id, error is None, result, error):
+                logger.warning(f"{job_id}: sonuç yazılmadı, iş başka bir worker'a verilmiş")
+        except Exception as e:
+            logger.error(f"{job_id}: sonuç kaydetme hatası: {str(e)}")
+            self._reset_connection()
+        status = 'başarısız' if error else 'tamamlandı'
+        logger.info(f"{job_id}: {status} ({time.perf_counter() - start:.1f} sn)")
+
+    def _process(self, job):
+        if job['profile']:
+            import profiling
+            domain = self.service.extract_domain(job['url'])
+            result, profile_name = profiling.run_profiled(job['job_id'], domain, self.service.process_site, job['url'])
+            if profile_name:
+                result['profile'] = profile_name
+            return result
+        return self.service.process_site(job['url'])
+
+
+def _run_worker(once):
+    worker = ScraperWorker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=once)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScrapeJobs kuyruğundan analiz işi çalıştıran worker")
+    parser.add_argument('--processes', type=int, default=1, help="Bu makinede çalışacak worker süreci sayısı")
+    parser.add_argument('--once', action='store_true', help="Kuyruk boşalınca çık")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_worker(args.once)
+        return
+
+    # Her süreç kendi ScraperService'i, veritabanı bağlantıları ve tarayıcısıyla çalışır (GIL paylaşılmaz)
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(args.once,), name=f"scraper-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward_stop(*_):
+        # Çocuklara SIGTERM: her biri çalışan işini bitirip çıkar
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward_stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C süreç grubundaki tüm worker'lara zaten gider
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,32 @@
 # Scrapers package
+#
+# Scraper'lar isimle kaydedilir; modülleri (bs4, requests, Selenium yardımcıları) ilk kullanımda import edilir.
+# Böylece sadece okuma yapan API endpoint'leri scraper bağımlılıklarının import maliyetini ödemez.
+import importlib
 
+# kaynak adı -> "modül:SınıfAdı"
+SCRAPER_REGISTRY = {
+    'sikayetvar': 'scrapers.sikayetvar_scraper:SikayetvarScraper',
+    'trustpilot': 'scrapers.trustpilot_scraper:TrustpilotScraper',
+    'google_reviews': 'scrapers.google_reviews_scraper:GoogleReviewsScraper',
+}
+
+
+def register_scraper(name, target):
+    """Yeni scraper kaydet (target: "modül:SınıfAdı")"""
+    SCRAPER_REGISTRY[name] = target
+
+
+def get_scraper_class(name):
+    """Kaynak adına göre scraper sınıfını import et ve döndür"""
+    module_name, class_name = SCRAPER_REGISTRY[name].split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name):
+    # Geriye uyumluluk: `from scrapers import SikayetvarScraper` gibi kullanımlar tembel çözülür
+    for target in SCRAPER_REGISTRY.values():
+        module_name, class_name = target.split(':')
+        if class_name == name:
+            return getattr(importlib.import_module(module_name), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
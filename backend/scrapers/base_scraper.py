@@ -1,6 +1,17 @@
 import os
 import logging
-from typing import List, Dict
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from typing import List, Dict, Optional
+from config import (
+    SCRAPER_CACHE_DIR, SCRAPER_CACHE_TTL, SCRAPER_DELAY_SCALE, NEGATIVE_CACHE_TTL, RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_DIR
+)
+from models import Complaint
+from metrics import SCRAPE_PAGES, SCRAPE_BYTES, SCRAPE_BYTES_SAVED, SCRAPE_HTTP_RESPONSES, SCRAPE_CACHE_REQUESTS
+from scrapers.response_cache import ResponseCache
+import progress
 
 logger = logging.getLogger(__name__)
 
@@ -8,10 +19,192 @@ logger = logging.getLogger(__name__)
 class BaseScraper:
     """Tüm scraper'lar için temel sınıf - cache ve veri kaydı özelliği"""
     
+    source_name = None  # Alt sınıflar ScraperService'teki kaynak adını verir
+    
     def __init__(self):
         self.delay = 1  # Sayfa istekleri arasında bekleme süresi
-        self.veriler_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Veriler")
-        os.makedirs(self.veriler_dir, exist_ok=True)
+        self.veriler_dir = SCRAPER_CACHE_DIR  # Dizin ilk cache yazımında oluşturulur
+        self.response_cache = ResponseCache(RESPONSE_CACHE_DIR) if RESPONSE_CACHE_ENABLED else None
+        # Scraper nesneleri thread'ler arasında paylaşıldığı için çalışma istatistikleri thread'e özel tutulur
+        self._local = threading.local()
+    
+    def run(self, domain: str, site_name: str, identity: Optional[str] = None):
+        """
+        scrape() metodunu telemetri ile çalıştır; (sonuçlar, istatistikler) döndür
+        identity: önceki taramada doğrulanmış kaynak tanımlayıcısı (SourceIdentities), scraper önce bunu dener
+        """
+        self._local.identity = identity
+        self._local.stats = {
+            'duration_seconds': 0.0,
+            'stages': {},  # aşama adı -> toplam saniye (fetch, parse, selenium_startup, ...)
+            'pages': [],  # sayfa bazında: url, status, bytes, fetch_seconds, parse_seconds, records
+            'bytes_downloaded': 0,
+            'not_modified_pages': 0,  # 304 ile cache'den okunan sayfalar
+            'failure_reason': None,
+            'cache_hit': False,
+            'negative_cache_hit': False,
+            'not_listed': False,  # Kaynak araması hiçbir şey bulamadı (404 / arama eşleşmesi yok)
+            'identity': None,  # Kayıt bulunan kaynak tanımlayıcısı (Trustpilot URL'i, Şikayetvar slug'ı, Maps place URL'i)
+            'identity_reused': False,
+        }
+        source = self.source_name or self.__class__.__name__
+        # Doğrulanmış tanımlayıcısı olan kaynakta domain vardır; negatif cache'e bakılmaz
+        if not identity and self.check_negative_cache(domain, source):
+            return [], self.stats
+        start = time.perf_counter()
+        results = []
+        try:
+            results = self.scrape(domain, site_name) or []
+        except Exception as e:
+            self.note_failure(f"{type(e).__name__}: {str(e)}")
+            raise
+        finally:
+            self.stats['duration_seconds'] = time.perf_counter() - start
+        # Sadece kaynak araması bir şey bulamadıysa domain bu kaynakta yoktur ve sonraki taramalarda
+        # tekrar aranmaz. Kayıtlı tanımlayıcının veya indirilen sayfanın boş dönmesi engelleme ya da
+        # sayfa yapısı değişikliği olabilir; negatif cache'e yazılmaz
+        if not results and not identity and self.stats['not_listed'] and not self.stats['failure_reason']:
+            self.save_negative_cache(domain, source)
+        return results, self.stats
+    
+    def sleep(self):
+        """Sayfa istekleri arasında bekle (SCRAPER_DELAY_SCALE ile ölçeklenir)"""
+        delay = self.delay * SCRAPER_DELAY_SCALE
+        if delay > 0:
+            time.sleep(delay)
+    
+    @property
+    def stats(self) -> Dict:
+        """Geçerli thread'deki çalışmanın istatistikleri (run() dışında boş sözlük)"""
+        stats = getattr(self._local, 'stats', None)
+        if stats is None:
+            stats = {'stages': {}, 'pages': [], 'bytes_downloaded': 0, 'not_modified_pages': 0, 'failure_reason': None,
+                     'cache_hit': False, 'negative_cache_hit': False, 'not_listed': False}
+            self._local.stats = stats
+        return stats
+    
+    @property
+    def known_identity(self) -> Optional[str]:
+        """run()'a verilen, daha önce doğrulanmış kaynak tanımlayıcısı"""
+        return getattr(self._local, 'identity', None)
+    
+    def note_identity(self, identifier: str):
+        """Kayıt bulunan kaynak tanımlayıcısını kaydet (ScraperService sonraki taramalar için saklar)"""
+        self.stats['identity'] = identifier
+        self.stats['identity_reused'] = identifier == self.known_identity
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Bir aşamanın süresini ölç; 'parse' süresi son sayfaya da yazılır"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stats
+            stats['stages'][name] = stats['stages'].get(name, 0.0) + elapsed
+            if name == 'parse' and stats['pages']:
+                stats['pages'][-1]['parse_seconds'] += elapsed
+    
+    def record_page(self, url: str, status: Optional[int] = None, size: int = 0, fetch_seconds: float = 0.0):
+        """Ziyaret edilen sayfayı istatistiklere ekle"""
+        stats = self.stats
+        stats['pages'].append({
+            'url': url,
+            'status': status,
+            'bytes': size,
+            'fetch_seconds': fetch_seconds,
+            'parse_seconds': 0.0,
+            'records': 0,
+        })
+        stats['bytes_downloaded'] += size
+        progress.report('page', source=self.source_name, url=url, status=status, bytes=size)
+    
+    def set_page_records(self, count: int):
+        """Son ziyaret edilen sayfada bulunan kayıt sayısını yaz"""
+        pages = self.stats['pages']
+        if pages:
+            pages[-1]['records'] = count
+            progress.report('records', source=self.source_name, url=pages[-1]['url'], records=count)
+    
+    def note_not_listed(self):
+        """Kaynakta domain aranıp bulunamadı; run() boş sonucu negatif cache'e yazar"""
+        self.stats['not_listed'] = True
+    
+    def pages_not_found(self) -> bool:
+        """Ziyaret edilen tüm sayfalar 404 döndüyse True (hiç sayfa yoksa False)"""
+        pages = self.stats['pages']
+        return bool(pages) and all(page['status'] == 404 for page in pages)
+    
+    def note_failure(self, reason: str):
+        """Hata nedenini kaydet (ilk hata korunur)"""
+        if not self.stats.get('failure_reason'):
+            self.stats['failure_reason'] = reason[:1000]
+    
+    def fetch(self, url: str, **kwargs):
+        """
+        HTTP GET isteği yap; sayfa/durum kodu/byte metriklerini ve telemetriyi kaydet
+        Sayfa daha önce ETag/Last-Modified ile indirildiyse koşullu istenir; 304'te cache'deki
+        gövde CachedResponse olarak döner (status_code 200, not_modified True)
+        """
+        source = self.source_name or self.__class__.__name__
+        entry = self.response_cache.lookup(url) if self.response_cache else None
+        if entry:
+            headers = {**(kwargs.get('headers') or {}), **self.response_cache.conditional_headers(entry)}
+            resp = self._get(url, source, dict(kwargs, headers=headers))
+            if resp.status_code == 304:
+                cached = self.response_cache.load(url, entry)
+                if cached is not None:
+                    SCRAPE_BYTES_SAVED.inc(len(cached.content), source=source)
+                    self.stats['not_modified_pages'] += 1
+                    return cached
+                resp = self._get(url, source, kwargs)  # Gövde dosyası silinmiş: koşulsuz tekrar iste
+        else:
+            resp = self._get(url, source, kwargs)
+        
+        # 404 "kaynakta kayıt yok" anlamına gelir; sadece rate limit ve sunucu hataları hata sayılır
+        if resp.status_code == 429 or resp.status_code >= 500:
+            self.note_failure(f"HTTP {resp.status_code} ({url})")
+        if resp.status_code == 200 and self.response_cache:
+            resp.cache_url = url
+            resp.body_hash = self.response_cache.store(url, resp)
+        return resp
+    
+    def _get(self, url: str, source: str, kwargs: Dict):
+        start = time.perf_counter()
+        try:
+            with self.stage('fetch'):
+                resp = requests.get(url, **kwargs)
+        except Exception as e:
+            SCRAPE_HTTP_RESPONSES.inc(source=source, status='error')
+            self.record_page(url, fetch_seconds=time.perf_counter() - start)
+            self.note_failure(f"{type(e).__name__}: {str(e)} ({url})")
+            raise
+        size = len(resp.content)
+        SCRAPE_PAGES.inc(source=source)
+        SCRAPE_BYTES.inc(size, source=source)
+        SCRAPE_HTTP_RESPONSES.inc(source=source, status=resp.status_code)
+        self.record_page(url, resp.status_code, size, time.perf_counter() - start)
+        return resp
+    
+    def parse_response(self, resp, parse):
+        """
+        parse(html) ile yanıtı parse et ('parse' aşaması olarak ölçülür)
+        304 yanıtında aynı gövdeden önceki taramada parse edilmiş kayıtlar döner; bunlar önceki
+        taramada veritabanına kaydedildiği için cached olarak işaretlenir
+        """
+        with self.stage('parse'):
+            body_hash = getattr(resp, 'body_hash', None)
+            if getattr(resp, 'not_modified', False):
+                records = self.response_cache.load_records(resp.cache_url, body_hash)
+                if records is not None:
+                    for item in records:
+                        item.cached = True
+                    return records
+            records = parse(resp.text)
+            if records is not None and body_hash and self.response_cache:
+                self.response_cache.store_records(resp.cache_url, body_hash, records)
+            return records
     
     def get_cache_path(self, domain: str, source: str) -> str:
         """Cache dosyasının yolunu oluştur"""
@@ -19,31 +212,71 @@ class BaseScraper:
         filename = f"{clean_domain}_{source}.txt"
         return os.path.join(self.veriler_dir, filename)
     
-    def check_cache(self, domain: str, source: str) -> List[Dict]:
-        """Cache'de veri varsa oku ve döndür"""
+    def check_cache(self, domain: str, source: str) -> Optional[List[Complaint]]:
+        """
+        Cache'de SCRAPER_CACHE_TTL saniyeden yeni veri varsa oku ve döndür
+        Eski cache okunmaz: kaynak yeniden taranır, sayfalar yanıt cache'i varsa koşullu istenir (304)
+        """
         filepath = self.get_cache_path(domain, source)
         
-        if os.path.exists(filepath):
+        if os.path.exists(filepath) and time.time() - os.path.getmtime(filepath) < SCRAPER_CACHE_TTL:
             try:
                 logger.info(f"⚡ Cache'den veriler okunuyor: {filepath}")
                 results = self._load_from_cache(filepath)
                 # Cache'den gelen verilere işaret ekle (DB'ye kaydetme)
                 for item in results:
-                    item['cached'] = True
+                    item.cached = True
+                    item.source = source
                 logger.info(f"✓ Cache'den {len(results)} veri yüklendi")
+                SCRAPE_CACHE_REQUESTS.inc(source=source, result='hit')
+                self.stats['cache_hit'] = True
                 return results
             except Exception as e:
                 logger.warning(f"⚠ Cache okuma hatası: {str(e)}")
+                SCRAPE_CACHE_REQUESTS.inc(source=source, result='miss')
                 return None
+        SCRAPE_CACHE_REQUESTS.inc(source=source, result='miss')
         return None
     
-    def save_to_cache(self, domain: str, source: str, site_name: str, results: List[Dict]):
+    def get_negative_cache_path(self, domain: str, source: str) -> str:
+        """Negatif cache işaret dosyasının yolunu oluştur (txt cache'in yanında)"""
+        return self.get_cache_path(domain, source)[:-len('.txt')] + '.empty'
+    
+    def check_negative_cache(self, domain: str, source: str) -> bool:
+        """Domain bu kaynakta son NEGATIVE_CACHE_TTL saniye içinde bulunamadıysa True döndür"""
+        if NEGATIVE_CACHE_TTL <= 0:
+            return False
+        try:
+            age = time.time() - os.path.getmtime(self.get_negative_cache_path(domain, source))
+        except OSError:
+            return False
+        if age >= NEGATIVE_CACHE_TTL:
+            return False
+        logger.info(f"⚡ {domain} {source} kaynağında {age / 3600:.1f} saat önce bulunamadı, atlanıyor")
+        SCRAPE_CACHE_REQUESTS.inc(source=source, result='negative_hit')
+        self.stats['cache_hit'] = True
+        self.stats['negative_cache_hit'] = True
+        return True
+    
+    def save_negative_cache(self, domain: str, source: str):
+        """Domain'in bu kaynakta bulunamadığını kaydet (işaret dosyasının mtime'ı TTL için kullanılır)"""
+        if NEGATIVE_CACHE_TTL <= 0:
+            return
+        try:
+            os.makedirs(self.veriler_dir, exist_ok=True)
+            with open(self.get_negative_cache_path(domain, source), "w", encoding="utf-8") as f:
+                f.write(f"{source} kaynağında {domain} için kayıt bulunamadı\n")
+        except Exception as e:
+            logger.error(f"✗ Negatif cache kaydetme hatası: {str(e)}")
+    
+    def save_to_cache(self, domain: str, source: str, site_name: str, results: List[Complaint]):
         """Verileri txt dosyasına kaydet"""
         if not results:
             return
         
         try:
             filepath = self.get_cache_path(domain, source)
+            os.makedirs(self.veriler_dir, exist_ok=True)
             
             with open(filepath, "w", encoding="utf-8") as f:
                 f.write(f"{source.capitalize()} Verileri - {domain} ({site_name})\n")
@@ -51,20 +284,20 @@ class BaseScraper:
                 f.write(f"{'='*60}\n\n")
                 
                 for idx, item in enumerate(results, 1):
-                    f.write(f"[{idx}] {item.get('title', 'N/A')}\n")
-                    f.write(f"Yazar: {item.get('author', 'N/A')}\n")
-                    f.write(f"Tarih: {item.get('date', 'N/A')}\n")
-                    f.write(f"Sentiment: {item.get('sentiment', 'N/A')}\n")
-                    f.write(f"URL: {item.get('url', 'N/A')}\n")
-                    f.write(f"Rating: {item.get('rating', 'N/A')}\n")
-                    f.write(f"İçerik: {item.get('content', '')}\n")
+                    f.write(f"[{idx}] {item.title}\n")
+                    f.write(f"Yazar: {item.author}\n")
+                    f.write(f"Tarih: {item.date}\n")
+                    f.write(f"Sentiment: {item.sentiment}\n")
+                    f.write(f"URL: {item.url}\n")
+                    f.write(f"Rating: {item.rating}\n")
+                    f.write(f"İçerik: {item.content or ''}\n")
                     f.write(f"{'-'*60}\n\n")
             
             logger.info(f"Veriler {filepath} dosyasına kaydedildi")
         except Exception as e:
             logger.error(f"✗ Txt dosyası kaydetme hatası: {str(e)}")
     
-    def _load_from_cache(self, filepath: str) -> List[Dict]:
+    def _load_from_cache(self, filepath: str) -> List[Complaint]:
         """Txt dosyasından verileri yükle"""
         results = []
         current_item = {}
@@ -116,7 +349,7 @@ class BaseScraper:
         if current_item and 'title' in current_item:
             results.append(current_item)
         
-        return results
+        return [Complaint.from_dict(item) for item in results]
     
     def parse_sentiment(self, text: str) -> str:
         """Basit sentiment analizi"""
@@ -1,4 +1,5 @@
 from scrapers.base_scraper import BaseScraper
+from models import Complaint
 import logging
 import time
 import re
@@ -6,6 +7,7 @@ from typing import List, Dict
 from datetime import datetime
 from urllib.parse import quote_plus
 import json
+from metrics import SELENIUM_STARTUP
 
 # Selenium ve urllib3 uyarılarını bastır (bağlantı retry uyarıları için)
 logging.getLogger('urllib3').setLevel(logging.ERROR)
@@ -18,12 +20,15 @@ logger = logging.getLogger(__name__)
 class GoogleReviewsScraper(BaseScraper):
     """Google Maps/Reviews'ten site yorumlarını çeker - Selenium kullanarak."""
 
+    source_name = "google_reviews"
+
     def __init__(self):
         super().__init__()
         self.delay = 3  # Selenium için daha uzun bekleme
 
     def get_selenium_driver(self):
         """Selenium WebDriver oluştur - webdriver-manager ile otomatik ChromeDriver yükleme"""
+        startup_start = time.perf_counter()
         try:
             from selenium import webdriver
             from selenium.webdriver.chrome.options import Options
@@ -89,6 +94,8 @@ class GoogleReviewsScraper(BaseScraper):
                     pass
                 return None, None, None, None, None, None
             
+            SELENIUM_STARTUP.observe(time.perf_counter() - startup_start)
+            
             # Bot tespitini aşmak için script çalıştır
             try:
                 driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -114,6 +121,16 @@ class GoogleReviewsScraper(BaseScraper):
             logger.error("webdriver-manager paketini yükleyin: pip install webdriver-manager")
             return None, None, None, None, None, None
 
+    @staticmethod
+    def is_blocked(driver) -> bool:
+        """Google engelleme (/sorry/) veya captcha sayfası gösteriyor mu"""
+        try:
+            url = driver.current_url or ""
+            source = (driver.page_source or "").lower()
+        except Exception:
+            return True
+        return "/sorry/" in url or "recaptcha" in source or "unusual traffic" in source
+
     def find_google_maps_place_url(self, driver, domain: str, site_name: str):
         """Google Maps'te işletmeyi bul ve place URL'ini döndür - driver zaten açık olmalı"""
         from selenium.webdriver.common.by import By
@@ -176,9 +193,13 @@ class GoogleReviewsScraper(BaseScraper):
                     current_url = driver.current_url
                     if "/maps/place/" in current_url:
                         return current_url
+                    if self.is_blocked(driver):
+                        # Engelleme sayfasında işletme olmaması "Maps'te yok" anlamına gelmez
+                        self.note_failure("Google engelleme/captcha sayfası gösterdi")
                     else:
-                        logger.warning("Place URL bulunamadı, arama sonuçları sayfası kullanılıyor")
-                        return maps_search_url
+                        self.note_not_listed()
+                    logger.warning("Place URL bulunamadı, arama sonuçları sayfası kullanılıyor")
+                    return maps_search_url
                         
             except Exception as e:
                 logger.warning(f"İşletme sayfasına gidilemedi: {str(e)}")
@@ -187,10 +208,49 @@ class GoogleReviewsScraper(BaseScraper):
             
         except Exception as e:
             logger.error(f"Google Maps arama hatası: {str(e)}")
+            self.note_failure(str(e))
             return f"https://www.google.com/maps/search/{quote_plus(f'{site_name} {domain}')}"
 
+    def parse_reviews_from_script(self, script_text: str, maps_url: str, max_reviews: int = 30) -> List[Complaint]:
+        """Sayfa script'lerindeki JSON verisinden yorumları regex ile çıkar"""
+        results = []
+        # Basit regex ile review verilerini çıkar
+        matches = re.findall(r'"reviewText":\s*"([^"]+)"', script_text)
+        if not matches:
+            return results
+        
+        # Rating ve yazar listesi script başına bir kez aranır (her yorum için tekrar taranmaz)
+        rating = None
+        rating_match = re.search(r'"rating":\s*(\d+)', script_text)
+        if rating_match:
+            rating = int(rating_match.group(1))
+        author_matches = re.findall(r'"authorName":\s*"([^"]+)"', script_text)
+        
+        for i, review_text in enumerate(matches[:max_reviews]):
+            if len(review_text) > 10:
+                # Yazar adını bul
+                author = "Google Kullanıcısı"
+                if author_matches and i < len(author_matches):
+                    author = author_matches[i]
+                
+                results.append(Complaint(
+                    title=f"Google yorumu",
+                    content=review_text[:2000] if len(review_text) > 2000 else review_text,
+                    author=author,
+                    date=None,
+                    rating=rating,
+                    sentiment='positive' if rating and rating >= 4 else ('negative' if rating and rating <= 2 else 'neutral'),
+                    url=maps_url,
+                    is_resolved=False,
+                    source=self.source_name,
+                ))
+        return results
+
     def scrape_reviews_from_maps(self, driver, maps_url: str, max_reviews: int = 30):
-        """Google Maps'ten yorumları çek - driver zaten açık olmalı"""
+        """
+        Google Maps'ten yorumları çek - driver zaten açık olmalı
+        Driver'ı kapatmaz: kayıtlı URL boş dönerse scrape() aynı driver'la Maps aramasına geçer ve sonunda kapatır
+        """
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
@@ -328,36 +388,7 @@ class GoogleReviewsScraper(BaseScraper):
                         if script_text and '"reviews"' in script_text:
                             # JSON içinde yorum verilerini bul
                             try:
-                                # Basit regex ile review verilerini çıkar
-                                review_pattern = r'"reviewText":\s*"([^"]+)"'
-                                matches = re.findall(review_pattern, script_text)
-                                
-                                for i, review_text in enumerate(matches[:max_reviews]):
-                                    if len(review_text) > 10:
-                                        # Rating'i bul
-                                        rating = None
-                                        rating_pattern = r'"rating":\s*(\d+)'
-                                        rating_match = re.search(rating_pattern, script_text)
-                                        if rating_match:
-                                            rating = int(rating_match.group(1))
-                                        
-                                        # Yazar adını bul
-                                        author = "Google Kullanıcısı"
-                                        author_pattern = r'"authorName":\s*"([^"]+)"'
-                                        author_matches = re.findall(author_pattern, script_text)
-                                        if author_matches and i < len(author_matches):
-                                            author = author_matches[i]
-                                        
-                                        results.append({
-                                            "title": f"Google yorumu",
-                                            "content": review_text[:2000] if len(review_text) > 2000 else review_text,
-                                            "author": author,
-                                            "date": None,
-                                            "rating": rating,
-                                            "sentiment": 'positive' if rating and rating >= 4 else ('negative' if rating and rating <= 2 else 'neutral'),
-                                            "url": maps_url,
-                                            "is_resolved": False,
-                                        })
+                                results.extend(self.parse_reviews_from_script(script_text, maps_url, max_reviews))
                             except Exception as e:
                                 logger.debug(f"JSON parse hatası: {str(e)}")
                 except:
@@ -444,16 +475,17 @@ class GoogleReviewsScraper(BaseScraper):
                         elif rating <= 2:
                             sentiment = 'negative'
                     
-                    results.append({
-                        "title": f"Google yorumu",
-                        "content": content_text[:2000] if len(content_text) > 2000 else content_text,
-                        "author": author,
-                        "date": self.parse_date(date_str) if date_str else None,
-                        "rating": rating,
-                        "sentiment": sentiment,
-                        "url": maps_url,
-                        "is_resolved": False,
-                    })
+                    results.append(Complaint(
+                        title=f"Google yorumu",
+                        content=content_text[:2000] if len(content_text) > 2000 else content_text,
+                        author=author,
+                        date=self.parse_date(date_str) if date_str else None,
+                        rating=rating,
+                        sentiment=sentiment,
+                        url=maps_url,
+                        is_resolved=False,
+                        source=self.source_name,
+                    ))
                     
                 except Exception as e:
                     logger.debug(f"Yorum parse hatası: {str(e)}")
@@ -479,50 +511,60 @@ class GoogleReviewsScraper(BaseScraper):
             
         except Exception as e:
             logger.error(f"Google Maps scraping hatası: {str(e)}")
-        finally:
-            # Driver'ı güvenli şekilde kapat
-            try:
-                if driver:
-                    # Driver'ın hala aktif olduğunu kontrol et
-                    try:
-                        _ = driver.current_url
-                        driver.quit()
-                    except:
-                        # Driver zaten kapanmış
-                        pass
-            except Exception as e:
-                logger.debug(f"Driver kapatma hatası (kritik değil): {str(e)}")
+            self.note_failure(str(e))
         
         return results
 
-    def scrape(self, domain: str, site_name: str) -> List[Dict]:
+    def scrape(self, domain: str, site_name: str) -> List[Complaint]:
         """Google Reviews'ten yorumları topla; önce cache'e bak."""
         cached = self.check_cache(domain, "google_reviews")
         if cached:
             return cached
 
-        results: List[Dict] = []
+        results: List[Complaint] = []
 
         try:
             # Selenium driver'ı aç
-            driver, By, WebDriverWait, EC, TimeoutException, NoSuchElementException = self.get_selenium_driver()
+            with self.stage("selenium_startup"):
+                driver, By, WebDriverWait, EC, TimeoutException, NoSuchElementException = self.get_selenium_driver()
             if not driver:
                 logger.error("Selenium driver oluşturulamadı")
+                self.note_failure("Selenium driver oluşturulamadı")
                 return results
             
             try:
-                # Google Maps'te işletmeyi bul
-                logger.info(f"Google Maps'te işletme aranıyor: {site_name} {domain}")
-                maps_url = self.find_google_maps_place_url(driver, domain, site_name)
-                
-                if not maps_url:
-                    logger.warning("Google Maps işletme URL'i bulunamadı")
-                    return results
+                # Önceki taramada doğrulanmış place URL'i varsa Maps araması atlanır
+                known_url = self.known_identity
+                if known_url:
+                    logger.info(f"Kayıtlı Google Maps işletme URL'i kullanılıyor: {known_url}")
+                    self.record_page(known_url)
+                    with self.stage("reviews"):
+                        results = self.scrape_reviews_from_maps(driver, known_url, max_reviews=30)
+                    self.set_page_records(len(results))
+                    if results:
+                        self.note_identity(known_url)
                 
-                logger.info(f"Google Maps işletme URL'i bulundu: {maps_url}")
-                
-                # Yorumları çek (driver zaten açık)
-                results = self.scrape_reviews_from_maps(driver, maps_url, max_reviews=30)
+                if not results:
+                    # Google Maps'te işletmeyi bul
+                    logger.info(f"Google Maps'te işletme aranıyor: {site_name} {domain}")
+                    with self.stage("resolve"):
+                        maps_url = self.find_google_maps_place_url(driver, domain, site_name)
+                    
+                    if not maps_url:
+                        logger.warning("Google Maps işletme URL'i bulunamadı")
+                        return results
+                    
+                    self.record_page(maps_url)
+                    
+                    logger.info(f"Google Maps işletme URL'i bulundu: {maps_url}")
+                    
+                    # Yorumları çek (driver zaten açık)
+                    with self.stage("reviews"):
+                        results = self.scrape_reviews_from_maps(driver, maps_url, max_reviews=30)
+                    self.set_page_records(len(results))
+                    # Arama sonuçları sayfası işletmeyi tanımlamaz, sadece place URL'i saklanır
+                    if results and "/maps/place/" in maps_url:
+                        self.note_identity(maps_url)
                 
                 logger.info(f"✓ Google Reviews'ten {len(results)} yorum bulundu")
                 self.save_to_cache(domain, "google_reviews", site_name, results)
@@ -545,5 +587,6 @@ class GoogleReviewsScraper(BaseScraper):
 
         except Exception as e:
             logger.error(f"✗ Google Reviews scraping hatası: {str(e)}")
+            self.note_failure(str(e))
             return results
 
@@ -0,0 +1,270 @@
+"""
+Scraper HTTP yanıtları için koşullu istek (ETag / Last-Modified) cache'i.
+
+Yanıt gövdeleri içerik adresli saklanır (objects/<sha256[:2]>/<sha256>): aynı içerik
+farklı URL'lerden gelse de tek kopya tutulur. URL başına index kaydı
+(index/<sha256(url)>.json) doğrulayıcıları, gövdenin hash'ini ve o gövdeden parse
+edilmiş kayıtları tutar. Sonraki isteklerde If-None-Match / If-Modified-Since
+gönderilir; 304 yanıtında gövde diskten okunur ve kayıtlar tekrar parse edilmez.
+
+Dosyalar geçici dosyaya yazılıp os.replace ile taşınır; aynı dizini kullanan
+thread'ler ve worker süreçleri yarım yazılmış dosya görmez.
+
+Sayfa gövdesi değiştiğinde eski gövde dosyası artık hiçbir index kaydı tarafından
+gösterilmez. store() en fazla RESPONSE_CACHE_SWEEP_INTERVAL saniyede bir (süreçler
+arasında .last_sweep dosyasıyla) sweep() çalıştırır: RESPONSE_CACHE_TTL_DAYS gün
+güncellenmeyen index kayıtlarını, sahipsiz gövdeleri ve yarım kalmış geçici dosyaları
+siler; gövdelerin toplamı RESPONSE_CACHE_MAX_MB'ı aşarsa en eski kayıtları atar.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import RESPONSE_CACHE_TTL_DAYS, RESPONSE_CACHE_MAX_MB, RESPONSE_CACHE_SWEEP_INTERVAL
+from models import Complaint
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """304 yanıtında cache'deki gövdeyle oluşturulan, requests.Response yerine geçen yanıt"""
+
+    not_modified = True
+    status_code = 200
+
+    def __init__(self, url: str, content: bytes, body_hash: str, headers: Dict):
+        self.url = url
+        self.cache_url = url
+        self.content = content
+        self.body_hash = body_hash
+        self.headers = headers
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+
+def _complaint_to_json(complaint: Complaint) -> Dict:
+    data = complaint.to_dict()
+    if isinstance(data['date'], datetime):
+        data['date'] = data['date'].isoformat()
+    return data
+
+
+def _complaint_from_json(data: Dict) -> Complaint:
+    if data.get('date'):
+        data['date'] = datetime.fromisoformat(data['date'])
+    return Complaint.from_dict(data)
+
+
+class ResponseCache:
+    """URL başına doğrulayıcılar + içerik adresli gövde deposu"""
+
+    # Yeni yazılan gövde, index kaydı yazılmadan önce sahipsiz görünebilir; bu süreden genç dosyalar silinmez
+    SWEEP_GRACE_SECONDS = 600
+
+    def __init__(self, directory: str, ttl_days: int = RESPONSE_CACHE_TTL_DAYS, max_mb: int = RESPONSE_CACHE_MAX_MB,
+                 sweep_interval: int = RESPONSE_CACHE_SWEEP_INTERVAL):
+        self.directory = directory
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.max_bytes = max_mb * 1024 * 1024
+        self.sweep_interval = sweep_interval
+
+    def _index_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, 'index', f"{key}.json")
+
+    def _object_path(self, body_hash: str) -> str:
+        return os.path.join(self.directory, 'objects', body_hash[:2], body_hash)
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """URL'in index kaydı (yoksa veya okunamazsa None)"""
+        try:
+            with open(self._index_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict:
+        """Index kaydındaki doğrulayıcılardan koşullu istek başlıkları"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url: str, entry: Dict) -> Optional[CachedResponse]:
+        """304 yanıtı için cache'deki gövdeyi yükle (gövde silinmişse None)"""
+        try:
+            with open(self._object_path(entry['body']), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        return CachedResponse(url, content, entry['body'], {
+            'ETag': entry.get('etag'), 'Last-Modified': entry.get('last_modified')
+        })
+
+    def store(self, url: str, resp) -> Optional[str]:
+        """
+        200 yanıtının gövdesini ve doğrulayıcılarını kaydet; gövde hash'ini döndür
+        Doğrulayıcısı olmayan yanıtlar koşullu istenemeyeceği için saklanmaz
+        """
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+        try:
+            body_hash = hashlib.sha256(resp.content).hexdigest()
+            object_path = self._object_path(body_hash)
+            if not os.path.exists(object_path):
+                self._write_atomic(object_path, resp.content)
+            entry = {'url': url, 'etag': etag, 'last_modified': last_modified, 'body': body_hash, 'records': None}
+            previous = self.lookup(url)
+            if previous and previous.get('body') == body_hash:
+                entry['records'] = previous.get('records')  # Aynı gövde: parse sonuçları hâlâ geçerli
+            self._write_atomic(self._index_path(url), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            logger.warning(f"⚠ HTTP yanıt cache yazma hatası ({url}): {str(e)}")
+            return None
+        self.maybe_sweep()
+        return body_hash
+
+    def load_records(self, url: str, body_hash: str) -> Optional[List[Complaint]]:
+        """Gövdeden daha önce parse edilmiş kayıtlar (gövde değiştiyse veya kayıt yoksa None)"""
+        entry = self.lookup(url)
+        if not entry or entry.get('body') != body_hash or entry.get('records') is None:
+            return None
+        return [_complaint_from_json(item) for item in entry['records']]
+
+    def store_records(self, url: str, body_hash: str, records: List[Complaint]):
+        """Gövdeden parse edilen kayıtları index kaydına ekle"""
+        entry = self.lookup(url)
+        if not entry or entry.get('body') != body_hash:
+            return
+        try:
+            entry['records'] = [_complaint_to_json(item) for item in records]
+            self._write_atomic(self._index_path(url), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        except Exception as e:
+            logger.warning(f"⚠ Parse sonucu cache yazma hatası ({url}): {str(e)}")
+    
+    def maybe_sweep(self):
+        """Son temizlikten bu yana sweep_interval saniye geçtiyse sweep() çalıştır"""
+        if self.sweep_interval <= 0:
+            return
+        marker = os.path.join(self.directory, '.last_sweep')
+        try:
+            if time.time() - os.path.getmtime(marker) < self.sweep_interval:
+                return
+        except OSError:
+            pass
+        try:
+            # Önce işaret dosyası güncellenir: aynı anda store eden diğer thread/süreçler tekrar temizlemez
+            with open(marker, 'w', encoding='utf-8') as f:
+                f.write(datetime.now().isoformat())
+            self.sweep()
+        except Exception as e:
+            logger.warning(f"⚠ HTTP yanıt cache temizleme hatası: {str(e)}")
+    
+    @staticmethod
+    def _list_files(directory: str) -> List[os.DirEntry]:
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        files.extend(ResponseCache._list_files(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(entry)
+        except OSError:
+            pass
+        return files
+    
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+    
+    def sweep(self) -> Dict:
+        """
+        Süresi dolan index kayıtlarını, sahipsiz gövdeleri ve yarım kalmış geçici dosyaları sil;
+        gövdelerin toplamı max_bytes'ı aşarsa en eski index kayıtlarını da sil. Silinenlerin sayısını döndürür
+        """
+        now = time.time()
+        removed = {'entries': 0, 'objects': 0, 'bytes': 0}
+        
+        # URL kaydı -> gösterdiği gövde (en eskiden yeniye)
+        entries = []
+        for item in self._list_files(os.path.join(self.directory, 'index')):
+            mtime = item.stat().st_mtime
+            if item.name.startswith('.tmp-'):
+                if now - mtime > self.SWEEP_GRACE_SECONDS and self._remove(item.path):
+                    removed['entries'] += 1
+                continue
+            if self.ttl_seconds > 0 and now - mtime > self.ttl_seconds:
+                if self._remove(item.path):
+                    removed['entries'] += 1
+                continue
+            try:
+                with open(item.path, 'r', encoding='utf-8') as f:
+                    body = json.load(f).get('body')
+            except (OSError, ValueError):
+                body = None
+            entries.append((mtime, item.path, body))
+        entries.sort()
+        
+        references = {}
+        for _, _, body in entries:
+            references[body] = references.get(body, 0) + 1
+        
+        objects = {}
+        for item in self._list_files(os.path.join(self.directory, 'objects')):
+            stat = item.stat()
+            if item.name in references:
+                objects[item.name] = (item.path, stat.st_size)
+            elif now - stat.st_mtime > self.SWEEP_GRACE_SECONDS and self._remove(item.path):
+                removed['objects'] += 1
+                removed['bytes'] += stat.st_size
+        
+        # Boyut sınırı: en eski kayıtlar atılır, gösterilmeyen gövdeleri silinir
+        total = sum(size for _, size in objects.values())
+        for _, path, body in entries:
+            if self.max_bytes <= 0 or total <= self.max_bytes:
+                break
+            if not self._remove(path):
+                continue
+            removed['entries'] += 1
+            references[body] -= 1
+            if references[body] == 0 and body in objects:
+                object_path, size = objects.pop(body)
+                if self._remove(object_path):
+                    removed['objects'] += 1
+                    removed['bytes'] += size
+                total -= size
+        
+        if removed['entries'] or removed['objects']:
+            logger.info(f"HTTP yanıt cache temizlendi: {removed['entries']} kayıt, {removed['objects']} gövde "
+                        f"({removed['bytes'] / 1024 / 1024:.1f} MB)")
+        return removed
@@ -0,0 +1,80 @@
+"""
+Aynı domain için eşzamanlı analizlerin tek çalıştırmada birleştirilmesi (single-flight).
+
+İki katmanlıdır:
+- Süreç içi: SingleFlight, aynı anahtarla gelen ikinci çağrıyı çalışan çağrının
+  sonucuna bağlar (thread'ler arası, veritabanı beklemeden).
+- Süreçler/makineler arası: ScrapeJobs tablosundaki UX_ScrapeJobs_ActiveDomain
+  index'i domain başına tek aktif iş bırakır; bağlanan taraf işin sonucunu
+  wait_for_job ile veritabanından bekler.
+"""
+import logging
+import threading
+import time
+from config import WORKER_POLL_INTERVAL, WORKER_STALE_AFTER, JOB_MAX_ATTEMPTS
+from database import JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Anahtar başına aynı anda tek çalıştırma; bekleyenler aynı sonucu alır"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """func()'u çalıştır veya aynı anahtar için çalışana bağlan; (sonuç, paylaşıldı mı) döndür"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def wait_for_job(db, job_id, poll_interval=WORKER_POLL_INTERVAL):
+    """
+    Başka bir süreçte çalışan işin bitmesini bekle ve sonucunu döndür
+    Bekleme sırasında heartbeat'i kesilen işler (çöken süreç) requeue_stale_jobs ile kapatılır/kuyruğa alınır
+    """
+    while True:
+        job = db.get_job(job_id)
+        if job is None:
+            return {'error': 'Bağlanılan analiz bulunamadı', 'job_id': job_id}
+        if job['status'] == JOB_STATUS_SUCCEEDED:
+            return job['result'] or {'success': True, 'job_id': job_id}
+        if job['status'] == JOB_STATUS_FAILED:
+            result = job['result'] or {}
+            result.setdefault('error', job['error'] or 'Analiz başarısız')
+            result['job_id'] = job_id
+            return result
+        db.requeue_stale_jobs(WORKER_STALE_AFTER, JOB_MAX_ATTEMPTS)
+        time.sleep(poll_interval)
@@ -0,0 +1,483 @@
+import sqlite3
+import threading
+import logging
+from datetime import date, datetime
+from config import SQLITE_PATH
+from database import Database, SITE_COUNTERS_BACKFILL_SQL, JOB_STATUS_QUEUED, JOB_STATUS_RUNNING
+from metrics import timed_db_method
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.WARNING)
+
+
+def _adapt_datetime(value):
+    return value.isoformat(sep=' ')
+
+
+def _convert_datetime(value):
+    try:
+        return datetime.fromisoformat(value.decode('utf-8'))
+    except ValueError:
+        return None
+
+
+def _convert_date(value):
+    try:
+        return date.fromisoformat(value.decode('utf-8')[:10])
+    except ValueError:
+        return None
+
+
+# DATETIME/DATE sütunları SQL Server'daki gibi datetime/date nesnesi olarak okunur
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATETIME', _convert_datetime)
+sqlite3.register_converter('DATE', _convert_date)
+
+
+# SQL Server şemasıyla aynı tablo/sütun/index yapısı
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Sites (
+    SiteID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Domain NVARCHAR(255) UNIQUE NOT NULL,
+    SiteName NVARCHAR(255),
+    CreatedDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    LastScannedDate DATETIME,
+    RiskScore INT DEFAULT 0,
+    RiskModel NVARCHAR(50),
+    ScoreRevision INT NOT NULL DEFAULT 0,
+    Status NVARCHAR(50) DEFAULT 'Active'
+);
+CREATE INDEX IF NOT EXISTS IX_Sites_LastScannedDate ON Sites(LastScannedDate, SiteID);
+CREATE INDEX IF NOT EXISTS IX_Sites_RiskScore ON Sites(RiskScore, SiteID);
+
+CREATE TABLE IF NOT EXISTS Complaints (
+    ComplaintID INTEGER PRIMARY KEY AUTOINCREMENT,
+    SiteID INT REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    Source NVARCHAR(100) NOT NULL,
+    Title NVARCHAR(500),
+    Content TEXT,
+    Author NVARCHAR(255),
+    Date DATETIME,
+    Rating INT,
+    Sentiment NVARCHAR(50),
+    URL NVARCHAR(1000),
+    IsResolved BIT DEFAULT 0,
+    ScrapedDate DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS IX_Complaints_SiteID ON Complaints(SiteID);
+CREATE INDEX IF NOT EXISTS IX_Complaints_Source ON Complaints(Source);
+CREATE INDEX IF NOT EXISTS IX_Complaints_Sentiment ON Complaints(Sentiment);
+CREATE INDEX IF NOT EXISTS IX_Complaints_Date ON Complaints(Date);
+
+CREATE TABLE IF NOT EXISTS RiskAnalysis (
+    AnalysisID INTEGER PRIMARY KEY AUTOINCREMENT,
+    SiteID INT REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    TotalComplaints INT DEFAULT 0,
+    NegativeSentimentCount INT DEFAULT 0,
+    PositiveSentimentCount INT DEFAULT 0,
+    NeutralSentimentCount INT DEFAULT 0,
+    AverageRating DECIMAL(3,2),
+    RiskLevel NVARCHAR(50),
+    AnalysisDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    Details TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_RiskAnalysis_SiteID ON RiskAnalysis(SiteID);
+
+CREATE TABLE IF NOT EXISTS ScrapingHistory (
+    HistoryID INTEGER PRIMARY KEY AUTOINCREMENT,
+    SiteID INT REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    Source NVARCHAR(100),
+    Status NVARCHAR(50),
+    RecordsFound INT DEFAULT 0,
+    ErrorMessage TEXT,
+    ScrapedDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    Duration INT,
+    DurationMs INT,
+    PagesVisited INT DEFAULT 0,
+    BytesDownloaded BIGINT DEFAULT 0,
+    CacheHit BIT DEFAULT 0,
+    StageTimings TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_ScrapingHistory_SiteID ON ScrapingHistory(SiteID);
+CREATE INDEX IF NOT EXISTS IX_ScrapingHistory_ScrapedDate ON ScrapingHistory(ScrapedDate);
+
+CREATE TABLE IF NOT EXISTS ScrapingPageStats (
+    PageStatID INTEGER PRIMARY KEY AUTOINCREMENT,
+    HistoryID INT REFERENCES ScrapingHistory(HistoryID) ON DELETE CASCADE,
+    PageNumber INT,
+    URL NVARCHAR(1000),
+    StatusCode INT,
+    Bytes INT DEFAULT 0,
+    FetchMs INT,
+    ParseMs INT,
+    RecordsFound INT DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS IX_ScrapingPageStats_HistoryID ON ScrapingPageStats(HistoryID);
+
+CREATE TABLE IF NOT EXISTS ComplaintDailyStats (
+    SiteID INT NOT NULL REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    StatDate DATE NOT NULL,
+    Source NVARCHAR(100) NOT NULL,
+    Sentiment NVARCHAR(50) NOT NULL,
+    IsResolved BIT NOT NULL,
+    ComplaintCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (SiteID, StatDate, Source, Sentiment, IsResolved)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS SiteComplaintCounters (
+    SiteID INTEGER PRIMARY KEY REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    TotalCount INT NOT NULL DEFAULT 0,
+    NegativeCount INT NOT NULL DEFAULT 0,
+    PositiveCount INT NOT NULL DEFAULT 0,
+    ResolvedCount INT NOT NULL DEFAULT 0,
+    NegativeResolvedCount INT NOT NULL DEFAULT 0,
+    RatingSum BIGINT NOT NULL DEFAULT 0,
+    RatingCount INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS ScrapeJobs (
+    JobID NVARCHAR(32) PRIMARY KEY,
+    URL NVARCHAR(1000) NOT NULL,
+    Domain NVARCHAR(255),
+    Status NVARCHAR(20) NOT NULL DEFAULT 'queued',
+    Profile BIT DEFAULT 0,
+    Attempts INT NOT NULL DEFAULT 0,
+    WorkerID NVARCHAR(255),
+    CreatedDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    StartedDate DATETIME,
+    HeartbeatDate DATETIME,
+    FinishedDate DATETIME,
+    Result TEXT,
+    ErrorMessage TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_ScrapeJobs_Status ON ScrapeJobs(Status, CreatedDate);
+CREATE UNIQUE INDEX IF NOT EXISTS UX_ScrapeJobs_ActiveDomain ON ScrapeJobs(Domain) WHERE Status IN ('queued', 'running');
+
+CREATE TABLE IF NOT EXISTS SourceIdentities (
+    SiteID INT NOT NULL REFERENCES Sites(SiteID) ON DELETE CASCADE,
+    Source NVARCHAR(100) NOT NULL,
+    Identifier NVARCHAR(1000) NOT NULL,
+    ResolvedDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    VerifiedDate DATETIME DEFAULT (datetime('now', 'localtime')),
+    ExpiresDate DATETIME NOT NULL,
+    PRIMARY KEY (SiteID, Source)
+) WITHOUT ROWID;
+"""
+
+# Complaints.Title/Content için FTS5 index'i (external content: metin Complaints'te kalır).
+# Trigger'lar index'i her insert/update/delete'te güncel tutar; remove_diacritics ile "cozuldu" "çözüldü"yü bulur.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ComplaintsFts USING fts5(
+    Title, Content,
+    content='Complaints', content_rowid='ComplaintID',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS Complaints_FtsInsert AFTER INSERT ON Complaints BEGIN
+    INSERT INTO ComplaintsFts(rowid, Title, Content) VALUES (new.ComplaintID, new.Title, new.Content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS Complaints_FtsDelete AFTER DELETE ON Complaints BEGIN
+    INSERT INTO ComplaintsFts(ComplaintsFts, rowid, Title, Content) VALUES ('delete', old.ComplaintID, old.Title, old.Content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS Complaints_FtsUpdate AFTER UPDATE OF Title, Content ON Complaints BEGIN
+    INSERT INTO ComplaintsFts(ComplaintsFts, rowid, Title, Content) VALUES ('delete', old.ComplaintID, old.Title, old.Content);
+    INSERT INTO ComplaintsFts(rowid, Title, Content) VALUES (new.ComplaintID, new.Title, new.Content);
+END;
+"""
+
+
+class SqliteDatabase(Database):
+    """
+    SQLite depolama katmanı (Database arayüzünün aynısı).
+
+    WAL modunda çalışır: okuyucular yazıcıyı beklemez. sqlite3 bağlantıları
+    thread'ler arasında paylaşılmadığı için pool her thread'e ayrı bağlantı tutar.
+    """
+
+    backend_name = 'SQLite'
+    NOW_SQL = "datetime('now', 'localtime')"
+    DATETIME_PARAM_SQL = '?'
+
+    def __init__(self, use_pool=True, path=None, read_only=False):
+        super().__init__(use_pool=use_pool, read_only=read_only)
+        self.path = path or SQLITE_PATH
+        self.connection_string = self.path
+
+    @property
+    def pool_key(self):
+        suffix = ':read' if self.read_only else ''
+        return f"sqlite:{self.path}:{threading.get_ident()}{suffix}"
+
+    @pool_key.setter
+    def pool_key(self, value):
+        # Database.__init__ SQL Server anahtarını atar; SQLite anahtarı thread'e göre hesaplanır
+        pass
+
+    def _open_connection(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL ile güvenli ve hızlı
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _prepare_read_connection(self, conn):
+        # WAL modunda okuyucular zaten kendi snapshot'ını görür ve yazıcıyı beklemez
+        conn.execute("PRAGMA query_only=ON")
+    
+    def _insert_returning_id(self, cursor, table, columns, params, id_column):
+        placeholders = ', '.join('?' for _ in columns)
+        cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", params)
+        return cursor.lastrowid
+
+    def _prepare_bulk_cursor(self, cursor):
+        # sqlite3 executemany zaten tek hazırlanmış ifadeyle çalışır
+        pass
+
+    def _daily_stats_upsert_sql(self):
+        return """
+            INSERT INTO ComplaintDailyStats (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (SiteID, StatDate, Source, Sentiment, IsResolved)
+            DO UPDATE SET ComplaintCount = ComplaintCount + excluded.ComplaintCount
+        """
+
+    def _site_counters_upsert_sql(self):
+        return """
+            INSERT INTO SiteComplaintCounters
+                (SiteID, TotalCount, NegativeCount, PositiveCount, ResolvedCount, NegativeResolvedCount, RatingSum, RatingCount)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (SiteID) DO UPDATE SET
+                TotalCount = TotalCount + excluded.TotalCount,
+                NegativeCount = NegativeCount + excluded.NegativeCount,
+                PositiveCount = PositiveCount + excluded.PositiveCount,
+                ResolvedCount = ResolvedCount + excluded.ResolvedCount,
+                NegativeResolvedCount = NegativeResolvedCount + excluded.NegativeResolvedCount,
+                RatingSum = RatingSum + excluded.RatingSum,
+                RatingCount = RatingCount + excluded.RatingCount
+        """
+
+    def _claim_job_sql(self):
+        # SQLite tek yazıcılıdır: UPDATE ... RETURNING atomik, satır kilidi gerekmez
+        return f"""
+            UPDATE ScrapeJobs
+            SET Status = '{JOB_STATUS_RUNNING}', WorkerID = ?, Attempts = Attempts + 1,
+                StartedDate = {self.NOW_SQL}, HeartbeatDate = {self.NOW_SQL}
+            WHERE JobID = (
+                SELECT JobID FROM ScrapeJobs WHERE Status = '{JOB_STATUS_QUEUED}' ORDER BY CreatedDate LIMIT 1
+            )
+            RETURNING JobID, URL, Profile, Attempts
+        """
+
+    def _source_identity_upsert_sql(self):
+        return """
+            INSERT INTO SourceIdentities (SiteID, Source, Identifier, ResolvedDate, VerifiedDate, ExpiresDate)
+            VALUES (?, ?, ?, datetime('now', 'localtime'), datetime('now', 'localtime'),
+                    datetime('now', 'localtime', ? || ' days'))
+            ON CONFLICT (SiteID, Source) DO UPDATE SET
+                ResolvedDate = CASE WHEN Identifier = excluded.Identifier THEN ResolvedDate ELSE excluded.ResolvedDate END,
+                Identifier = excluded.Identifier,
+                VerifiedDate = excluded.VerifiedDate,
+                ExpiresDate = excluded.ExpiresDate
+        """
+
+    def _seconds_ago_sql(self):
+        return "datetime('now', 'localtime', '-' || ? || ' seconds')"
+
+    def _paginate_sql(self, limit, offset):
+        return "LIMIT ? OFFSET ?", [limit, offset]
+    
+    def _search_condition(self, terms):
+        # FTS5: her terim önek eşleşmesiyle ("kargo"* -> kargoya, kargom...), terimler arası AND.
+        # CROSS JOIN sorguyu FTS index'inden başlatır (planlayıcı IX_Complaints_Source'u seçip
+        # her satırda MATCH çalıştırmasın); rowid DESC sıralaması ek sıralama adımı gerektirmez
+        match_query = ' AND '.join(f'"{term}"*' for term in terms)
+        return ("ComplaintsFts f CROSS JOIN Complaints c ON c.ComplaintID = f.rowid",
+                "ComplaintsFts MATCH ?", [match_query], "f.rowid DESC")
+    
+    def _capped_count_sql(self, from_sql):
+        return f"SELECT COUNT(*) FROM (SELECT 1 {from_sql} LIMIT ?)"
+    
+    def _column_exists(self, table, column):
+        cursor = self.conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in cursor.fetchall()}
+        cursor.close()
+        return column in columns
+
+    def _table_exists(self, table):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        exists = cursor.fetchone()[0] > 0
+        cursor.close()
+        return exists
+
+    def _add_missing_columns(self, table, columns):
+        for column, definition in columns:
+            if not self._column_exists(table, column):
+                cursor = self.conn.cursor()
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                cursor.close()
+
+    @timed_db_method
+    def create_tables(self):
+        """Veritabanı tablolarını oluştur"""
+        try:
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+            logger.info("✓ Tablolar başarıyla oluşturuldu")
+            return True
+        except Exception as e:
+            logger.error(f"Tablo oluşturma hatası: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+
+    @timed_db_method
+    def migrate_add_isresolved_column(self):
+        """Complaints tablosuna IsResolved sütunu ekle (migration)"""
+        try:
+            if not self._table_exists('Complaints'):
+                logger.warning("Complaints tablosu bulunamadı, önce tabloyu oluşturun")
+                return False
+            self._add_missing_columns('Complaints', [('IsResolved', 'BIT DEFAULT 0')])
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"IsResolved sütunu eklenirken hata: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+
+    @timed_db_method
+    def migrate_add_scraping_telemetry(self):
+        """ScrapingHistory tablosuna telemetri sütunlarını ve ScrapingPageStats tablosunu ekle (migration)"""
+        try:
+            self._add_missing_columns('ScrapingHistory', [
+                ('DurationMs', 'INT'),
+                ('PagesVisited', 'INT DEFAULT 0'),
+                ('BytesDownloaded', 'BIGINT DEFAULT 0'),
+                ('CacheHit', 'BIT DEFAULT 0'),
+                ('StageTimings', 'TEXT'),
+            ])
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Scraping telemetri migration hatası: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_daily_stats(self):
+        """ComplaintDailyStats tablosunu oluştur ve boşsa mevcut şikayetlerden doldur (migration)"""
+        try:
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.execute("""
+                INSERT INTO ComplaintDailyStats (SiteID, StatDate, Source, Sentiment, IsResolved, ComplaintCount)
+                SELECT SiteID, date(COALESCE(Date, ScrapedDate)), Source,
+                       COALESCE(Sentiment, 'neutral'), COALESCE(IsResolved, 0), COUNT(*)
+                FROM Complaints
+                WHERE SiteID IS NOT NULL AND NOT EXISTS (SELECT 1 FROM ComplaintDailyStats)
+                GROUP BY 1, 2, 3, 4, 5
+            """)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Günlük şikayet sayaçları migration hatası: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_risk_counters(self):
+        """
+        Sites.RiskModel/ScoreRevision sütunlarını ve SiteComplaintCounters tablosunu ekle,
+        boşsa mevcut şikayetlerden doldur (migration)
+        """
+        try:
+            self._add_missing_columns('Sites', [('RiskModel', 'NVARCHAR(50)'), ('ScoreRevision', 'INT NOT NULL DEFAULT 0')])
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.execute(SITE_COUNTERS_BACKFILL_SQL)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Risk sayaçları migration hatası: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_scrape_jobs(self):
+        """ScrapeJobs iş kuyruğu tablosunu ekle (migration)"""
+        try:
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"İş kuyruğu migration hatası: {str(e)}")
+            return False
+    
+    @timed_db_method
+    def migrate_add_source_identities(self):
+        """SourceIdentities tablosunu ekle (migration)"""
+        try:
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Kaynak tanımlayıcıları migration hatası: {str(e)}")
+            return False
+    
+    @timed_db_method
+    def migrate_add_fulltext_search(self):
+        """Complaints için FTS5 index'i ve trigger'ları oluştur, mevcut kayıtları index'le (migration)"""
+        try:
+            existed = self._table_exists('ComplaintsFts')
+            self.conn.executescript(FTS_SCHEMA)
+            if not existed:
+                self.conn.execute("INSERT INTO ComplaintsFts(ComplaintsFts) VALUES ('rebuild')")
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"FTS5 index oluşturma hatası: {str(e)}")
+            try:
+                self.conn.rollback()
+            except:
+                pass
+            return False
+    
+    @timed_db_method
+    def migrate_add_site_list_indexes(self):
+        """Sites üzerine /api/sites filtre ve sıralama index'lerini ekle (migration)"""
+        try:
+            self.conn.executescript(SCHEMA)  # Eksik tablo/index'leri oluştur (IF NOT EXISTS)
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Site listesi index migration hatası: {str(e)}")
+            return False
+    
+    @timed_db_method
+    def migrate_enable_snapshot_isolation(self):
+        """SQLite WAL modunda okumalar zaten snapshot üzerinden yapılır"""
+        return True
@@ -0,0 +1,25 @@
+"""
+Testler SQLite backend'iyle çalışır (SQL Server gerekmez).
+
+Çalıştırma (backend dizininden):
+    python -m pytest tests
+"""
+import os
+import sys
+
+os.environ.setdefault('DB_BACKEND', 'sqlite')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Geçici dosyada, tabloları oluşturulmuş SQLite veritabanı"""
+    from sqlite_database import SqliteDatabase
+
+    database = SqliteDatabase(use_pool=False, path=str(tmp_path / 'test.db'))
+    assert database.connect()
+    assert database.create_tables()
+    yield database
+    database.close(force=True)
@@ -0,0 +1,49 @@
+"""Kaynak devre kesicisi: art arda boş dönen kayıtlı kaynak atlanmalı"""
+import pytest
+
+import circuit_breaker
+import scraper_service
+from scrapers import base_scraper
+from scrapers.base_scraper import BaseScraper
+
+THRESHOLD = 3
+
+
+class EmptyScraper(BaseScraper):
+    """Kayıtlı sayfası indirilen ama kayıt parse edilemeyen kaynak (sayfa yapısı değişmiş)"""
+    source_name = 'fake'
+
+    def __init__(self, cache_dir):
+        super().__init__()
+        self.veriler_dir = str(cache_dir)
+        self.response_cache = None
+        self.calls = 0
+
+    def scrape(self, domain, site_name):
+        self.calls += 1
+        self.record_page(self.known_identity, 200)
+        return []
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_scraper, 'NEGATIVE_CACHE_TTL', 3600)
+    registry = circuit_breaker.CircuitBreakerRegistry(threshold=THRESHOLD, cooldown=3600)
+    monkeypatch.setattr(scraper_service, 'breakers', registry)
+    service = scraper_service.ScraperService.__new__(scraper_service.ScraperService)
+    service.source_names = ['fake']
+    service._scrapers = {'fake': EmptyScraper(tmp_path)}
+    return service
+
+
+def test_identity_backed_empty_runs_open_breaker(service):
+    identities = {'fake': 'https://kaynak.test/firma'}
+    for _ in range(THRESHOLD):
+        _, stats = service.scrape_all_sources('ornek.com', 'Ornek', identities)
+        assert not stats['fake']['negative_cache_hit']
+
+    assert scraper_service.breakers.get('fake').state == circuit_breaker.STATE_OPEN
+
+    _, stats = service.scrape_all_sources('ornek.com', 'Ornek', identities)
+    assert stats['fake']['circuit_open']
+    assert service._scrapers['fake'].calls == THRESHOLD
@@ -0,0 +1,37 @@
+"""Günlük şikayet trendi: save_complaints sayaçları ComplaintDailyStats'a yazar, trend sorgusu boş günleri doldurur"""
+from datetime import date, datetime
+
+from models import Complaint
+
+
+def test_trend_after_save_complaints(db):
+    site_id = db.get_or_create_site('ornek.com')
+    first = [
+        Complaint(title='a', source='sikayetvar', sentiment='negative', date=datetime(2024, 3, 1, 9, 30)),
+        Complaint(title='b', source='sikayetvar', sentiment='negative', date=datetime(2024, 3, 1, 18, 0),
+                  is_resolved=True),
+        Complaint(title='c', source='trustpilot', sentiment='positive', date=datetime(2024, 3, 3)),
+        Complaint(title='d', source='trustpilot', date=datetime(2024, 2, 20)),  # Aralık dışı
+    ]
+    second = [Complaint(title='e', source='sikayetvar', sentiment='negative', date=datetime(2024, 3, 1, 12, 0))]
+    assert db.save_complaints(site_id, first) == 4
+    assert db.save_complaints(site_id, second) == 1  # Var olan gün sayacı artırılır
+
+    trend = db.get_complaint_trend(site_id, date(2024, 3, 1), date(2024, 3, 3))
+    assert [day['date'] for day in trend] == [date(2024, 3, 1), date(2024, 3, 2), date(2024, 3, 3)]
+    assert trend[0] == {'date': date(2024, 3, 1), 'total': 3, 'negative': 3, 'positive': 0, 'neutral': 0,
+                        'resolved': 1, 'unresolved': 2, 'sources': {'sikayetvar': 3}}
+    assert trend[1]['total'] == 0 and trend[1]['sources'] == {}
+    assert trend[2]['positive'] == 1 and trend[2]['sources'] == {'trustpilot': 1}
+
+
+def test_trend_source_filter_and_undated_complaints(db):
+    site_id = db.get_or_create_site('ornek.com')
+    complaints = [Complaint(title='a', source='sikayetvar'), Complaint(title='b', source='trustpilot')]
+    assert db.save_complaints(site_id, complaints) == 2
+
+    # Tarihi olmayan şikayetler kaydedildikleri güne yazılır
+    today = datetime.now().date()
+    trend = db.get_complaint_trend(site_id, today, today, sources=['trustpilot'])
+    assert trend == [{'date': today, 'total': 1, 'negative': 0, 'positive': 0, 'neutral': 1,
+                      'resolved': 0, 'unresolved': 1, 'sources': {'trustpilot': 1}}]
@@ -0,0 +1,36 @@
+"""Yakın kopya tespiti: eşik, kaynaklar arası birleştirme ve kısa metinler"""
+from dedup import find_duplicate_groups
+from models import Complaint
+
+TEXT = 'siparişim iki haftadır kargoya verilmedi müşteri hizmetleri de hiç cevap vermiyor'
+NEAR = 'siparişim iki haftadır kargoya verilmedi müşteri hizmetleri de hiç cevap vermiyor artık'
+OTHER = 'ürün kutusu hasarlı geldi iade talebim de reddedildi paramı geri alamadım'
+
+
+def complaint(content, source):
+    return Complaint(title='', content=content, source=source)
+
+
+def test_threshold():
+    complaints = [complaint(TEXT, 'sikayetvar'), complaint(NEAR, 'trustpilot'), complaint(OTHER, 'google')]
+    assert find_duplicate_groups(complaints, threshold=0.6) == {0: [1]}
+    assert find_duplicate_groups(complaints, threshold=1.0) == {}
+
+
+def test_same_source_copies_are_not_merged():
+    complaints = [complaint(TEXT, 'sikayetvar'), complaint(TEXT, 'sikayetvar')]
+    assert find_duplicate_groups(complaints, cross_source_only=True) == {}
+    assert find_duplicate_groups(complaints, cross_source_only=False) == {0: [1]}
+
+
+def test_cross_source_group_has_one_record_per_source():
+    # A~B ve B~C: aynı kaynaktaki A ile C, B üzerinden aynı gruba girmemeli
+    for text_c in (TEXT, NEAR + ' hâlâ'):
+        complaints = [complaint(TEXT, 'sikayetvar'), complaint(NEAR, 'trustpilot'), complaint(text_c, 'sikayetvar')]
+        assert find_duplicate_groups(complaints, cross_source_only=True) == {0: [1]}
+
+
+def test_short_text_is_not_compared():
+    complaints = [complaint('kargo gelmedi', 'sikayetvar'), complaint('kargo gelmedi', 'trustpilot')]
+    assert find_duplicate_groups(complaints, min_tokens=6) == {}
+    assert find_duplicate_groups(complaints, min_tokens=1) == {0: [1]}
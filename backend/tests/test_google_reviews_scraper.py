@@ -0,0 +1,84 @@
+"""Google Reviews: kayıtlı place URL'i boş dönünce Maps araması aynı (açık) driver'la yapılmalı"""
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.webdriver.support import ui  # noqa: E402
+
+from scrapers import google_reviews_scraper  # noqa: E402
+from scrapers.google_reviews_scraper import GoogleReviewsScraper  # noqa: E402
+
+STALE_URL = 'https://www.google.com/maps/place/Eski+Isletme'
+PLACE_URL = 'https://www.google.com/maps/place/Ornek'
+
+
+class FakeDriver:
+    """Yorum içermeyen sayfalar döndüren, quit() sonrası kullanılamayan driver"""
+
+    def __init__(self):
+        self.url = 'about:blank'
+        self.quit_calls = 0
+
+    def _check_alive(self):
+        if self.quit_calls:
+            raise RuntimeError('driver kapatıldı')
+
+    @property
+    def current_url(self):
+        self._check_alive()
+        return self.url
+
+    def get(self, url):
+        self._check_alive()
+        self.url = url
+
+    def find_element(self, *args):
+        self._check_alive()
+        raise LookupError('eleman yok')
+
+    def find_elements(self, *args):
+        self._check_alive()
+        return []
+
+    def execute_script(self, *args):
+        self._check_alive()
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeWait:
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        raise TimeoutError('eleman yok')
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(google_reviews_scraper.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(ui, 'WebDriverWait', FakeWait)
+    scraper = GoogleReviewsScraper()
+    scraper.veriler_dir = str(tmp_path)
+    scraper.driver = FakeDriver()
+    monkeypatch.setattr(scraper, 'get_selenium_driver', lambda: (scraper.driver, None, None, None, None, None))
+    return scraper
+
+
+def test_stale_known_url_falls_back_to_search_with_live_driver(scraper, monkeypatch):
+    searched_with = []
+
+    def find_place(driver, domain, site_name):
+        searched_with.append(driver.quit_calls)
+        driver.get(PLACE_URL)
+        return PLACE_URL
+
+    monkeypatch.setattr(scraper, 'find_google_maps_place_url', find_place)
+
+    _, stats = scraper.run('ornek.com', 'Ornek', identity=STALE_URL)
+
+    assert searched_with == [0]  # Arama, kayıtlı URL denemesinden sonra kapatılmamış driver'la yapıldı
+    assert [page['url'] for page in stats['pages']] == [STALE_URL, PLACE_URL]
+    assert not stats['failure_reason']
+    assert scraper.driver.quit_calls == 1
@@ -0,0 +1,64 @@
+"""/api/sites keyset sayfalama: hiç taranmamış (LastScannedDate NULL) siteler sayfalar arasında kaybolmamalı"""
+from datetime import datetime
+
+import pytest
+
+# (domain, LastScannedDate, RiskScore); eşit tarih/skorlar SiteID ile sıralanır
+SITES = [
+    ('a.com', datetime(2024, 5, 3), 40),
+    ('b.com', None, 10),
+    ('c.com', datetime(2024, 5, 1), 80),
+    ('d.com', None, None),
+    ('e.com', datetime(2024, 5, 3), 40),
+    ('f.com', None, 90),
+    ('g.com', datetime(2024, 5, 2), None),
+]
+SORT_VALUE = {'last_scanned': 3, 'risk_score': 2, 'domain': 0}
+
+
+@pytest.fixture
+def sites(db):
+    cursor = db.conn.cursor()
+    for domain, scanned, score in SITES:
+        site_id = db.get_or_create_site(domain)
+        cursor.execute("UPDATE Sites SET LastScannedDate = ?, RiskScore = ? WHERE SiteID = ?", (scanned, score, site_id))
+    db.conn.commit()
+    cursor.close()
+    return db
+
+
+def walk(db, sort, limit, **filters):
+    """Tüm sayfaları imleçle dolaş (app.py gibi limit+1 satır okuyarak); sayfa domain listelerini döndür"""
+    pages, after = [], None
+    while True:
+        rows = db.list_sites(limit + 1, sort=sort, after=after, **filters)
+        pages.append([row[0] for row in rows[:limit]])
+        if len(rows) <= limit:
+            return pages
+        last = rows[limit - 1]
+        after = (last[SORT_VALUE[sort]], last[4])
+
+
+@pytest.mark.parametrize('sort, expected', [
+    ('last_scanned', ['e.com', 'a.com', 'g.com', 'c.com', 'f.com', 'd.com', 'b.com']),
+    ('risk_score', ['f.com', 'c.com', 'e.com', 'a.com', 'b.com', 'g.com', 'd.com']),
+    ('domain', ['a.com', 'b.com', 'c.com', 'd.com', 'e.com', 'f.com', 'g.com']),
+])
+@pytest.mark.parametrize('limit', [1, 2, 3, 7])
+def test_pages_cover_every_site_once(sites, sort, expected, limit):
+    pages = walk(sites, sort, limit)
+    assert [domain for page in pages for domain in page] == expected
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_cursor_inside_null_tail(sites):
+    # İmleç NULL tarihli bir satırdaysa sayfa sadece kalan NULL satırlardan devam eder
+    site_ids = {row[0]: row[4] for row in sites.list_sites(10)}
+    rows = sites.list_sites(10, after=(None, site_ids['f.com']))
+    assert [row[0] for row in rows] == ['d.com', 'b.com']
+
+
+def test_filters_with_cursor(sites):
+    assert walk(sites, 'last_scanned', 1, scanned_from=datetime(2024, 5, 2)) == [['e.com'], ['a.com'], ['g.com']]
+    assert walk(sites, 'risk_score', 2, risk_min=40) == [['f.com', 'c.com'], ['e.com', 'a.com']]
+    assert walk(sites, 'domain', 1, domain_prefix='f') == [['f.com']]
@@ -0,0 +1,55 @@
+"""Negatif cache sadece kaynakta bulunamayan domain'ler için yazılmalı"""
+import pytest
+
+from scrapers import base_scraper
+from scrapers.base_scraper import BaseScraper
+
+
+class FakeScraper(BaseScraper):
+    source_name = 'fake'
+
+    def __init__(self, cache_dir, outcome):
+        super().__init__()
+        self.veriler_dir = str(cache_dir)
+        self.response_cache = None
+        self.outcome = outcome
+        self.calls = 0
+
+    def scrape(self, domain, site_name):
+        self.calls += 1
+        if self.outcome == 'not_listed':
+            self.record_page('https://kaynak.test/firma', 404)
+            if self.pages_not_found():
+                self.note_not_listed()
+        elif self.outcome == 'empty_page':
+            self.record_page('https://kaynak.test/firma', 200)  # Sayfa indi ama kayıt parse edilemedi
+        return []
+
+
+@pytest.fixture(autouse=True)
+def negative_cache_ttl(monkeypatch):
+    monkeypatch.setattr(base_scraper, 'NEGATIVE_CACHE_TTL', 3600)
+
+
+def test_not_listed_is_negative_cached(tmp_path):
+    scraper = FakeScraper(tmp_path, 'not_listed')
+    scraper.run('ornek.com', 'Ornek')
+    _, stats = scraper.run('ornek.com', 'Ornek')
+    assert stats['negative_cache_hit']
+    assert scraper.calls == 1
+
+
+def test_empty_page_is_not_negative_cached(tmp_path):
+    scraper = FakeScraper(tmp_path, 'empty_page')
+    scraper.run('ornek.com', 'Ornek')
+    _, stats = scraper.run('ornek.com', 'Ornek')
+    assert not stats['negative_cache_hit']
+    assert scraper.calls == 2
+
+
+def test_known_identity_is_not_negative_cached(tmp_path):
+    scraper = FakeScraper(tmp_path, 'not_listed')
+    scraper.run('ornek.com', 'Ornek', identity='https://kaynak.test/firma')
+    _, stats = scraper.run('ornek.com', 'Ornek')
+    assert not stats['negative_cache_hit']
+    assert scraper.calls == 2
@@ -0,0 +1,70 @@
+"""HTTP yanıt cache'i: eski gövdeler ve süresi dolan kayıtlar temizlenmeli"""
+import os
+import time
+
+from scrapers.response_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, content, etag):
+        self.content = content
+        self.headers = {'ETag': etag}
+
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def _object_count(cache):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(cache.directory, 'objects')))
+
+
+def test_sweep_removes_replaced_body(tmp_path):
+    cache = ResponseCache(str(tmp_path), sweep_interval=0)
+    old_hash = cache.store('https://kaynak.test/a', FakeResponse(b'eski', '"1"'))
+    _age(cache._object_path(old_hash), 2 * ResponseCache.SWEEP_GRACE_SECONDS)
+    new_hash = cache.store('https://kaynak.test/a', FakeResponse(b'yeni', '"2"'))
+
+    removed = cache.sweep()
+
+    assert removed['objects'] == 1
+    assert not os.path.exists(cache._object_path(old_hash))
+    assert os.path.exists(cache._object_path(new_hash))
+
+
+def test_sweep_expires_stale_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_days=1, sweep_interval=0)
+    body_hash = cache.store('https://kaynak.test/a', FakeResponse(b'govde', '"1"'))
+    _age(cache._index_path('https://kaynak.test/a'), 2 * 24 * 3600)
+    _age(cache._object_path(body_hash), 2 * 24 * 3600)
+
+    cache.sweep()
+
+    assert cache.lookup('https://kaynak.test/a') is None
+    assert _object_count(cache) == 0
+
+
+def test_sweep_enforces_size_cap(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_mb=1, sweep_interval=0)
+    for i in range(3):
+        url = f"https://kaynak.test/{i}"
+        cache.store(url, FakeResponse(bytes([i]) * 600 * 1024, f'"{i}"'))
+        _age(cache._index_path(url), 100 - i)  # 0 en eski
+
+    cache.sweep()
+
+    assert cache.lookup('https://kaynak.test/0') is None
+    assert cache.lookup('https://kaynak.test/1') is None
+    assert cache.lookup('https://kaynak.test/2') is not None
+    assert _object_count(cache) == 1
+
+
+def test_store_sweeps_at_most_once_per_interval(tmp_path):
+    cache = ResponseCache(str(tmp_path), sweep_interval=3600)
+    cache.store('https://kaynak.test/a', FakeResponse(b'govde', '"1"'))
+    marker = os.path.join(str(tmp_path), '.last_sweep')
+    assert os.path.exists(marker)
+    first = os.path.getmtime(marker)
+    cache.store('https://kaynak.test/b', FakeResponse(b'diger', '"2"'))
+    assert os.path.getmtime(marker) == first
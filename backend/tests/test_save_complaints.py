@@ -0,0 +1,33 @@
+"""Toplu şikayet kaydı: hatalı satır taramanın diğer şikayetlerini kaybettirmemeli"""
+from models import Complaint
+
+
+def _count_complaints(db, site_id):
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM Complaints WHERE SiteID = ?", (site_id,))
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def test_bad_row_does_not_discard_batch(db):
+    site_id = db.get_or_create_site('ornek.com')
+    complaints = [Complaint(title=f"Şikayet {i}", content='içerik', source='sikayetvar', sentiment='negative')
+                  for i in range(5)]
+    complaints[2].date = object()  # Veritabanına yazılamayan değer
+
+    assert db.save_complaints(site_id, complaints) == 4
+    assert _count_complaints(db, site_id) == 4
+
+    counters = db.get_site_counters(site_id)
+    assert counters.total == 4
+    assert counters.negative == 4
+
+
+def test_batch_saves_all_rows(db):
+    site_id = db.get_or_create_site('ornek.com')
+    complaints = [Complaint(title=f"Şikayet {i}", source='trustpilot') for i in range(3)]
+
+    assert db.save_complaints(site_id, complaints) == 3
+    assert _count_complaints(db, site_id) == 3
+    assert db.get_site_counters(site_id).total == 3
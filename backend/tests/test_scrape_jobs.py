@@ -0,0 +1,14 @@
+"""ScrapeJobs kuyruğu: scrape_jobs_queued sadece bekleyen işleri saymalı"""
+import metrics
+
+
+def test_count_queued_jobs(db, monkeypatch):
+    for i, domain in enumerate(('bir.com', 'iki.com', 'uc.com')):
+        db.enqueue_job(f"job{i}", f"https://{domain}", domain)
+    assert db.enqueue_job('job9', 'https://bir.com', 'bir.com') == ('job0', False)  # Aynı domain'e bağlanır
+    assert db.claim_job('worker-1')
+
+    assert db.count_queued_jobs() == 2
+
+    monkeypatch.setattr(metrics.SCRAPE_JOBS_QUEUED, '_callback', db.count_queued_jobs)
+    assert 'scrape_jobs_queued 2' in metrics.render().splitlines()
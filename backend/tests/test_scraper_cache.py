@@ -0,0 +1,54 @@
+"""Scraper txt cache'i SCRAPER_CACHE_TTL sonunda okunmamalı (kaynak yeniden, koşullu istekle taranır)"""
+import os
+import time
+
+import pytest
+
+from models import Complaint
+from scrapers import base_scraper
+from scrapers.base_scraper import BaseScraper
+
+
+class CachingScraper(BaseScraper):
+    source_name = 'fake'
+
+    def __init__(self, cache_dir):
+        super().__init__()
+        self.veriler_dir = str(cache_dir)
+        self.response_cache = None
+        self.calls = 0
+
+    def scrape(self, domain, site_name):
+        cached = self.check_cache(domain, 'fake')
+        if cached:
+            return cached
+        self.calls += 1
+        results = [Complaint(title='Şikayet', content='içerik', source='fake')]
+        self.save_to_cache(domain, 'fake', site_name, results)
+        return results
+
+
+@pytest.fixture(autouse=True)
+def scraper_cache_ttl(monkeypatch):
+    monkeypatch.setattr(base_scraper, 'SCRAPER_CACHE_TTL', 3600)
+
+
+def test_fresh_cache_is_used(tmp_path):
+    scraper = CachingScraper(tmp_path)
+    scraper.run('ornek.com', 'Ornek')
+    results, stats = scraper.run('ornek.com', 'Ornek')
+    assert stats['cache_hit']
+    assert results[0].cached
+    assert scraper.calls == 1
+
+
+def test_expired_cache_is_rescraped(tmp_path):
+    scraper = CachingScraper(tmp_path)
+    scraper.run('ornek.com', 'Ornek')
+    old = time.time() - 7200
+    os.utime(scraper.get_cache_path('ornek.com', 'fake'), (old, old))
+
+    results, stats = scraper.run('ornek.com', 'Ornek')
+    assert not stats['cache_hit']
+    assert not results[0].cached
+    assert scraper.calls == 2
@@ -0,0 +1,53 @@
+"""ScraperService thread'ler arasında paylaşılır: eşzamanlı analizler birbirinin bağlantısını bozmamalı"""
+import threading
+
+import pytest
+
+import circuit_breaker
+import scraper_service
+import sqlite_database
+from models import Complaint
+from scrapers.base_scraper import BaseScraper
+
+
+class BarrierScraper(BaseScraper):
+    """İki analiz de veritabanına bağlanıp scraping'e gelene kadar bekleyen kaynak"""
+    source_name = 'fake'
+
+    def __init__(self, cache_dir, barrier):
+        super().__init__()
+        self.veriler_dir = str(cache_dir)
+        self.response_cache = None
+        self.barrier = barrier
+
+    def scrape(self, domain, site_name):
+        self.barrier.wait(timeout=10)
+        return [Complaint(title=f"{domain} şikayet {i}", content='içerik', sentiment='negative') for i in range(3)]
+
+
+@pytest.fixture
+def service(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_database, 'SQLITE_PATH', db.path)
+    monkeypatch.setattr(scraper_service, 'breakers', circuit_breaker.CircuitBreakerRegistry(threshold=0, cooldown=0))
+    service = scraper_service.ScraperService()
+    service.source_names = ['fake']
+    service._scrapers = {'fake': BarrierScraper(tmp_path, threading.Barrier(2))}
+    return service
+
+
+def test_concurrent_process_site(service, db):
+    results = {}
+
+    def analyze(domain):
+        results[domain] = service.process_site(f"https://{domain}")
+
+    threads = [threading.Thread(target=analyze, args=(domain,)) for domain in ('bir.com', 'iki.com')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    for domain in ('bir.com', 'iki.com'):
+        assert results[domain].get('success'), results[domain]
+        assert results[domain]['saved_count'] == 3
+        assert db.get_site_counters(db.get_or_create_site(domain)).total == 3
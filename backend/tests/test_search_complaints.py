@@ -0,0 +1,64 @@
+"""Şikayet araması (/api/search): terim, kaynak ve tarih filtreleri, sayfalama ve sayım sınırı"""
+from datetime import datetime
+
+import pytest
+
+from models import Complaint
+
+
+@pytest.fixture
+def searchable(db):
+    assert db.migrate_add_fulltext_search()  # Uygulama açılışındaki migration (create_tables FTS index'ini kurmaz)
+    site_id = db.get_or_create_site('ornek.com')
+    complaints = [
+        Complaint(title=f"Kargo gecikmesi {i}", content='Siparişim kargoya verilmedi', source=source,
+                  date=datetime(2024, 1, day))
+        for i, (source, day) in enumerate([('sikayetvar', 5), ('trustpilot', 10), ('sikayetvar', 15),
+                                           ('trustpilot', 20), ('sikayetvar', 25)])
+    ]
+    complaints.append(Complaint(title='İade', content='Para iadesi yapılmadı', source='sikayetvar',
+                                date=datetime(2024, 1, 12)))
+    assert db.save_complaints(site_id, complaints) == 6
+    return db
+
+
+def titles(results):
+    return [result['title'] for result in results]
+
+
+def test_prefix_terms_and_newest_first(searchable):
+    results, total, capped = searchable.search_complaints('kargo')
+    assert (total, capped) == (5, False)
+    assert titles(results) == [f"Kargo gecikmesi {i}" for i in (4, 3, 2, 1, 0)]
+    assert results[0]['domain'] == 'ornek.com'
+
+    assert searchable.search_complaints('kargo iade') == ([], 0, False)
+    assert searchable.search_complaints('!!!') == ([], 0, False)
+
+
+def test_source_and_date_filters(searchable):
+    results, total, _ = searchable.search_complaints('kargo', sources=['trustpilot'])
+    assert total == 2
+    assert {result['source'] for result in results} == {'trustpilot'}
+
+    # date_to hariç
+    results, total, _ = searchable.search_complaints('kargo', date_from=datetime(2024, 1, 10),
+                                                     date_to=datetime(2024, 1, 20))
+    assert total == 2
+    assert titles(results) == ['Kargo gecikmesi 2', 'Kargo gecikmesi 1']
+
+
+def test_paging_and_count_cap(searchable):
+    pages = [searchable.search_complaints('kargo', limit=2, offset=offset) for offset in (0, 2, 4, 6)]
+    assert [titles(results) for results, _, _ in pages] == [
+        ['Kargo gecikmesi 4', 'Kargo gecikmesi 3'],
+        ['Kargo gecikmesi 2', 'Kargo gecikmesi 1'],
+        ['Kargo gecikmesi 0'],
+        [],
+    ]
+    assert {total for _, total, _ in pages} == {5}
+
+    # Sınır sadece sayımı keser; sınırın ötesindeki sayfalar boş döner
+    assert searchable.search_complaints('kargo', limit=2, max_count=3)[1:] == (3, True)
+    assert searchable.search_complaints('kargo', limit=2, offset=4, max_count=3) == ([], 3, True)
+    assert searchable.search_complaints('kargo', max_count=5)[1:] == (5, False)
@@ -0,0 +1,94 @@
+"""SingleFlight: aynı anahtarla eşzamanlı gelen çağrılar tek çalıştırmanın sonucunu paylaşmalı"""
+import threading
+
+import pytest
+
+from single_flight import SingleFlight
+
+FOLLOWERS = 4
+
+
+class CountingEvent(threading.Event):
+    """wait() çağıran thread'leri sayan Event (takipçiler beklemeye girince lider bırakılır)"""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Semaphore(0)
+
+    def wait(self, timeout=None):
+        self.waiting.release()
+        return super().wait(timeout)
+
+
+def run_concurrently(flight, func):
+    """Lider func içindeyken FOLLOWERS takipçi bağlanır; her çağrının (sonuç, paylaşıldı) veya hatası döner"""
+    started = threading.Event()
+    release = threading.Event()
+    outcomes = []
+    lock = threading.Lock()
+
+    def leader_func():
+        flight._calls['ornek.com'].done = CountingEvent()
+        started.set()
+        assert release.wait(timeout=10)
+        return func()
+
+    def call(target):
+        try:
+            outcome = flight.do('ornek.com', target)
+        except Exception as e:
+            outcome = e
+        with lock:
+            outcomes.append(outcome)
+
+    leader = threading.Thread(target=call, args=(leader_func,))
+    leader.start()
+    assert started.wait(timeout=10)
+    followers = [threading.Thread(target=call, args=(lambda: pytest.fail('takipçi çalıştırıldı'),))
+                 for _ in range(FOLLOWERS)]
+    for thread in followers:
+        thread.start()
+    done = flight._calls['ornek.com'].done
+    for _ in range(FOLLOWERS):
+        assert done.waiting.acquire(timeout=10)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=10)
+    return outcomes
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    def analyze():
+        runs.append(1)
+        return {'success': True}
+
+    outcomes = run_concurrently(flight, analyze)
+    assert len(runs) == 1
+    assert sorted(shared for _, shared in outcomes) == [False] + [True] * FOLLOWERS
+    assert all(result == {'success': True} for result, _ in outcomes)
+    assert flight._calls == {}
+
+    # Bitmiş çağrı sonraki çağrıya bağlanmaz
+    assert flight.do('ornek.com', analyze) == ({'success': True}, False)
+    assert len(runs) == 2
+
+
+def test_error_is_raised_for_all_callers():
+    flight = SingleFlight()
+    error = RuntimeError('analiz hatası')
+
+    def analyze():
+        raise error
+
+    outcomes = run_concurrently(flight, analyze)
+    assert outcomes == [error] * (FOLLOWERS + 1)
+    assert flight._calls == {}
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    # Farklı anahtar çalışan çağrıya bağlanmaz (iç içe çağrı kilitlenmez)
+    assert flight.do('bir.com', lambda: flight.do('iki.com', lambda: 'iki')) == (('iki', False), False)
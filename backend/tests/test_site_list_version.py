@@ -0,0 +1,29 @@
+"""/api/sites sürümü (ETag) ve sıralama cache'i yeniden skorlamayı görmeli"""
+import rankings
+
+
+def test_rescore_changes_site_list_version(db):
+    site_id = db.get_or_create_site('ornek.com')
+    assert db.update_site_risk_score(site_id, 40, risk_model='v1')
+    before = db.get_site_list_version()
+
+    # Yeniden skorlama LastScannedDate'i değiştirmez; sürüm yine de değişmeli
+    assert db.update_site_risk_score(site_id, 75, risk_model='v2', touch_scanned=False)
+    after = db.get_site_list_version()
+
+    assert before[:2] == after[:2]
+    assert before != after
+
+
+def test_rankings_recomputed_after_rescore(db):
+    site_ids = [db.get_or_create_site(f"site{i}.com") for i in range(3)]
+    for i, site_id in enumerate(site_ids):
+        db.update_site_risk_score(site_id, 10 * (i + 1))
+    first = rankings.get_rankings(db)
+    assert first.find('site0.com')['risk_rank'] == 3
+
+    db.update_site_risk_score(site_ids[0], 90, touch_scanned=False)
+    second = rankings.get_rankings(db)
+
+    assert second is not first
+    assert second.find('site0.com')['risk_rank'] == 1
@@ -8,6 +8,8 @@ import './Sites.css'
 const Sites = () => {
   const [sites, setSites] = useState([])
   const [isLoadingSites, setIsLoadingSites] = useState(true)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [error, setError] = useState('')
   const navigate = useNavigate()
 
@@ -21,6 +23,7 @@ const Sites = () => {
       setError('')
       const response = await apiService.getAllSites()
       setSites(response.sites || [])
+      setNextCursor(response.next_cursor || null)
     } catch (err) {
       setError(err.message)
       console.error('Siteler yüklenirken hata:', err)
@@ -29,6 +32,21 @@ const Sites = () => {
     }
   }
 
+  const loadMoreSites = async () => {
+    try {
+      setIsLoadingMore(true)
+      setError('')
+      const response = await apiService.getAllSites({ cursor: nextCursor })
+      setSites((current) => [...current, ...(response.sites || [])])
+      setNextCursor(response.next_cursor || null)
+    } catch (err) {
+      setError(err.message)
+      console.error('Siteler yüklenirken hata:', err)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   const handleSiteClick = (domain) => {
     navigate(`/site/${encodeURIComponent(domain)}`)
   }
@@ -91,15 +109,28 @@ const Sites = () => {
             </button>
           </div>
         ) : (
-          <div className="sites-grid">
-            {sites.map((site, index) => (
-              <SiteCard
-                key={index}
-                site={site}
-                onClick={handleSiteClick}
-              />
-            ))}
-          </div>
+          <>
+            <div className="sites-grid">
+              {sites.map((site, index) => (
+                <SiteCard
+                  key={index}
+                  site={site}
+                  onClick={handleSiteClick}
+                />
+              ))}
+            </div>
+            {nextCursor && (
+              <div className="sites-load-more">
+                <button
+                  onClick={loadMoreSites}
+                  className="refresh-button"
+                  disabled={isLoadingMore}
+                >
+                  <span>{isLoadingMore ? 'Yükleniyor...' : 'Daha Fazla Site Yükle'}</span>
+                </button>
+              </div>
+            )}
+          </>
         )}
       </div>
     </div>
@@ -72,9 +72,9 @@ export const apiService = {
     return response.data
   },
 
-  // Get all sites
-  getAllSites: async () => {
-    const response = await api.get('/api/sites')
+  // Get sites (sayfa sayfa; params: limit, cursor, sort, risk_level, domain_prefix...)
+  getAllSites: async (params = {}) => {
+    const response = await api.get('/api/sites', { params })
     return response.data
   },
 